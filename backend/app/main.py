@@ -1,26 +1,65 @@
-from fastapi import FastAPI, HTTPException, status
+from contextlib import asynccontextmanager
+from typing import List, Literal, Optional, Tuple
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from dotenv import load_dotenv
+from datetime import datetime
+import asyncio
+import json
 import os
 import logging
 
-from .models import TranscriptRequest, ActionItemsResponse, ErrorResponse
+from .models import (
+    TranscriptRequest, BatchJobRequest, ActionItem, ActionItemsResponse, ErrorResponse,
+    BulkUpdateRequest, BulkDeleteRequest, BulkItemResult, BulkOperationResponse, SearchResponse,
+    ActionItemPatch
+)
 from .services.llm_service import LLMService
-from .services.database_service import DatabaseService
+from .services.llm_scheduler import SchedulerTimeoutError
+from .services.database_service import DatabaseService, FoldedBatch
+from .services.change_feed import ChangeFeed
+from .services.action_item_cache import etag_matches
+from .services.health_monitor import HealthMonitor
+from .services.service_container import ServiceContainer
+from .services.batch_jobs import BatchJobManager
+from .services import metrics
+from .services.request_context import RequestContextMiddleware, install_request_id_logging
+from .services.responses import CompressionMiddleware, FastJSONResponse, columnar, field_dicts
+from .services.bulk_io import MEDIA_TYPES, BulkImporter, BulkImportError, export_stream
+from .services.transcript_upload import TranscriptUploadReceiver, UnsupportedUploadError, UploadTooLargeError
 
 # Load environment variables
 load_dotenv()
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
+install_request_id_logging()
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build services in the background on startup; drain, then close them on shutdown"""
+    health_monitor.start()
+    services.start()
+    yield
+    # Already done by app.serve when the shutdown signal arrived; under plain uvicorn it happens here
+    services.drain()
+    await health_monitor.stop()
+    # Let in-flight background saves finish before the pools close
+    if background_tasks:
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+    await services.close()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="InsightBoard AI API",
     description="Backend API for AI-powered meeting transcript analysis and action item generation",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS - Allow frontend to make requests
@@ -41,28 +80,134 @@ if frontend_url:
 if os.getenv("ENVIRONMENT", "development") == "development":
     allowed_origins.append("*")
 
+# Large JSON bodies are compressed (brotli or gzip); streamed responses are left alone
+if os.getenv("RESPONSE_COMPRESSION_ENABLED", "true").lower() == "true":
+    app.add_middleware(CompressionMiddleware, **CompressionMiddleware.options_from_env())
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Request-ID"],
 )
+# Outermost: request ids and request metrics cover everything below, CORS included
+app.add_middleware(RequestContextMiddleware)
 
-# Initialize services
-try:
+# Dependency probes run in the background; health endpoints read the cached results
+health_monitor = HealthMonitor.from_env()
+
+
+async def build_llm_service() -> LLMService:
     llm_service = LLMService()
-    logger.info("LLM Service initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize LLM Service: {str(e)}")
-    llm_service = None
+    # Opens the connection to the OpenAI API (TLS handshake included) before the first extraction needs it
+    if not await llm_service.test_connection():
+        logger.warning("OpenAI connection warm-up failed; the health monitor keeps probing")
+    # Without OpenAI only extraction fails, so it degrades the service rather than taking it out of rotation
+    health_monitor.register(
+        "openai", llm_service.test_connection, float(os.getenv("HEALTH_OPENAI_INTERVAL", "60")), critical=False
+    )
+    return llm_service
+
 
-try:
+async def close_llm_service(llm_service: LLMService):
+    if llm_service.cache:
+        llm_service.cache.close()
+    await llm_service.client.close()
+
+
+async def build_database_service() -> DatabaseService:
     db_service = DatabaseService()
-    logger.info("Database Service initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize Database Service: {str(e)}")
-    db_service = None
+    try:
+        await db_service.connect()
+    except Exception:
+        await db_service.close()
+        raise
+    if not await db_service.test_connection():
+        logger.warning("Database connection warm-up failed; the health monitor keeps probing")
+    health_monitor.register("database", db_service.test_connection, float(os.getenv("HEALTH_DATABASE_INTERVAL", "15")))
+    return db_service
+
+
+async def close_database_service(db_service: DatabaseService):
+    await db_service.close()
+
+
+async def build_batch_job_manager() -> BatchJobManager:
+    llm_service, db_service = await llm.get(), await database.get()
+    if not llm_service or not db_service:
+        raise RuntimeError("the LLM and database services are not available")
+    batch_job_manager = BatchJobManager.from_env(llm_service, db_service)
+    await batch_job_manager.start()
+    return batch_job_manager
+
+
+async def close_batch_job_manager(batch_job_manager: BatchJobManager):
+    await batch_job_manager.stop()
+
+
+# Services are built per worker after startup (or on first use with SERVICE_WARMUP=false),
+# not at import time; a failed build is retried instead of leaving the service unset
+services = ServiceContainer.from_env()
+llm = services.add("llm", build_llm_service, close_llm_service, required=False)
+database = services.add("database", build_database_service, close_database_service)
+batch_jobs = services.add("batch_jobs", build_batch_job_manager, close_batch_job_manager, required=False)
+
+
+def close_change_streams():
+    """Live change streams end when the worker drains, so shutdown does not wait for them to time out"""
+    db_service = database.instance
+    if db_service and db_service.changes:
+        db_service.changes.close_subscribers()
+
+
+services.on_drain(close_change_streams)
+
+
+def write_outbox():
+    return database.instance.outbox if database.instance else None
+
+
+metrics.CallbackMetric("llm_queue_depth", "LLM calls waiting for admission", lambda: llm.instance.scheduler.queue_depth if llm.instance else None)
+metrics.CallbackMetric("llm_in_flight", "LLM calls currently running", lambda: llm.instance.scheduler.in_flight if llm.instance else None)
+metrics.CallbackMetric("write_outbox_pending", "Action items queued for storage", lambda: write_outbox().pending_count if write_outbox() else None)
+metrics.CallbackMetric("write_outbox_parked", "Queued action items set aside after repeated write failures", lambda: write_outbox().parked_count if write_outbox() else None)
+metrics.CallbackMetric("write_outbox_oldest_seconds", "Age of the oldest queued action item", lambda: write_outbox().oldest_pending_seconds() if write_outbox() else None)
+metrics.CallbackMetric(
+    "change_feed_subscribers", "Open live change streams",
+    lambda: database.instance.changes.subscriber_count if database.instance and database.instance.changes else None
+)
+metrics.CallbackMetric(
+    "service_init_seconds", "Time each service took to build and warm up in this worker",
+    lambda: {(name,): service.init_ms / 1000 for name, service in services.services.items() if service.init_ms is not None},
+    labels=("service",)
+)
+
+# Bulk export reads storage one page at a time; imports are saved in batches
+export_page_size = int(os.getenv("EXPORT_PAGE_SIZE", "500"))
+bulk_importer = BulkImporter.from_env()
+# Transcript uploads are stripped into a spooled temp file as they stream in
+upload_receiver = TranscriptUploadReceiver.from_env()
+
+# Strong references to fire-and-forget tasks so they are not garbage collected
+background_tasks = set()
+
+
+def run_in_background(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+
+async def save_action_items(db_service: DatabaseService, action_items: List[ActionItem], folded: Optional[FoldedBatch] = None):
+    """Persist extracted items (as already folded in `folded`, if given), logging (not raising) on failure"""
+    try:
+        await db_service.create_multiple_action_items(action_items, folded=folded)
+        logger.info(f"Saved {len(action_items)} action items to database")
+    except Exception as db_error:
+        logger.error(f"Failed to save to database: {str(db_error)}")
 
 
 @app.get("/")
@@ -73,9 +218,25 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "health": "/api/health",
+            "liveness": "/api/health/live",
+            "readiness": "/api/health/ready",
+            "llm_stats": "/api/llm/stats",
+            "metrics": "/metrics",
             "analyze_transcript": "/api/transcripts/analyze",
+            "analyze_transcript_stream": "/api/transcripts/analyze/stream",
+            "upload_transcript": "/api/transcripts/upload",
+            "batch_jobs": "/api/batch-jobs",
             "get_action_items": "/api/action-items",
+            "action_item_stats": "/api/action-items/stats",
+            "search_action_items": "/api/action-items/search",
+            "export_action_items": "/api/action-items/export",
+            "import_action_items": "/api/action-items/import",
+            "action_item_changes": "/api/action-items/changes",
+            "action_item_changes_stream": "/api/action-items/changes/stream",
+            "get_action_item": "/api/action-items/{item_id}",
             "update_action_item": "/api/action-items/{item_id}",
+            "bulk_update_action_items": "/api/action-items/bulk-update",
+            "bulk_delete_action_items": "/api/action-items/bulk-delete",
             "delete_action_item": "/api/action-items/{item_id}"
         }
     }
@@ -83,26 +244,115 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
-    """Health check endpoint"""
-    openai_status = "connected" if llm_service and llm_service.test_connection() else "disconnected"
-    db_status = "connected" if db_service and db_service.test_connection() else "disconnected"
-    
+    """Health check endpoint - served from the background probe results"""
+    db_service = database.instance
+    overall = health_monitor.overall_status() if services.is_ready() else "unhealthy"
+    if overall == "healthy" and services.degraded():
+        overall = "degraded"
     return {
-        "status": "healthy",
+        "status": overall,
         "service": "InsightBoard AI API",
-        "openai_status": openai_status,
-        "database_status": db_status,
+        "openai_status": health_monitor.status_of("openai"),
+        "database_status": health_monitor.status_of("database"),
+        "checks": health_monitor.snapshot(),
+        "write_outbox": db_service.outbox.stats() if db_service and db_service.outbox else None,
+        "change_feed": db_service.changes.stats() if db_service and db_service.changes else None,
+        "worker": services.stats(),
         "environment": os.getenv("ENVIRONMENT", "development")
     }
 
 
+@app.get("/api/health/live")
+async def liveness():
+    """Liveness probe - the process is up and serving requests"""
+    return {"status": "alive"}
+
+
+@app.get("/api/health/ready")
+async def readiness():
+    """Readiness probe - storage built and passing its last check, and the worker is not draining; OpenAI only degrades"""
+    ready = services.is_ready() and health_monitor.is_ready()
+    degraded = health_monitor.degraded() + services.degraded()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "ready" if ready else "draining" if services.draining else "not_ready",
+            "degraded": sorted(set(degraded)),
+            "checks": health_monitor.snapshot()
+        }
+    )
+
+
+@app.get("/api/llm/stats")
+async def llm_stats():
+    """LLM scheduler queue depth, wait times, retry, cache, pre-filter, model routing and coalescing counters"""
+    llm_service = await llm.get()
+    if not llm_service:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="LLM service is not available"
+        )
+    return {
+        "success": True,
+        "scheduler": llm_service.scheduler.stats(),
+        "cache": llm_service.cache.stats() if llm_service.cache else None,
+        "prefilter": llm_service.prefilter.stats() if llm_service.prefilter else None,
+        "routing": llm_service.router.stats(),
+        "single_flight": llm_service.in_flight.stats()
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Request, LLM and database stage metrics in the Prometheus text format"""
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+async def require_analysis_services() -> Tuple[LLMService, DatabaseService]:
+    """The LLM and database services, built first if needed; 503 while either cannot be built"""
+    llm_service = await llm.get()
+    if not llm_service:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="LLM service is not available. Please check OpenAI API key."
+        )
+    
+    db_service = await database.get()
+    if not db_service:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database service is not available. Please check database configuration."
+        )
+    return llm_service, db_service
+
+
+async def extract_and_save(
+    llm_service: LLMService, db_service: DatabaseService, transcript: str, use_cache: bool
+) -> List[ActionItem]:
+    """Extract action items with the LLM and save them; a failed save is logged, not raised"""
+    action_items = await llm_service.extract_action_items(transcript, use_cache=use_cache)
+    
+    # Queue action items for the database (near-duplicates come back as the existing items);
+    # with the write outbox this returns once they are logged locally, not stored
+    try:
+        action_items = await db_service.create_multiple_action_items(action_items)
+        logger.info(f"Saved {len(action_items)} action items to database")
+    except Exception as db_error:
+        logger.error(f"Failed to save to database: {str(db_error)}")
+        # Continue without database save for now, but log the error
+    
+    logger.info(f"Successfully generated {len(action_items)} action items")
+    return action_items
+
+
 @app.post(
     "/api/transcripts/analyze",
     response_model=ActionItemsResponse,
     status_code=status.HTTP_200_OK,
     responses={
         400: {"model": ErrorResponse},
-        500: {"model": ErrorResponse}
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse}
     }
 )
 async def analyze_transcript(request: TranscriptRequest):
@@ -116,92 +366,648 @@ async def analyze_transcript(request: TranscriptRequest):
         ActionItemsResponse with extracted action items
     """
     try:
-        # Validate services are available
-        if not llm_service:
+        llm_service, db_service = await require_analysis_services()
+        
+        logger.info(f"Received transcript analysis request (length: {len(request.transcript)} chars)")
+        
+        action_items = await extract_and_save(llm_service, db_service, request.transcript, request.use_cache)
+        
+        # Items were validated when parsed from the model output; skip the response-model pass
+        return FastJSONResponse({
+            "success": True,
+            "action_items": action_items,
+            "total_count": len(action_items),
+            "next_cursor": None
+        })
+        
+    except HTTPException:
+        raise
+    except SchedulerTimeoutError as e:
+        logger.warning(f"LLM queue deadline exceeded: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The AI service is busy. Please try again shortly."
+        )
+    except Exception as e:
+        logger.error(f"Error analyzing transcript: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to analyze transcript: {str(e)}"
+        )
+
+
+@app.post(
+    "/api/transcripts/upload",
+    response_model=ActionItemsResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        413: {"model": ErrorResponse},
+        415: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse}
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"multipart/form-data": {"schema": {
+                "type": "object",
+                "required": ["file"],
+                "properties": {
+                    "file": {"type": "string", "format": "binary", "description": "A .txt, .vtt or .srt transcript"},
+                    "use_cache": {"type": "boolean", "default": True}
+                }
+            }}}
+        }
+    }
+)
+async def upload_transcript(request: Request):
+    """
+    Analyze an uploaded transcript file (multipart `file`: .txt, .vtt or .srt)
+    
+    The upload is read as it streams in: caption timestamps, cue numbers and
+    markup are stripped on the way into a spooled temp file, so memory does
+    not grow with the file. The response adds an `upload` summary with the
+    ingest time per MB.
+    """
+    try:
+        llm_service, db_service = await require_analysis_services()
+        
+        content_length = request.headers.get("content-length")
+        try:
+            upload = await upload_receiver.receive(
+                request.stream(),
+                request.headers.get("content-type", ""),
+                int(content_length) if content_length and content_length.isdigit() else None
+            )
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+        except UnsupportedUploadError as e:
+            raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        
+        if len(upload.text.strip()) < 10:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The uploaded file contains no transcript text")
+        
+        action_items = await extract_and_save(llm_service, db_service, upload.text, upload.use_cache)
+        
+        return FastJSONResponse({
+            "success": True,
+            "action_items": action_items,
+            "total_count": len(action_items),
+            "next_cursor": None,
+            "upload": upload.stats()
+        })
+        
+    except HTTPException:
+        raise
+    except SchedulerTimeoutError as e:
+        logger.warning(f"LLM queue deadline exceeded: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The AI service is busy. Please try again shortly."
+        )
+    except Exception as e:
+        logger.error(f"Error analyzing uploaded transcript: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to analyze transcript: {str(e)}"
+        )
+
+
+@app.post("/api/transcripts/analyze/stream")
+async def analyze_transcript_stream(request: TranscriptRequest):
+    """
+    Streaming variant of /api/transcripts/analyze
+    
+    Returns newline-delimited JSON events: one {"type": "item"} event per
+    action item as soon as the model finishes generating it, then a final
+    {"type": "summary"} event (or {"type": "error"}). Near-duplicates are
+    folded before their event is sent: an item matching a stored item or an
+    earlier one of the stream is sent as that item, with `duplicate: true`
+    (an id already sent is only sent again if merging changed it). Items are
+    saved to the database in the background once extraction completes.
+    """
+    llm_service, db_service = await require_analysis_services()
+    
+    logger.info(f"Received streaming transcript analysis request (length: {len(request.transcript)} chars)")
+    
+    async def events():
+        # Folded as they arrive, so every event carries the id the item is stored under
+        folded = db_service.fold_batch()
+        sent = {}
+        try:
+            async for action_item in llm_service.stream_action_items(request.transcript, use_cache=request.use_cache):
+                duplicate = False
+                if folded is not None:
+                    stored_as = await db_service.fold_duplicate(folded, action_item)
+                    duplicate = stored_as.id != action_item.id
+                    action_item = stored_as
+                if sent.get(action_item.id) == action_item:
+                    continue
+                sent[action_item.id] = action_item
+                yield json.dumps({
+                    "type": "item", "action_item": action_item.model_dump(mode="json"), "duplicate": duplicate
+                }) + "\n"
+        except SchedulerTimeoutError as e:
+            logger.warning(f"LLM queue deadline exceeded: {str(e)}")
+            yield json.dumps({"type": "error", "detail": "The AI service is busy. Please try again shortly."}) + "\n"
+            return
+        except Exception as e:
+            logger.error(f"Error streaming transcript analysis: {str(e)}")
+            yield json.dumps({"type": "error", "detail": f"Failed to analyze transcript: {str(e)}"}) + "\n"
+            return
+        
+        if sent:
+            run_in_background(save_action_items(db_service, list(sent.values()), folded))
+        yield json.dumps({"type": "summary", "success": True, "total_count": len(sent)}) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+async def require_batch_jobs() -> BatchJobManager:
+    batch_job_manager = await batch_jobs.get()
+    if not batch_job_manager:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Batch jobs are unavailable. Please check OpenAI and database configuration."
+        )
+    return batch_job_manager
+
+
+@app.post("/api/batch-jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_batch_job(request: BatchJobRequest):
+    """Queue a batch of transcripts for analysis; returns the job id and initial status"""
+    batch_job_manager = await require_batch_jobs()
+    transcripts = [transcript for transcript in request.transcripts if transcript.strip()]
+    if not transcripts:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No non-empty transcripts provided")
+    job = await batch_job_manager.submit(transcripts, use_cache=request.use_cache)
+    return {"success": True, "job": job}
+
+
+@app.get("/api/batch-jobs")
+async def list_batch_jobs():
+    """List recent batch jobs with progress and throughput"""
+    batch_job_manager = await require_batch_jobs()
+    return {"success": True, "jobs": await batch_job_manager.list_jobs()}
+
+
+@app.get("/api/batch-jobs/{job_id}")
+async def get_batch_job(job_id: str):
+    """Batch job progress, throughput and per-transcript status"""
+    batch_job_manager = await require_batch_jobs()
+    job = await batch_job_manager.get_job(job_id, include_items=True)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch job not found")
+    return {"success": True, "job": job}
+
+
+def representation_etag(etag: Optional[str], response_format: str) -> Optional[str]:
+    """Each response format of the same page gets its own ETag"""
+    if not etag or response_format == "objects":
+        return etag
+    return f'{etag[:-1]}-{response_format}"'
+
+
+@app.get("/api/action-items", response_model=ActionItemsResponse)
+async def get_action_items(
+    status_filter: Optional[Literal["pending", "completed"]] = Query(None, alias="status"),
+    priority: Optional[Literal["high", "medium", "low"]] = None,
+    search: Optional[str] = Query(None, max_length=200),
+    sort_by: Literal["created_at", "priority", "status"] = "created_at",
+    order: Literal["asc", "desc"] = "desc",
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    response_format: Literal["objects", "columnar"] = Query("objects", alias="format"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Get action items from database, filtered, sorted and paginated server-side
+    
+    `format=columnar` returns `columns` (one array per field) instead of
+    `action_items`, which is much smaller for long lists.
+    """
+    try:
+        db_service = await database.get()
+        if not db_service:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="LLM service is not initialized. Please check OpenAI API key."
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database service is not available"
             )
         
+        query = dict(
+            status=status_filter,
+            priority=priority,
+            search=search,
+            sort_by=sort_by,
+            order=order,
+            limit=limit,
+            cursor=cursor
+        )
+        
+        # Answer conditional requests from the cache without touching the database
+        etag = representation_etag(db_service.action_items_etag(**query), response_format)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        
+        try:
+            action_items, next_cursor = await db_service.get_action_items_page(**query)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        
+        etag = representation_etag(db_service.action_items_etag(**query), response_format)
+        
+        # Rows from our own store are trusted: encode them directly instead of
+        # validating the whole list again through ActionItemsResponse
+        payload = {"success": True}
+        if response_format == "columnar":
+            payload["format"] = "columnar"
+            payload["columns"] = columnar(action_items)
+        else:
+            payload["action_items"] = field_dicts(action_items)
+        payload["total_count"] = len(action_items)
+        payload["next_cursor"] = next_cursor
+        return FastJSONResponse(payload, headers={"ETag": etag} if etag else None)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving action items: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve action items: {str(e)}"
+        )
+
+
+@app.get("/api/action-items/search", response_model=SearchResponse)
+async def search_action_items(
+    q: str = Query(..., min_length=1, max_length=200),
+    status_filter: Optional[Literal["pending", "completed"]] = Query(None, alias="status"),
+    priority: Optional[Literal["high", "medium", "low"]] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Ranked full-text search over action item text (a trailing * makes a word a prefix)"""
+    try:
+        db_service = await database.get()
         if not db_service:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database service is not initialized. Please check database configuration."
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database service is not available"
             )
         
-        logger.info(f"Received transcript analysis request (length: {len(request.transcript)} chars)")
+        results, total_count = await db_service.search_action_items(
+            q, limit=limit, status=status_filter, priority=priority
+        )
+        return FastJSONResponse({"success": True, "query": q, "results": results, "total_count": total_count})
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching action items: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search action items: {str(e)}"
+        )
+
+
+@app.get("/api/action-items/stats")
+async def get_action_item_stats(days: int = Query(30, ge=1, le=366)):
+    """Counts by status, priority and status × priority, plus items created per day"""
+    try:
+        db_service = await database.get()
+        if not db_service:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database service is not available"
+            )
+        
+        stats = await db_service.get_action_item_stats(days=days)
+        return {"success": True, **stats}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving action item stats: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve action item stats: {str(e)}"
+        )
+
+
+@app.get("/api/action-items/export")
+async def export_action_items(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    status_filter: Optional[Literal["pending", "completed"]] = Query(None, alias="status"),
+    priority: Optional[Literal["high", "medium", "low"]] = None,
+    search: Optional[str] = Query(None, max_length=200),
+    sort_by: Literal["created_at", "priority", "status"] = "created_at",
+    order: Literal["asc", "desc"] = "desc"
+):
+    """
+    Stream every matching action item as NDJSON (one object per line) or CSV
+    
+    Pages through storage as the response is written, so memory use does not
+    grow with the table. Takes the same filters and sort as /api/action-items.
+    """
+    try:
+        db_service = await database.get()
+        if not db_service:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database service is not available"
+            )
+        
+        pages = db_service.iter_action_items(
+            page_size=export_page_size, status=status_filter, priority=priority, search=search, sort_by=sort_by, order=order
+        )
+        first_page = await anext(pages, None)
+        filename = f"action-items-{datetime.utcnow():%Y%m%d-%H%M%S}.{export_format}"
+        return StreamingResponse(
+            export_stream(first_page, pages, export_format),
+            media_type=MEDIA_TYPES[export_format],
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error exporting action items: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to export action items: {str(e)}"
+        )
+
+
+@app.post("/api/action-items/import")
+async def import_action_items(
+    request: Request,
+    import_format: Optional[Literal["ndjson", "csv"]] = Query(None, alias="format")
+):
+    """
+    Import action items from an NDJSON or CSV request body (the format of
+    /api/action-items/export; `format` defaults from the Content-Type)
+    
+    The body is parsed and validated as it streams in and saved in batches
+    through the normal create path, near-duplicate detection included. A row
+    whose id already exists replaces that item (re-importing an edited
+    export). Invalid rows are skipped and listed by line number.
+    """
+    try:
+        db_service = await database.get()
+        if not db_service:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database service is not available"
+            )
         
-        # Extract action items using LLM
-        action_items = llm_service.extract_action_items(request.transcript)
+        import_format = import_format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+        try:
+            summary = await bulk_importer.run(
+                request.stream(),
+                import_format,
+                db_service.import_action_items
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return {"success": True, "format": import_format, **summary}
         
-        # Save action items to database
+    except HTTPException:
+        raise
+    except BulkImportError as e:
+        logger.error(f"Error importing action items: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import action items after {e.summary['imported'] + e.summary['updated']} rows were saved: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Error importing action items: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import action items: {str(e)}"
+        )
+
+
+async def require_change_feed() -> ChangeFeed:
+    if services.draining:
+        # Shutting down: the client reconnects to another worker
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="This worker is shutting down")
+    db_service = await database.get()
+    if not db_service or not db_service.changes:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="The change feed is unavailable. Please check database configuration and CHANGE_FEED_ENABLED."
+        )
+    return db_service.changes
+
+
+@app.get("/api/action-items/changes")
+async def get_action_item_changes(
+    since: Optional[str] = Query(None, max_length=64),
+    limit: int = Query(1000, ge=1, le=10000)
+):
+    """
+    Delta sync: the items changed after cursor `since`, latest state only,
+    with tombstones ({"op": "delete", "action_item": null}) for deleted ones.
+    
+    `reset: true` means the cursor cannot be resumed (no cursor, a restart,
+    another worker, or too old) and the client must reload the full list;
+    take `cursor` from the response before that reload so nothing is missed.
+    """
+    feed = await require_change_feed()
+    changes, cursor, has_more = feed.changes_since(since, limit=limit)
+    return FastJSONResponse({
+        "success": True,
+        "reset": changes is None,
+        "cursor": cursor,
+        "has_more": has_more,
+        "changes": [change.to_dict(feed.epoch) for change in changes or ()]
+    })
+
+
+@app.get("/api/action-items/changes/stream")
+async def stream_action_item_changes(
+    since: Optional[str] = Query(None, max_length=64),
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Live change feed as Server-Sent Events: one `upsert`, `delete` or `reset`
+    event per change, with the cursor as the event id. An EventSource that
+    reconnects sends it back as Last-Event-ID and receives what it missed;
+    `since` does the same for the first connection. Without either the stream
+    opens with an `open` event carrying the current cursor.
+    """
+    feed = await require_change_feed()
+    cursor = last_event_id or since
+    keepalive = float(os.getenv("CHANGE_FEED_KEEPALIVE_SECONDS", "15"))
+
+    async def events():
+        changes = feed.subscribe(cursor)
+        # Ask EventSource to reconnect quickly after a dropped connection
+        yield b"retry: 2000\n\n"
+        if cursor is None:
+            yield b"id: %s\nevent: open\ndata: %s\n\n" % (feed.cursor.encode(), json.dumps({"cursor": feed.cursor}).encode())
+        # Starlette cancels this generator when the client disconnects
+        next_change = None
         try:
-            db_service.create_multiple_action_items(action_items)
-            logger.info(f"Saved {len(action_items)} action items to database")
-        except Exception as db_error:
-            logger.error(f"Failed to save to database: {str(db_error)}")
-            # Continue without database save for now, but log the error
-        
-        # Build response
-        response = ActionItemsResponse(
-            success=True,
-            action_items=action_items,
-            total_count=len(action_items)
+            while True:
+                next_change = next_change or asyncio.ensure_future(changes.__anext__())
+                done, _ = await asyncio.wait({next_change}, timeout=keepalive)
+                if not done:
+                    # Comment line: keeps proxies from closing an idle stream
+                    yield b": keep-alive\n\n"
+                    continue
+                try:
+                    change = next_change.result()
+                except StopAsyncIteration:
+                    return
+                next_change = None
+                yield change.frame
+        finally:
+            if next_change:
+                next_change.cancel()
+                await asyncio.gather(next_change, return_exceptions=True)
+            await changes.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def bulk_results(requested_ids: Optional[List[str]], done_ids: List[str], errors: dict, done_status: str) -> List[BulkItemResult]:
+    """Per-id outcomes of a bulk operation"""
+    if requested_ids is None:
+        # Filter-based: only the rows that matched are known
+        return [BulkItemResult(id=item_id, status=done_status) for item_id in done_ids]
+    done = set(done_ids)
+    results = []
+    for item_id in requested_ids:
+        if item_id in errors:
+            results.append(BulkItemResult(id=item_id, status="error", error=errors[item_id]))
+        elif item_id in done:
+            results.append(BulkItemResult(id=item_id, status=done_status))
+        else:
+            results.append(BulkItemResult(id=item_id, status="not_found"))
+    return results
+
+
+@app.post("/api/action-items/bulk-update", response_model=BulkOperationResponse)
+async def bulk_update_action_items(request: BulkUpdateRequest):
+    """Update many action items (by ids or by filter) with one patch"""
+    try:
+        db_service = await database.get()
+        if not db_service:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database service is not available"
+            )
+        
+        ids = list(dict.fromkeys(request.ids)) if request.ids is not None else None
+        filters = request.filter.model_dump(exclude_none=True) if request.filter else None
+        updated, errors = await db_service.bulk_update_action_items(
+            request.patch.model_dump(exclude_none=True), ids=ids, filters=filters
         )
         
-        logger.info(f"Successfully generated {len(action_items)} action items")
-        return response
+        return BulkOperationResponse(
+            success=not errors,
+            matched_count=len(updated),
+            results=bulk_results(ids, [item.id for item in updated], errors, "updated")
+        )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error analyzing transcript: {str(e)}")
+        logger.error(f"Error bulk updating action items: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to analyze transcript: {str(e)}"
+            detail=f"Failed to update action items: {str(e)}"
         )
 
 
-@app.get("/api/action-items", response_model=ActionItemsResponse)
-async def get_action_items():
-    """Get all action items from database"""
+@app.post("/api/action-items/bulk-delete", response_model=BulkOperationResponse)
+async def bulk_delete_action_items(request: BulkDeleteRequest):
+    """Delete many action items (by ids or by filter)"""
     try:
+        db_service = await database.get()
         if not db_service:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database service is not initialized"
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database service is not available"
             )
         
-        action_items = db_service.get_all_action_items()
+        ids = list(dict.fromkeys(request.ids)) if request.ids is not None else None
+        filters = request.filter.model_dump(exclude_none=True) if request.filter else None
+        deleted, errors = await db_service.bulk_delete_action_items(ids=ids, filters=filters)
         
-        return ActionItemsResponse(
-            success=True,
-            action_items=action_items,
-            total_count=len(action_items)
+        return BulkOperationResponse(
+            success=not errors,
+            matched_count=len(deleted),
+            results=bulk_results(ids, deleted, errors, "deleted")
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error retrieving action items: {str(e)}")
+        logger.error(f"Error bulk deleting action items: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve action items: {str(e)}"
+            detail=f"Failed to delete action items: {str(e)}"
+        )
+
+
+@app.get("/api/action-items/{item_id}")
+async def get_action_item(item_id: str, if_none_match: Optional[str] = Header(None)):
+    """Get a single action item"""
+    try:
+        db_service = await database.get()
+        if not db_service:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database service is not available"
+            )
+        
+        etag = db_service.action_item_etag(item_id)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        
+        action_item = await db_service.get_action_item(item_id)
+        if not action_item:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Action item not found"
+            )
+        
+        etag = db_service.action_item_etag(item_id)
+        return FastJSONResponse({"success": True, "action_item": action_item}, headers={"ETag": etag} if etag else None)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving action item: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve action item: {str(e)}"
         )
 
 
 @app.put("/api/action-items/{item_id}")
-async def update_action_item(item_id: str, updates: dict):
-    """Update an action item"""
+async def update_action_item(item_id: str, updates: ActionItemPatch):
+    """Update an action item's status and/or priority"""
     try:
+        db_service = await database.get()
         if not db_service:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database service is not initialized"
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database service is not available"
             )
         
-        updated_item = db_service.update_action_item(item_id, updates)
+        # Validated here so rows read back from the store can be trusted
+        updated_item = await db_service.update_action_item(item_id, updates.model_dump(exclude_none=True))
         
         if updated_item:
-            return {"success": True, "action_item": updated_item}
+            return FastJSONResponse({"success": True, "action_item": updated_item})
         else:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -222,13 +1028,14 @@ async def update_action_item(item_id: str, updates: dict):
 async def delete_action_item(item_id: str):
     """Delete an action item"""
     try:
+        db_service = await database.get()
         if not db_service:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database service is not initialized"
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database service is not available"
             )
         
-        success = db_service.delete_action_item(item_id)
+        success = await db_service.delete_action_item(item_id)
         
         if success:
             return {"success": True, "message": "Action item deleted successfully"}
@@ -263,6 +1070,6 @@ async def global_exception_handler(request, exc):
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    from .serve import main
+    main()
 
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import List, Literal, Optional
 from datetime import datetime
 import uuid
@@ -7,6 +7,7 @@ import uuid
 class TranscriptRequest(BaseModel):
     """Request model for transcript analysis"""
     transcript: str = Field(..., min_length=10, description="Meeting transcript text")
+    use_cache: bool = Field(default=True, description="Set to false to bypass the extraction cache")
     
     class Config:
         json_schema_extra = {
@@ -16,6 +17,22 @@ class TranscriptRequest(BaseModel):
         }
 
 
+class BatchJobRequest(BaseModel):
+    """Request model for a batch transcript analysis job"""
+    transcripts: List[str] = Field(..., min_length=1, max_length=1000, description="Meeting transcripts to analyze")
+    use_cache: bool = Field(default=True, description="Set to false to bypass the extraction cache")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "transcripts": [
+                    "Weekly sync: John will prepare the Q4 report by Friday.",
+                    "Client call: Mike should schedule a follow-up meeting next week."
+                ]
+            }
+        }
+
+
 class ActionItem(BaseModel):
     """Model for a single action item"""
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -38,11 +55,37 @@ class ActionItem(BaseModel):
         }
 
 
+_ACTION_ITEM_FIELDS = frozenset(ActionItem.model_fields)
+_object_setattr = object.__setattr__
+
+
+def trusted_action_item(
+    id: str, text: str, status: str, priority: str, createdAt: datetime, updatedAt: Optional[datetime]
+) -> ActionItem:
+    """
+    Build an ActionItem from values that are already valid (rows from our own
+    store), skipping validation.
+
+    Sets the same attributes as ActionItem.model_construct with every field
+    given, without its per-field alias and default lookups, which dominate
+    the cost of converting long lists.
+    """
+    item = ActionItem.__new__(ActionItem)
+    _object_setattr(item, "__dict__", {
+        "id": id, "text": text, "status": status, "priority": priority, "createdAt": createdAt, "updatedAt": updatedAt
+    })
+    _object_setattr(item, "__pydantic_fields_set__", set(_ACTION_ITEM_FIELDS))
+    _object_setattr(item, "__pydantic_extra__", None)
+    _object_setattr(item, "__pydantic_private__", None)
+    return item
+
+
 class ActionItemsResponse(BaseModel):
     """Response model containing list of action items"""
     success: bool = True
     action_items: List[ActionItem]
     total_count: int
+    next_cursor: Optional[str] = Field(default=None, description="Cursor for the next page, if any")
     
     class Config:
         json_schema_extra = {
@@ -61,6 +104,87 @@ class ActionItemsResponse(BaseModel):
         }
 
 
+class SearchResult(BaseModel):
+    """One ranked full-text search hit"""
+    action_item: ActionItem
+    score: float = Field(..., description="BM25 relevance score")
+    snippet: str = Field(..., description="HTML-escaped excerpt with matches wrapped in <mark>")
+
+
+class SearchResponse(BaseModel):
+    """Response model for full-text search"""
+    success: bool = True
+    query: str
+    results: List[SearchResult]
+    total_count: int = Field(..., description="Number of matching items (results are limited)")
+
+
+class ActionItemPatch(BaseModel):
+    """Fields that may be changed on an action item"""
+    status: Optional[Literal["pending", "completed"]] = None
+    priority: Optional[Literal["high", "medium", "low"]] = None
+    
+    class Config:
+        extra = "forbid"
+
+
+class ActionItemFilter(BaseModel):
+    """Selects action items for a bulk operation"""
+    status: Optional[Literal["pending", "completed"]] = None
+    priority: Optional[Literal["high", "medium", "low"]] = None
+    search: Optional[str] = Field(default=None, max_length=200)
+    
+    class Config:
+        extra = "forbid"
+
+
+class BulkDeleteRequest(BaseModel):
+    """Request model for bulk deletes: either ids or a filter"""
+    ids: Optional[List[str]] = Field(default=None, min_length=1, max_length=10000)
+    filter: Optional[ActionItemFilter] = None
+    
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of 'ids' or 'filter'")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("'filter' needs at least one of status, priority or search")
+        return self
+
+
+class BulkUpdateRequest(BulkDeleteRequest):
+    """Request model for bulk updates: either ids or a filter, plus the patch"""
+    patch: ActionItemPatch
+    
+    @model_validator(mode="after")
+    def check_patch(self):
+        if not self.patch.model_dump(exclude_none=True):
+            raise ValueError("'patch' must set status and/or priority")
+        return self
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "ids": ["123e4567-e89b-12d3-a456-426614174000", "223e4567-e89b-12d3-a456-426614174001"],
+                "patch": {"status": "completed"}
+            }
+        }
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of a bulk operation for one id"""
+    id: str
+    status: Literal["updated", "deleted", "not_found", "error"]
+    error: Optional[str] = None
+
+
+class BulkOperationResponse(BaseModel):
+    """Response model for bulk updates and deletes"""
+    success: bool = True
+    matched_count: int
+    results: List[BulkItemResult]
+
+
 class ErrorResponse(BaseModel):
     """Error response model"""
     success: bool = False
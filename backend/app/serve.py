@@ -0,0 +1,106 @@
+"""
+Production entry point: python -m app.serve
+
+Runs the API under uvicorn with WEB_CONCURRENCY worker processes sharing
+one listening socket. Each worker builds its own services in the background
+after it starts accepting connections (see ServiceContainer). On SIGTERM or
+SIGINT a worker drains first: readiness fails and live change streams are
+closed. Then it stops accepting connections and waits up to
+GRACEFUL_SHUTDOWN_TIMEOUT seconds for in-flight requests before closing its
+services.
+
+Multiple workers share nothing but the listening socket and the SQLite
+files. The change feed (its epoch and versions), the action item cache, the
+duplicate index and the stats counters live in each worker, and so do the
+batch job queues and the LLM rate limits. Every worker also replays the same
+write outbox on startup. With WEB_CONCURRENCY > 1 a client's requests land on
+different workers, so delta sync cursors, cached reads and duplicate
+detection are wrong across them. serve therefore refuses to start more than
+one worker while the change feed, the action item cache, duplicate detection
+or the write outbox is enabled. Disable them (CHANGE_FEED_ENABLED=false,
+ACTION_ITEM_CACHE_ENABLED=false, DUPLICATE_MODE=off,
+WRITE_OUTBOX_ENABLED=false) or set ALLOW_PER_WORKER_STATE=true to start
+anyway with a warning.
+"""
+import os
+import sys
+import logging
+from typing import List
+
+import uvicorn
+from dotenv import load_dotenv
+from uvicorn.supervisors import Multiprocess
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that drains the app's services before the graceful shutdown starts"""
+
+    async def shutdown(self, sockets=None):
+        main = sys.modules.get("app.main")
+        if main is not None:
+            main.services.drain()
+        await super().shutdown(sockets=sockets)
+
+
+def config_from_env() -> uvicorn.Config:
+    return uvicorn.Config(
+        "app.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        timeout_graceful_shutdown=float(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30")),
+        # Behind a load balancer: trust its X-Forwarded-* headers
+        proxy_headers=True,
+        forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+    )
+
+
+def per_worker_features() -> List[str]:
+    """Enabled features whose state each worker process keeps to itself"""
+    def enabled(name: str) -> bool:
+        return os.getenv(name, "true").lower() == "true"
+
+    features = []
+    if enabled("CHANGE_FEED_ENABLED"):
+        features.append("change feed (CHANGE_FEED_ENABLED)")
+    if enabled("ACTION_ITEM_CACHE_ENABLED"):
+        features.append("action item cache (ACTION_ITEM_CACHE_ENABLED)")
+    if os.getenv("DUPLICATE_MODE", "off").lower() != "off":
+        features.append("duplicate index (DUPLICATE_MODE)")
+    if enabled("WRITE_OUTBOX_ENABLED"):
+        features.append("write outbox (WRITE_OUTBOX_ENABLED)")
+    return features
+
+
+def main():
+    load_dotenv()
+    config = config_from_env()
+    if config.workers > 1:
+        features = per_worker_features()
+        if features and os.getenv("ALLOW_PER_WORKER_STATE", "false").lower() != "true":
+            logger.error(
+                f"❌ Refusing to start {config.workers} workers: {', '.join(features)} keep per-process state that "
+                f"the workers do not share. Disable them, run one worker, or set ALLOW_PER_WORKER_STATE=true"
+            )
+            sys.exit(2)
+        logger.warning(
+            f"⚠️ {config.workers} workers do not share state: each has its own "
+            f"{', '.join(features + ['batch job queue', 'LLM rate limits'])}"
+        )
+    server = DrainingServer(config)
+    logger.info(f"Serving on {config.host}:{config.port} with {config.workers} worker(s)")
+    if config.workers > 1:
+        # The parent binds the socket; workers inherit it and the kernel spreads connections
+        Multiprocess(config, target=server.run, sockets=[config.bind_socket()]).run()
+    else:
+        server.run()
+        if not server.started:
+            sys.exit(3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import os
+import time
+import uuid
+import logging
+from collections import OrderedDict
+from typing import Hashable, Iterable, List, Optional, Tuple
+
+from ..models import ActionItem
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ActionItemCache:
+    """
+    In-process read-through cache for action item pages and single items.
+
+    Every write bumps a collection version counter and drops cached pages, so
+    readers in this process never see stale lists. Entries also expire after a
+    short TTL to bound staleness from writes made by other workers.
+
+    Each entry carries a strong ETag built from the process epoch, the
+    collection version and a fill sequence number; a matching If-None-Match can
+    therefore be answered without touching the database.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_pages: int = 256, max_items: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_pages = max_pages
+        self.max_items = max_items
+        # Distinguishes ETags issued by different processes / restarts
+        self.epoch = uuid.uuid4().hex[:8]
+        self.version = 0
+        self._fill_seq = 0
+        self._pages: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ActionItemCache"]:
+        if os.getenv("ACTION_ITEM_CACHE_ENABLED", "true").lower() != "true":
+            return None
+        return cls(
+            ttl_seconds=float(os.getenv("ACTION_ITEM_CACHE_TTL", "30")),
+            max_pages=int(os.getenv("ACTION_ITEM_CACHE_MAX_PAGES", "256")),
+            max_items=int(os.getenv("ACTION_ITEM_CACHE_MAX_ITEMS", "10000")),
+        )
+
+    def _new_etag(self) -> str:
+        self._fill_seq += 1
+        return f'"{self.epoch}-{self.version}-{self._fill_seq}"'
+
+    def _fresh(self, store: OrderedDict, key) -> Optional[tuple]:
+        entry = store.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl_seconds:
+            del store[key]
+            return None
+        store.move_to_end(key)
+        return entry
+
+    # Pages
+
+    def get_page(self, key: Hashable) -> Optional[Tuple[List[ActionItem], Optional[str], str]]:
+        """Cached (items, next_cursor, etag) for a query, or None"""
+        entry = self._fresh(self._pages, key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1], entry[2], entry[3]
+
+    def page_etag(self, key: Hashable) -> Optional[str]:
+        entry = self._fresh(self._pages, key)
+        return entry[3] if entry else None
+
+    def set_page(self, key: Hashable, items: List[ActionItem], next_cursor: Optional[str], version: int) -> Optional[str]:
+        """Store a page read at `version`; pages read before a concurrent write are discarded"""
+        if version != self.version:
+            return None
+        etag = self._new_etag()
+        self._pages[key] = (time.monotonic(), items, next_cursor, etag)
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        for item in items:
+            self._store_item(item, etag)
+        return etag
+
+    # Single items
+
+    def get_item(self, item_id: str) -> Optional[Tuple[ActionItem, str]]:
+        entry = self._fresh(self._items, item_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def item_etag(self, item_id: str) -> Optional[str]:
+        entry = self._fresh(self._items, item_id)
+        return entry[2] if entry else None
+
+    def set_item(self, item: ActionItem, version: int) -> Optional[str]:
+        if version != self.version:
+            return None
+        etag = self._new_etag()
+        self._store_item(item, etag)
+        return etag
+
+    def _store_item(self, item: ActionItem, etag: str):
+        self._items[item.id] = (time.monotonic(), item, etag)
+        self._items.move_to_end(item.id)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    # Writes
+
+    def record_write(self, upserted: Iterable[ActionItem] = (), deleted: Iterable[str] = ()):
+        """Write-through: bump the collection version, drop pages, refresh touched items"""
+        self.version += 1
+        self._pages.clear()
+        for item in upserted:
+            self._store_item(item, self._new_etag())
+        for item_id in deleted:
+            self._items.pop(item_id, None)
+
+    def invalidate(self):
+        """Forget everything (e.g. after a write whose result is unknown)"""
+        self.version += 1
+        self._pages.clear()
+        self._items.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "pages": len(self._pages),
+            "items": len(self._items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# A compressed body is a different representation, so it gets its own strong
+# ETag: the identity ETag with one of these suffixes inside the quotes
+ETAG_ENCODING_SUFFIXES = {"gzip": "-gz", "br": "-br"}
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the `encoding`-compressed form of a body; weak ETags already allow it"""
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return etag[:-1] + ETAG_ENCODING_SUFFIXES[encoding] + '"'
+
+
+def _identity_etag(tag: str) -> str:
+    for suffix in ETAG_ENCODING_SUFFIXES.values():
+        if tag.endswith(suffix + '"'):
+            return tag[:-len(suffix) - 1] + '"'
+    return tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """
+    If-None-Match comparison (weak comparison, as RFC 9110 requires for this
+    header); an ETag sent with a compressed body matches its identity ETag
+    """
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if _identity_etag(tag) == etag:
+            return True
+    return False
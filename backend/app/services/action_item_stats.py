@@ -0,0 +1,134 @@
+import os
+import asyncio
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STATUSES = ["pending", "completed"]
+PRIORITIES = ["high", "medium", "low"]
+
+
+# (status, priority, creation day as YYYY-MM-DD)
+StatsKey = Tuple[str, str, str]
+
+
+def stats_key(row: dict) -> StatsKey:
+    """Counter key of a stored row"""
+    return row["status"], row["priority"], row["created_at"][:10]
+
+
+class ActionItemStats:
+    """
+    Aggregate action item counts kept current by the write paths.
+
+    Each write reports the (status, priority, day) keys it added and removed,
+    and the counters move by that delta. A grouped count from storage
+    replaces them at startup, every `reconcile_interval` seconds and after a
+    failed write, so writes made by other workers cannot drift them for long.
+    """
+
+    def __init__(self, reconcile_interval: float = 300.0):
+        self.reconcile_interval = reconcile_interval
+        self._cells: Counter = Counter()  # (status, priority) -> count
+        self._days: Counter = Counter()   # YYYY-MM-DD -> count
+        self._writes = 0                  # bumped by every write, to spot writes racing a count
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.stale = True
+        self.last_reconciled: Optional[datetime] = None
+
+    @classmethod
+    def from_env(cls) -> "ActionItemStats":
+        return cls(reconcile_interval=float(os.getenv("ACTION_ITEM_STATS_RECONCILE_INTERVAL", "300")))
+
+    def record_write(self, added: Iterable[StatsKey] = (), removed: Iterable[StatsKey] = ()):
+        """Apply a successful write (called by DatabaseService)"""
+        self._writes += 1
+        for status, priority, day in added:
+            self._cells[(status, priority)] += 1
+            self._days[day] += 1
+        for status, priority, day in removed:
+            self._cells[(status, priority)] -= 1
+            self._days[day] -= 1
+            if self._days[day] <= 0:
+                del self._days[day]
+
+    def mark_stale(self):
+        """The counters may be off (a write failed part-way); recount before the next read"""
+        self.stale = True
+
+    async def reconcile(self, count: Callable[[], Awaitable[List[Tuple[str, str, str, int]]]], only_if_stale: bool = False):
+        """Replace every counter with a grouped count of the store"""
+        async with self._lock:
+            if only_if_stale and not self.stale:
+                # Another reconcile finished while this one waited for the lock
+                return
+            self.stale = False
+            writes = self._writes
+            try:
+                groups = await count()
+            except Exception:
+                self.stale = True
+                raise
+
+            cells, days = Counter(), Counter()
+            for status, priority, day, n in groups:
+                cells[(status, priority)] += n
+                days[day] += n
+            self._cells, self._days = cells, days
+            if self._writes != writes:
+                # The count may or may not include writes that landed meanwhile
+                self.stale = True
+            self.last_reconciled = datetime.utcnow()
+            logger.info(f"Reconciled action item stats ({sum(cells.values())} items)")
+
+    async def _loop(self, count: Callable[[], Awaitable[List[Tuple[str, str, str, int]]]]):
+        while True:
+            try:
+                await self.reconcile(count)
+            except Exception as e:
+                logger.error(f"❌ Error reconciling action item stats: {e}")
+            await asyncio.sleep(self.reconcile_interval)
+
+    def start(self, count: Callable[[], Awaitable[List[Tuple[str, str, str, int]]]]):
+        self._task = asyncio.create_task(self._loop(count), name="action-item-stats")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def snapshot(self, days: int = 30, today: Optional[date] = None) -> dict:
+        """
+        Current counts
+
+        Args:
+            days: Number of calendar days (ending today, UTC) in `created_per_day`
+            today: Override for the last day of the window
+
+        Returns:
+            Dict of totals, by_status, by_priority, by_status_priority and created_per_day
+        """
+        by_status_priority = {
+            status: {priority: self._cells[(status, priority)] for priority in PRIORITIES}
+            for status in STATUSES
+        }
+        today = today or datetime.utcnow().date()
+        window = [(today - timedelta(days=offset)).isoformat() for offset in range(days - 1, -1, -1)]
+        return {
+            "total": sum(self._cells.values()),
+            "by_status": {status: sum(by_status_priority[status].values()) for status in STATUSES},
+            "by_priority": {
+                priority: sum(by_status_priority[status][priority] for status in STATUSES)
+                for priority in PRIORITIES
+            },
+            "by_status_priority": by_status_priority,
+            "created_per_day": [{"date": day, "count": self._days.get(day, 0)} for day in window],
+            "last_reconciled": self.last_reconciled.isoformat() + "Z" if self.last_reconciled else None,
+        }
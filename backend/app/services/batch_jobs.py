@@ -0,0 +1,377 @@
+import os
+import time
+import uuid
+import random
+import sqlite3
+import asyncio
+import logging
+import threading
+from typing import List, Optional, Tuple
+
+from ..models import ActionItem
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single worker is assumed
+    fcntl = None
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BatchJobStore:
+    """SQLite-backed job state, so batch jobs survive restarts"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS batch_jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    use_cache INTEGER NOT NULL,
+                    total INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                );
+                CREATE TABLE IF NOT EXISTS batch_job_items (
+                    job_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    transcript TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    action_items_count INTEGER,
+                    error TEXT,
+                    finished_at REAL,
+                    PRIMARY KEY (job_id, idx)
+                );
+                CREATE INDEX IF NOT EXISTS idx_batch_job_items_status ON batch_job_items (job_id, status);
+            """)
+            self._db.commit()
+
+    def _execute(self, sql: str, params=()) -> List[sqlite3.Row]:
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+            self._db.commit()
+            return rows
+
+    def create_job(self, job_id: str, transcripts: List[str], use_cache: bool):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO batch_jobs (id, status, use_cache, total, created_at) VALUES (?, 'queued', ?, ?, ?)",
+                (job_id, int(use_cache), len(transcripts), time.time()),
+            )
+            self._db.executemany(
+                "INSERT INTO batch_job_items (job_id, idx, transcript, status) VALUES (?, ?, ?, 'pending')",
+                [(job_id, idx, transcript) for idx, transcript in enumerate(transcripts)],
+            )
+            self._db.commit()
+
+    def resumable_items(self) -> List[Tuple[str, int]]:
+        """Items of unfinished jobs; anything 'running' was interrupted by a restart"""
+        self._execute("UPDATE batch_job_items SET status = 'pending' WHERE status = 'running'")
+        rows = self._execute(
+            "SELECT i.job_id, i.idx FROM batch_job_items i JOIN batch_jobs j ON j.id = i.job_id "
+            "WHERE j.status IN ('queued', 'running') AND i.status = 'pending' ORDER BY j.created_at, i.idx"
+        )
+        return [(row["job_id"], row["idx"]) for row in rows]
+
+    def unfinished_job_ids(self) -> List[str]:
+        return [row["id"] for row in self._execute("SELECT id FROM batch_jobs WHERE status IN ('queued', 'running')")]
+
+    def start_item(self, job_id: str, idx: int) -> Tuple[str, bool]:
+        """Mark an item running; returns (transcript, use_cache)"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE batch_job_items SET status = 'running', attempts = attempts + 1 WHERE job_id = ? AND idx = ?",
+                (job_id, idx),
+            )
+            self._db.execute(
+                "UPDATE batch_jobs SET status = 'running', started_at = COALESCE(started_at, ?) WHERE id = ?",
+                (time.time(), job_id),
+            )
+            row = self._db.execute(
+                "SELECT i.transcript, j.use_cache FROM batch_job_items i JOIN batch_jobs j ON j.id = i.job_id "
+                "WHERE i.job_id = ? AND i.idx = ?",
+                (job_id, idx),
+            ).fetchone()
+            self._db.commit()
+        return row["transcript"], bool(row["use_cache"])
+
+    def retry_item(self, job_id: str, idx: int, error: str):
+        self._execute(
+            "UPDATE batch_job_items SET attempts = attempts + 1, error = ? WHERE job_id = ? AND idx = ?",
+            (error, job_id, idx),
+        )
+
+    def finish_items(self, results: List[Tuple[str, int, Optional[int], Optional[str]]]):
+        """Record final outcomes: (job_id, idx, action_items_count, error)"""
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "UPDATE batch_job_items SET status = ?, action_items_count = ?, error = ?, finished_at = ? "
+                "WHERE job_id = ? AND idx = ?",
+                [("failed" if error else "completed", count, error, now, job_id, idx) for job_id, idx, count, error in results],
+            )
+            for job_id in {result[0] for result in results}:
+                self._finalize_job(job_id, now)
+            self._db.commit()
+
+    def finalize_jobs(self, job_ids: List[str]):
+        now = time.time()
+        with self._lock:
+            for job_id in job_ids:
+                self._finalize_job(job_id, now)
+            self._db.commit()
+
+    def _finalize_job(self, job_id: str, now: float):
+        open_items = self._db.execute(
+            "SELECT COUNT(*) FROM batch_job_items WHERE job_id = ? AND status IN ('pending', 'running')", (job_id,)
+        ).fetchone()[0]
+        if open_items:
+            return
+        failed = self._db.execute(
+            "SELECT COUNT(*) FROM batch_job_items WHERE job_id = ? AND status = 'failed'", (job_id,)
+        ).fetchone()[0]
+        self._db.execute(
+            "UPDATE batch_jobs SET status = ?, finished_at = ? WHERE id = ?",
+            ("completed_with_errors" if failed else "completed", now, job_id),
+        )
+
+    def get_job(self, job_id: str, include_items: bool = False) -> Optional[dict]:
+        jobs = self._execute("SELECT * FROM batch_jobs WHERE id = ?", (job_id,))
+        if not jobs:
+            return None
+        return self._job_to_dict(jobs[0], include_items)
+
+    def list_jobs(self, limit: int = 50) -> List[dict]:
+        jobs = self._execute("SELECT * FROM batch_jobs ORDER BY created_at DESC LIMIT ?", (limit,))
+        return [self._job_to_dict(job, include_items=False) for job in jobs]
+
+    def _job_to_dict(self, job: sqlite3.Row, include_items: bool) -> dict:
+        counts = {row["status"]: row["n"] for row in self._execute(
+            "SELECT status, COUNT(*) AS n FROM batch_job_items WHERE job_id = ? GROUP BY status", (job["id"],)
+        )}
+        created = self._execute(
+            "SELECT COALESCE(SUM(action_items_count), 0) FROM batch_job_items WHERE job_id = ?", (job["id"],)
+        )[0][0]
+        done = counts.get("completed", 0) + counts.get("failed", 0)
+        elapsed = None
+        if job["started_at"]:
+            elapsed = (job["finished_at"] or time.time()) - job["started_at"]
+
+        result = {
+            "job_id": job["id"],
+            "status": job["status"],
+            "total": job["total"],
+            "pending": counts.get("pending", 0),
+            "running": counts.get("running", 0),
+            "completed": counts.get("completed", 0),
+            "failed": counts.get("failed", 0),
+            "progress": round(done / job["total"], 4) if job["total"] else 1.0,
+            "action_items_created": created,
+            "elapsed_seconds": round(elapsed, 2) if elapsed is not None else None,
+            "transcripts_per_minute": round(done / elapsed * 60, 2) if elapsed else None,
+            "created_at": job["created_at"],
+            "finished_at": job["finished_at"],
+        }
+        if include_items:
+            result["items"] = [
+                {
+                    "index": row["idx"],
+                    "status": row["status"],
+                    "attempts": row["attempts"],
+                    "action_items_count": row["action_items_count"],
+                    "error": row["error"],
+                }
+                for row in self._execute(
+                    "SELECT idx, status, attempts, action_items_count, error FROM batch_job_items "
+                    "WHERE job_id = ? ORDER BY idx",
+                    (job["id"],),
+                )
+            ]
+        return result
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class BatchJobManager:
+    """
+    Runs batch transcript analysis jobs.
+
+    A bounded pool of workers runs extractions concurrently (each still goes
+    through the LLM scheduler), retrying each transcript with backoff. A single
+    writer collects results from all workers and saves them with bulk
+    `create_multiple_action_items` calls. A transcript is only marked completed
+    after its items are saved, so on restart unfinished work resumes. With
+    several server workers sharing the store, only the one holding the
+    store's resume lock picks up interrupted work.
+    """
+
+    def __init__(
+        self,
+        llm_service,
+        db_service,
+        store_path: str = "data/batch_jobs.db",
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        write_batch_size: int = 100,
+        write_interval: float = 1.0,
+    ):
+        self.llm_service = llm_service
+        self.db_service = db_service
+        self.store = BatchJobStore(store_path)
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.write_batch_size = write_batch_size
+        self.write_interval = write_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._results: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._resume_lock = None
+
+    @classmethod
+    def from_env(cls, llm_service, db_service) -> "BatchJobManager":
+        return cls(
+            llm_service,
+            db_service,
+            store_path=os.getenv("BATCH_JOB_STORE_PATH", "data/batch_jobs.db"),
+            concurrency=int(os.getenv("BATCH_JOB_CONCURRENCY", "4")),
+            max_attempts=int(os.getenv("BATCH_JOB_MAX_ATTEMPTS", "3")),
+            write_batch_size=int(os.getenv("BATCH_JOB_WRITE_BATCH_SIZE", "100")),
+        )
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._results = asyncio.Queue()
+        if self._acquire_resume_lock():
+            resumed = await asyncio.to_thread(self.store.resumable_items)
+            for entry in resumed:
+                self._queue.put_nowait(entry)
+            if resumed:
+                logger.info(f"Resuming {len(resumed)} batch transcripts from previous run")
+            # Jobs whose items all finished right before a restart still need a final status
+            await asyncio.to_thread(self.store.finalize_jobs, await asyncio.to_thread(self.store.unfinished_job_ids))
+        self._tasks = [asyncio.create_task(self._worker(), name=f"batch-worker-{n}") for n in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._writer(), name="batch-writer"))
+
+    def _acquire_resume_lock(self) -> bool:
+        """Whether this process resumes interrupted work; the lock is held until `stop`"""
+        if fcntl is None:
+            return True
+        lock = open(self.store.path + ".lock", "w")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            logger.info("Another worker resumes interrupted batch jobs")
+            return False
+        self._resume_lock = lock
+        return True
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.store.close()
+        if self._resume_lock:
+            self._resume_lock.close()
+            self._resume_lock = None
+
+    async def submit(self, transcripts: List[str], use_cache: bool = True) -> dict:
+        job_id = str(uuid.uuid4())
+        await asyncio.to_thread(self.store.create_job, job_id, transcripts, use_cache)
+        for idx in range(len(transcripts)):
+            self._queue.put_nowait((job_id, idx))
+        logger.info(f"Queued batch job {job_id} with {len(transcripts)} transcripts")
+        return await self.get_job(job_id)
+
+    async def get_job(self, job_id: str, include_items: bool = False) -> Optional[dict]:
+        return await asyncio.to_thread(self.store.get_job, job_id, include_items)
+
+    async def list_jobs(self) -> List[dict]:
+        return await asyncio.to_thread(self.store.list_jobs)
+
+    async def _worker(self):
+        while True:
+            job_id, idx = await self._queue.get()
+            try:
+                await self._process(job_id, idx)
+            except Exception as e:
+                logger.error(f"Batch job {job_id} item {idx} crashed: {e}")
+                await asyncio.to_thread(self.store.finish_items, [(job_id, idx, None, str(e))])
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job_id: str, idx: int):
+        transcript, use_cache = await asyncio.to_thread(self.store.start_item, job_id, idx)
+        attempt = 1
+        while True:
+            try:
+                action_items = await self.llm_service.extract_action_items(transcript, use_cache=use_cache)
+                break
+            except Exception as e:
+                if attempt >= self.max_attempts:
+                    logger.error(f"Batch job {job_id} item {idx} failed after {attempt} attempts: {e}")
+                    await asyncio.to_thread(self.store.finish_items, [(job_id, idx, None, str(e))])
+                    return
+                await asyncio.to_thread(self.store.retry_item, job_id, idx, str(e))
+                await asyncio.sleep(random.uniform(0, min(30.0, 2 ** attempt)))
+                attempt += 1
+        await self._results.put((job_id, idx, action_items))
+
+    async def _writer(self):
+        """Group results from all workers into bulk inserts"""
+        while True:
+            batch = [await self._results.get()]
+            count = len(batch[0][2])
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.write_interval
+            while count < self.write_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    result = await asyncio.wait_for(self._results.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(result)
+                count += len(result[2])
+            await self._write(batch)
+
+    async def _write(self, batch: List[Tuple[str, int, List[ActionItem]]]):
+        action_items = [item for _, _, items in batch for item in items]
+        saved = 0
+        error = None
+        for attempt in range(self.max_attempts):
+            try:
+                # Resume from the first unsaved chunk so retries never insert twice
+                while saved < len(action_items):
+                    chunk = action_items[saved:saved + self.write_batch_size]
+                    await self.db_service.create_multiple_action_items(chunk)
+                    saved += len(chunk)
+                error = None
+                break
+            except Exception as e:
+                error = f"Failed to save action items: {e}"
+                logger.warning(f"Batch writer failed (attempt {attempt + 1}/{self.max_attempts}): {e}")
+                if attempt + 1 < self.max_attempts:
+                    await asyncio.sleep(random.uniform(0, min(30.0, 2 ** attempt)))
+        await asyncio.to_thread(
+            self.store.finish_items,
+            [(job_id, idx, None if error else len(items), error) for job_id, idx, items in batch],
+        )
+        if not error:
+            logger.info(f"Batch writer saved {len(action_items)} action items for {len(batch)} transcripts")
@@ -0,0 +1,249 @@
+import io
+import os
+import csv
+import time
+import codecs
+import logging
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, Union
+
+import orjson
+from pydantic import ValidationError
+
+from ..models import ActionItem
+from .metrics import BULK_ROWS, BULK_SECONDS
+from .responses import ACTION_ITEM_COLUMNS, dumps, field_dicts
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Import field names are matched case-insensitively, in either naming style
+COLUMN_ALIASES = {column.lower(): column for column in ACTION_ITEM_COLUMNS}
+COLUMN_ALIASES.update({"created_at": "createdAt", "updated_at": "updatedAt"})
+
+
+def rows_per_second(rows: int, seconds: float) -> float:
+    return round(rows / seconds, 1) if seconds > 0 else 0.0
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_page(action_items: List[ActionItem], export_format: str) -> bytes:
+    """One page of an export: NDJSON lines or CSV records (no header)"""
+    rows = field_dicts(action_items)
+    if export_format == "ndjson":
+        return b"".join(dumps(row) + b"\n" for row in rows)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_csv_value(row[column]) for column in ACTION_ITEM_COLUMNS] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def export_stream(
+    first_page: Optional[List[ActionItem]],
+    pages: AsyncIterator[List[ActionItem]],
+    export_format: str,
+) -> AsyncIterator[bytes]:
+    """
+    Encode pages as they arrive, one chunk per page, so memory stays at one
+    page whatever the table size. The caller fetches the first page before
+    the response starts, so a storage error there still gets a proper 500;
+    a later one aborts the stream and the client sees a truncated response.
+    """
+    started = time.perf_counter()
+    count = 0
+    if export_format == "csv":
+        yield (",".join(ACTION_ITEM_COLUMNS) + "\r\n").encode("utf-8")
+    page = first_page
+    while page is not None:
+        count += len(page)
+        yield encode_page(page, export_format)
+        page = await anext(pages, None)
+    elapsed = time.perf_counter() - started
+    BULK_ROWS.inc("export", export_format, amount=count)
+    BULK_SECONDS.observe(elapsed, "export")
+    logger.info(
+        f"Exported {count} action items as {export_format} in {elapsed:.2f}s "
+        f"({rows_per_second(count, elapsed)} rows/s)"
+    )
+
+
+class RecordParser:
+    """
+    Incremental NDJSON / CSV parser: feed decoded text as it arrives and get
+    back (line number, field dict or error message) for every complete
+    record. CSV needs a header row naming the columns; a quoted field may
+    span lines.
+    """
+
+    def __init__(self, import_format: str):
+        self.import_format = import_format
+        self.line = 0
+        self._buffer = ""
+        self._header: Optional[List[Optional[str]]] = None
+        # CSV lines of a record whose quoted field is still open
+        self._record: List[str] = []
+        self._record_line = 0
+
+    def feed(self, text: str) -> List[Tuple[int, Union[dict, str]]]:
+        lines = (self._buffer + text).split("\n")
+        self._buffer = lines.pop()
+        return [record for line in lines for record in self._parse_line(line)]
+
+    def close(self) -> List[Tuple[int, Union[dict, str]]]:
+        records = self._parse_line(self._buffer) if self._buffer else []
+        self._buffer = ""
+        if self._record:
+            records.append((self._record_line, "Unterminated quoted field"))
+            self._record = []
+        return records
+
+    def _parse_line(self, line: str) -> List[Tuple[int, Union[dict, str]]]:
+        self.line += 1
+        if self.import_format == "ndjson":
+            if not line.strip():
+                return []
+            try:
+                value = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                return [(self.line, f"Invalid JSON: {e}")]
+            if not isinstance(value, dict):
+                return [(self.line, "Expected a JSON object")]
+            return [(self.line, {COLUMN_ALIASES.get(key.lower(), key): field for key, field in value.items()})]
+
+        if not self._record:
+            if not line.strip():
+                return []
+            self._record_line = self.line
+        self._record.append(line)
+        record = "\n".join(self._record)
+        # Quotes inside a quoted field are doubled, so an odd count means it is still open
+        if record.count('"') % 2:
+            return []
+        self._record = []
+        cells = next(csv.reader([record.rstrip("\r")]))
+        if self._header is None:
+            self._header = [COLUMN_ALIASES.get(cell.strip().lower()) for cell in cells]
+            if "text" not in self._header:
+                raise ValueError("The CSV header must include a text column")
+            return []
+        return [(self._record_line, {
+            column: cell for column, cell in zip(self._header, cells) if column and cell != ""
+        })]
+
+
+def validate_row(fields: dict) -> ActionItem:
+    """An ActionItem from imported fields; timestamps are stored as naive UTC like every other row"""
+    item = ActionItem.model_validate(fields)
+    if not item.text.strip():
+        raise ValueError("text: must not be empty")
+    for field in ("createdAt", "updatedAt"):
+        value = getattr(item, field)
+        if value is not None and value.tzinfo is not None:
+            setattr(item, field, value.astimezone(timezone.utc).replace(tzinfo=None))
+    return item
+
+
+def describe_error(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, detail['loc'])) or 'row'}: {detail['msg']}" for detail in error.errors())
+    return str(error)
+
+
+class BulkImportError(Exception):
+    """A batch failed to save; `summary` covers the rows handled before it"""
+
+    def __init__(self, message: str, summary: dict):
+        super().__init__(message)
+        self.summary = summary
+
+
+class BulkImporter:
+    """
+    Streams an uploaded NDJSON or CSV file into storage: records are parsed
+    and validated as the body arrives and saved in batches of `batch_size`
+    through `save` (import_action_items), so memory holds one batch whatever
+    the file size. Rows whose id is already stored replace it and are counted
+    as updated. Invalid rows are skipped and reported, up to
+    `max_errors` of them by line number.
+    """
+
+    def __init__(self, batch_size: int = 500, max_errors: int = 100):
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+
+    @classmethod
+    def from_env(cls) -> "BulkImporter":
+        return cls(
+            batch_size=int(os.getenv("IMPORT_BATCH_SIZE", "500")),
+            max_errors=int(os.getenv("IMPORT_MAX_ERRORS", "100")),
+        )
+
+    async def run(
+        self,
+        chunks: AsyncIterator[bytes],
+        import_format: str,
+        save: Callable[[List[ActionItem]], Awaitable[Tuple[List[ActionItem], List[ActionItem]]]],
+    ) -> dict:
+        started = time.perf_counter()
+        parser = RecordParser(import_format)
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        summary = {"rows": 0, "imported": 0, "updated": 0, "duplicates": 0, "invalid": 0, "errors": []}
+        batch: List[ActionItem] = []
+
+        async def flush():
+            try:
+                saved, updated = await save(batch)
+            except Exception as e:
+                raise BulkImportError(str(e), self._finish(summary, started, import_format))
+            # Near-duplicates come back as the existing items they were folded into
+            updated_ids = {item.id for item in updated}
+            new_ids = {item.id for item in batch} - updated_ids
+            imported = len(new_ids.intersection(item.id for item in saved))
+            summary["imported"] += imported
+            summary["updated"] += len(updated_ids)
+            summary["duplicates"] += len(batch) - imported - len(updated_ids)
+            batch.clear()
+
+        async def handle(records):
+            for line, record in records:
+                summary["rows"] += 1
+                try:
+                    if isinstance(record, str):
+                        raise ValueError(record)
+                    batch.append(validate_row(record))
+                except (ValueError, ValidationError) as e:
+                    summary["invalid"] += 1
+                    if len(summary["errors"]) < self.max_errors:
+                        summary["errors"].append({"line": line, "error": describe_error(e)})
+                    continue
+                if len(batch) >= self.batch_size:
+                    await flush()
+
+        try:
+            async for chunk in chunks:
+                await handle(parser.feed(decoder.decode(chunk)))
+            await handle(parser.feed(decoder.decode(b"", final=True)) + parser.close())
+        except UnicodeDecodeError:
+            raise ValueError(f"The file is not valid UTF-8 (near line {parser.line + 1})")
+        if batch:
+            await flush()
+        return self._finish(summary, started, import_format)
+
+    @staticmethod
+    def _finish(summary: dict, started: float, import_format: str) -> dict:
+        elapsed = time.perf_counter() - started
+        BULK_ROWS.inc("import", import_format, amount=summary["rows"])
+        BULK_SECONDS.observe(elapsed, "import")
+        logger.info(
+            f"Imported {summary['imported']} of {summary['rows']} rows ({summary['updated']} updated, {summary['duplicates']} duplicates, "
+            f"{summary['invalid']} invalid) in {elapsed:.2f}s ({rows_per_second(summary['rows'], elapsed)} rows/s)"
+        )
+        return dict(summary, seconds=round(elapsed, 3), rows_per_second=rows_per_second(summary["rows"], elapsed))
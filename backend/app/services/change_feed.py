@@ -0,0 +1,216 @@
+import os
+import uuid
+import asyncio
+import logging
+from collections import deque
+from itertools import islice
+from typing import AsyncIterator, Deque, List, Optional, Set, Tuple
+
+from ..models import ActionItem
+from .metrics import CHANGE_FEED_EVENTS, CHANGE_FEED_DROPPED_SUBSCRIBERS
+from .responses import dumps
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ChangeEvent:
+    """One versioned change; `frame` is the event pre-encoded as an SSE message, shared by every subscriber"""
+
+    __slots__ = ("version", "op", "id", "action_item", "frame")
+
+    def __init__(self, version: int, op: str, item_id: Optional[str], action_item: Optional[ActionItem], epoch: str):
+        self.version = version
+        self.op = op
+        self.id = item_id
+        self.action_item = action_item
+        self.frame = b"id: %s-%d\nevent: %s\ndata: %s\n\n" % (
+            epoch.encode(), version, op.encode(), dumps(self.to_dict(epoch))
+        )
+
+    def to_dict(self, epoch: str) -> dict:
+        # Deletes are tombstones: the id and version, no item
+        return {"epoch": epoch, "version": self.version, "op": self.op, "id": self.id, "action_item": self.action_item}
+
+
+class _Subscriber:
+    __slots__ = ("queue", "overflowed")
+
+    def __init__(self, size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self.overflowed = False
+
+
+class ChangeFeed:
+    """
+    In-process broadcaster of action item changes.
+
+    Every write recorded by the database service gets a version number, one
+    per changed item; deletes are kept as tombstones. The last `max_events`
+    changes stay in memory, so a client that knows its last version can ask
+    for just what changed since (`changes_since`) instead of reloading the
+    whole list. Versions are per process: the epoch changes on restart and
+    differs between workers, and a client whose cursor is from another epoch,
+    or older than the retained window, is told to reset (reload everything).
+
+    A write whose outcome is unknown (a failed storage call) is published as
+    a "reset" event for the same reason.
+
+    Live subscribers each get a bounded queue; one that falls `queue_size`
+    batches behind is dropped and sent a reset instead of slowing writers.
+    `close_subscribers` ends every live stream, e.g. when the worker drains.
+    """
+
+    def __init__(self, max_events: int = 10000, queue_size: int = 256):
+        self.max_events = max_events
+        self.queue_size = queue_size
+        self.epoch = uuid.uuid4().hex[:8]
+        self.version = 0
+        self._events: Deque[ChangeEvent] = deque(maxlen=max_events)
+        # Version of the newest event no longer retained (0: nothing evicted yet)
+        self._evicted_version = 0
+        self._subscribers: Set[_Subscriber] = set()
+
+        # Stats
+        self.published = 0
+        self.dropped_subscribers = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ChangeFeed"]:
+        if os.getenv("CHANGE_FEED_ENABLED", "true").lower() != "true":
+            return None
+        return cls(
+            max_events=int(os.getenv("CHANGE_FEED_MAX_EVENTS", "10000")),
+            queue_size=int(os.getenv("CHANGE_FEED_QUEUE_SIZE", "256")),
+        )
+
+    @property
+    def cursor(self) -> str:
+        """The current position, as clients pass it back in `since`"""
+        return f"{self.epoch}-{self.version}"
+
+    def parse_cursor(self, cursor: Optional[str]) -> Optional[int]:
+        """The version in a cursor from this epoch, or None if it cannot be resumed here"""
+        if not cursor:
+            return None
+        epoch, _, version = cursor.rpartition("-")
+        if epoch != self.epoch or not version.isdigit():
+            return None
+        version = int(version)
+        if version > self.version or version < self._evicted_version:
+            return None
+        return version
+
+    def publish(self, upserted: List[ActionItem] = (), deleted: List[str] = ()):
+        events = [self._append("upsert", item.id, item) for item in upserted]
+        events += [self._append("delete", item_id, None) for item_id in deleted]
+        if events:
+            self._broadcast(events)
+
+    def reset(self):
+        """Tell clients to reload: the store changed in a way that was not recorded item by item"""
+        self._broadcast([self._append("reset", None, None)])
+
+    def _append(self, op: str, item_id: Optional[str], action_item: Optional[ActionItem]) -> ChangeEvent:
+        self.version += 1
+        if len(self._events) == self.max_events:
+            self._evicted_version = self._events[0].version
+        event = ChangeEvent(self.version, op, item_id, action_item, self.epoch)
+        self._events.append(event)
+        self.published += 1
+        CHANGE_FEED_EVENTS.inc(op)
+        return event
+
+    def _broadcast(self, events: List[ChangeEvent]):
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(events)
+            except asyncio.QueueFull:
+                # Too far behind; it resyncs from a reset instead of holding up writes
+                subscriber.overflowed = True
+                self._subscribers.discard(subscriber)
+                self.dropped_subscribers += 1
+                CHANGE_FEED_DROPPED_SUBSCRIBERS.inc()
+                logger.warning("Dropped a change feed subscriber that fell too far behind")
+
+    def close_subscribers(self):
+        """End every live subscription; clients reconnect (to another worker) and resume from their cursor"""
+        for subscriber in list(self._subscribers):
+            self._subscribers.discard(subscriber)
+            try:
+                subscriber.queue.put_nowait(None)
+            except asyncio.QueueFull:
+                # Too far behind to take the end marker; it ends with a reset instead
+                subscriber.overflowed = True
+
+    def changes_since(self, cursor: Optional[str], limit: int = 1000) -> Tuple[Optional[List[ChangeEvent]], str, bool]:
+        """
+        Changes after a cursor, one per item (its latest: the row or a
+        tombstone), oldest first.
+
+        Returns (changes, cursor to resume from, has_more); changes is None
+        when the cursor cannot be resumed and the client must reload. At most
+        `limit` events are read; when more remain, has_more is set and the
+        returned cursor points just after the last one read.
+        """
+        version = self.parse_cursor(cursor)
+        if version is None:
+            return None, self.cursor, False
+
+        # Versions are contiguous, so the first newer event is found by offset
+        start = len(self._events) - (self.version - version)
+        window = list(islice(self._events, start, start + limit))
+        if any(event.op == "reset" for event in window):
+            return None, self.cursor, False
+
+        latest = {}
+        for event in window:
+            latest.pop(event.id, None)
+            latest[event.id] = event
+        last_version = window[-1].version if window else version
+        return list(latest.values()), f"{self.epoch}-{last_version}", last_version < self.version
+
+    async def subscribe(self, cursor: Optional[str] = None) -> AsyncIterator[ChangeEvent]:
+        """
+        Live changes, preceded by the retained ones after `cursor` if given (or
+        by a reset event if it cannot be resumed). Ends with a reset event if
+        the subscriber falls too far behind.
+        """
+        subscriber = _Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        try:
+            if cursor is not None:
+                version = self.parse_cursor(cursor)
+                if version is None:
+                    yield ChangeEvent(self.version, "reset", None, None, self.epoch)
+                else:
+                    for event in list(islice(self._events, len(self._events) - (self.version - version), None)):
+                        yield event
+            while True:
+                if subscriber.overflowed and subscriber.queue.empty():
+                    yield ChangeEvent(self.version, "reset", None, None, self.epoch)
+                    return
+                events = await subscriber.queue.get()
+                if events is None:
+                    return
+                for event in events:
+                    yield event
+        finally:
+            self._subscribers.discard(subscriber)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def stats(self) -> dict:
+        oldest = self._events[0].version if self._events else self.version + 1
+        return {
+            "epoch": self.epoch,
+            "version": self.version,
+            "retained_events": len(self._events),
+            "oldest_version": oldest,
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped_subscribers": self.dropped_subscribers,
+        }
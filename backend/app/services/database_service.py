@@ -1,36 +1,191 @@
 import os
+import json
+import asyncio
+import base64
 import logging
+from collections import Counter
 from datetime import datetime
-import requests
-from typing import List, Optional
-from ..models import ActionItem
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from ..models import ActionItem, trusted_action_item
+from .action_item_cache import ActionItemCache
+from .action_item_stats import ActionItemStats, stats_key
+from .search_index import SearchIndex
+from .duplicate_index import DuplicateIndex, merge_fields
+from .storage import InstrumentedStorage, StorageBackend, create_storage_backend
+from .write_outbox import WriteOutbox
+from .single_flight import SingleFlight
+from .change_feed import ChangeFeed
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Enum columns are sorted by rank, not alphabetically: each value is paged as
+# its own bucket (listed in ascending order) with a (created_at, id) keyset inside
+SORT_BUCKETS = {
+    "priority": ["low", "medium", "high"],
+    "status": ["completed", "pending"],
+}
+SORT_FIELDS = ["created_at", "priority", "status"]
+# Full scans read the table in keyset pages. A page fetches one row more than
+# its size, so this stays under PostgREST's default max-rows (1000), which
+# would otherwise cut a page short without a next cursor
+SCAN_PAGE_SIZE = 500
+
+
+def encode_cursor(sort_by: str, order: str, bucket: Optional[str], created_at: str, item_id: str) -> str:
+    """Opaque keyset cursor pointing just after the given row"""
+    payload = json.dumps([sort_by, order, bucket, created_at, item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, Optional[str], str, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_by, order, bucket, created_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return sort_by, order, bucket, created_at, item_id
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+class FoldedBatch:
+    """
+    Near-duplicate folding state of one batch of new items: the items to
+    insert and the existing items others were folded into
+    """
+
+    __slots__ = ("index", "fresh", "existing")
+
+    def __init__(self, index: DuplicateIndex):
+        self.index = index
+        self.fresh: Dict[str, ActionItem] = {}
+        self.existing: Dict[str, ActionItem] = {}
+
+
 class DatabaseService:
-    """Service for database operations using Supabase REST API"""
-
-    def __init__(self):
-        self.supabase_url = os.getenv("SUPABASE_URL")
-        self.supabase_key = os.getenv("SUPABASE_KEY") or os.getenv("SUPABASE_ANON_KEY")
-
-        if not self.supabase_url or not self.supabase_key:
-            raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
-
-        # Set up headers for Supabase REST API
-        self.headers = {
-            "apikey": self.supabase_key,
-            "Authorization": f"Bearer {self.supabase_key}",
-            "Content-Type": "application/json",
-            "Prefer": "return=representation"
-        }
-        
-        logger.info("✅ Supabase REST API client initialized successfully")
+    """Service for action item database operations on a pluggable storage backend"""
+
+    def __init__(self, storage: Optional[StorageBackend] = None):
+        # Supabase REST API by default, or embedded SQLite (see STORAGE_BACKEND);
+        # every call's round-trip time is recorded in the db_operation metrics
+        self.storage = InstrumentedStorage(storage or create_storage_backend())
+
+        # Read-through cache, aggregate counts and search index kept current by the write paths below
+        self.cache = ActionItemCache.from_env()
+        self.stats = ActionItemStats.from_env()
+        self.search_index = SearchIndex()
+        self.duplicates = DuplicateIndex.from_env()
+        # Indexes built from a full scan on first use and again only after a
+        # failed write, or every SEARCH_INDEX_REBUILD_INTERVAL seconds if set
+        self._indexes = [self.search_index] + ([self.duplicates] if self.duplicates else [])
+        self.index_rebuild_interval = float(os.getenv("SEARCH_INDEX_REBUILD_INTERVAL", "0"))
+        self._indexes_stale = True
+        self._index_lock = asyncio.Lock()
+        self._index_task: Optional[asyncio.Task] = None
+
+        # New items are queued in a local log and written to storage in the background
+        self.outbox = WriteOutbox.from_env()
+        # How long reads wait for queued items to reach storage (read-your-writes)
+        self.outbox_read_wait = float(os.getenv("WRITE_OUTBOX_READ_WAIT", "2"))
+
+        # Identical concurrent reads share one storage query. Keys include the
+        # write count, so a read never joins a query that started before a write
+        self.page_flights = SingleFlight("list_action_items")
+        self.item_flights = SingleFlight("get_action_item")
+        self._writes = 0
+
+        # Versioned change events for live subscribers and delta sync
+        self.changes = ChangeFeed.from_env()
+
+    async def connect(self):
+        """Open the storage backend's connections, replay the write outbox, start stats reconciliation and build the indexes"""
+        await self.storage.open()
+        if self.outbox:
+            await self.outbox.open(self._flush_rows)
+        self.stats.start(self._count_rows)
+        self._index_task = asyncio.create_task(self._index_loop(), name="search-index")
+
+    async def close(self):
+        """Stop background work, drain the write outbox and release the storage backend's connections"""
+        await self.stats.stop()
+        if self._index_task is not None:
+            self._index_task.cancel()
+            await asyncio.gather(self._index_task, return_exceptions=True)
+            self._index_task = None
+        if self.outbox:
+            await self.outbox.close()
+        await self.storage.close()
+
+    async def _flush_rows(self, rows: List[dict]):
+        """Write outbox flush: idempotent bulk insert of queued rows"""
+        await self.storage.upsert_rows(rows)
+        # Pages read while these rows were queued may lack them
+        self._writes += 1
+        if self.cache:
+            self.cache.record_write()
+
+    async def _wait_stored(self) -> bool:
+        """Wait for the items queued now to reach storage before a query that reads or writes many rows"""
+        if not self.outbox:
+            return True
+        return await self.outbox.wait_flushed(timeout=self.outbox_read_wait)
+
+    async def _count_rows(self) -> List[Tuple[str, str, str, int]]:
+        """Grouped count of the store, plus the items still queued in the write outbox"""
+        if not self.outbox:
+            return await self.storage.count_rows()
+        # No flush may move rows from the queue into storage between the two counts
+        async with self.outbox.paused():
+            groups = list(await self.storage.count_rows())
+            queued = Counter(stats_key(row) for row in self.outbox.pending_rows())
+        return groups + [key + (count,) for key, count in queued.items()]
+
+    def _record_write(
+        self,
+        upserted: List[ActionItem] = (),
+        deleted: List[str] = (),
+        added: List[dict] = (),
+        removed: List[dict] = (),
+    ):
+        """Apply a stored write: `added` and `removed` are the rows as stored after and before it"""
+        self._writes += 1
+        if self.cache:
+            self.cache.record_write(upserted=upserted, deleted=deleted)
+        self.stats.record_write(added=[stats_key(row) for row in added], removed=[stats_key(row) for row in removed])
+        for index in self._indexes:
+            index.record_write(upserted=upserted, deleted=deleted)
+        if self.changes:
+            self.changes.publish(upserted=upserted, deleted=deleted)
+
+    def _write_failed(self):
+        # The store may or may not have applied the write
+        self._writes += 1
+        if self.cache:
+            self.cache.invalidate()
+        self.stats.mark_stale()
+        self._indexes_stale = True
+        if self.changes:
+            self.changes.reset()
 
-    def create_action_item(self, action_item: ActionItem) -> ActionItem:
+    @staticmethod
+    def _row_to_action_item(row: dict) -> ActionItem:
+        """
+        Trusted-row fast path: rows come from our own store, written from
+        validated ActionItems, so the model is built without re-validation.
+        fromisoformat (Python 3.11+) parses both `Z` and `+00:00` offsets.
+        """
+        updated_at = row.get("updated_at")
+        return trusted_action_item(
+            id=row["id"],
+            text=row["text"],
+            status=row["status"],
+            priority=row["priority"],
+            createdAt=datetime.fromisoformat(row["created_at"]),
+            updatedAt=datetime.fromisoformat(updated_at) if updated_at else None
+        )
+
+    async def create_action_item(self, action_item: ActionItem) -> ActionItem:
         """Insert a new action item into the database"""
         try:
             current_time = datetime.utcnow().isoformat()
@@ -43,125 +198,591 @@ class DatabaseService:
                 "updated_at": current_time  # Set updated_at to current time on creation
             }
 
-            url = f"{self.supabase_url}/rest/v1/action_items"
-            response = requests.post(url, json=item_data, headers=self.headers)
-            response.raise_for_status()
+            await self.storage.insert_rows([item_data])
+
+            action_item = self._row_to_action_item(item_data)
+            self._record_write(upserted=[action_item], added=[item_data])
 
             logger.info(f"Created action item with ID: {action_item.id}")
             return action_item
 
         except Exception as e:
+            self._write_failed()
             logger.error(f"❌ Database insertion error: {e}")
             raise
 
-    def create_multiple_action_items(self, action_items: List[ActionItem]) -> List[ActionItem]:
-        """Insert multiple action items into the database"""
+    async def create_multiple_action_items(
+        self,
+        action_items: List[ActionItem],
+        folded: Optional[FoldedBatch] = None,
+        keep_timestamps: bool = False,
+    ) -> List[ActionItem]:
+        """
+        Insert multiple action items into the database
+        
+        Near-duplicates of existing items (or of each other) are skipped or
+        merged into the existing item according to DUPLICATE_MODE; the result
+        then holds the existing item in their place. A batch already folded
+        item by item (`fold_duplicate`) is passed as `folded` and saved as
+        folded there. Items are stamped with the current time unless
+        `keep_timestamps` is set (imports).
+        """
+        existing: List[ActionItem] = []
         try:
-            current_time = datetime.utcnow().isoformat()
-            items_data = []
-            for item in action_items:
-                items_data.append({
-                    "id": item.id,
-                    "text": item.text,
-                    "status": item.status,
-                    "priority": item.priority,
-                    "created_at": current_time,
-                    "updated_at": current_time  # Set updated_at to current time on creation
-                })
-
-            url = f"{self.supabase_url}/rest/v1/action_items"
-            response = requests.post(url, json=items_data, headers=self.headers)
-            response.raise_for_status()
+            if folded is not None:
+                action_items, existing = list(folded.fresh.values()), list(folded.existing.values())
+            elif self.duplicates:
+                action_items, existing = await self._fold_duplicates(action_items)
+            if not action_items:
+                return existing
+
+            items_data = self._item_rows(action_items, keep_timestamps)
+
+            if self.outbox:
+                # Durable once logged; the outbox flusher writes them to storage
+                await self.outbox.append(items_data)
+            else:
+                await self.storage.insert_rows(items_data)
+
+            # Return the items with the timestamps that were actually stored
+            action_items = [self._row_to_action_item(row) for row in items_data]
+            self._record_write(upserted=action_items, added=items_data)
 
             logger.info(f"Created {len(action_items)} action items")
-            return action_items
+            return action_items + existing
 
         except Exception as e:
+            self._write_failed()
             logger.error(f"❌ Database insertion error: {e}")
             raise
 
-    def get_all_action_items(self) -> List[ActionItem]:
+    @staticmethod
+    def _item_rows(action_items: List[ActionItem], keep_timestamps: bool) -> List[dict]:
+        current_time = datetime.utcnow().isoformat()
+        items_data = []
+        for item in action_items:
+            created_at = item.createdAt.isoformat() if keep_timestamps else current_time
+            items_data.append({
+                "id": item.id,
+                "text": item.text,
+                "status": item.status,
+                "priority": item.priority,
+                "created_at": created_at,
+                # Set updated_at to the creation time
+                "updated_at": item.updatedAt.isoformat() if keep_timestamps and item.updatedAt else created_at
+            })
+        return items_data
+
+    async def import_action_items(self, action_items: List[ActionItem]) -> Tuple[List[ActionItem], List[ActionItem]]:
+        """
+        Save imported items with their own ids and timestamps
+        
+        An item whose id is already stored (or queued in the write outbox)
+        replaces that row instead of going through duplicate folding, so
+        re-importing an edited export updates it. Other items are created as
+        in create_multiple_action_items.
+        
+        Returns:
+            Tuple of (items created - or the existing items their duplicates were folded into, items updated)
+        """
+        # A repeated id in one batch: the last row wins
+        action_items = list({item.id: item for item in action_items}.values())
+        rows = {row["id"]: row for row in self._item_rows(action_items, keep_timestamps=True)}
+        updated: List[ActionItem] = []
+        try:
+            # Queued rows are swapped in the outbox log, so the flusher stores the imported version
+            replaced = await self.outbox.replace(list(rows.values())) if self.outbox else []
+            if replaced:
+                queued = [after for _, after in replaced]
+                updated = [self._row_to_action_item(row) for row in queued]
+                self._record_write(upserted=updated, added=queued, removed=[before for before, _ in replaced])
+
+            queued_ids = {item.id for item in updated}
+            rest = [item_id for item_id in rows if item_id not in queued_ids]
+            stored = await self.storage.existing_ids(rest) if rest else set()
+            if stored:
+                stored_rows = [rows[item_id] for item_id in rest if item_id in stored]
+                await self.storage.upsert_rows(stored_rows, overwrite=True)
+                stored_items = [self._row_to_action_item(row) for row in stored_rows]
+                self._record_write(upserted=stored_items)
+                # The replaced rows' previous values are not read; recount before the next stats read
+                self.stats.mark_stale()
+                updated += stored_items
+            if updated:
+                logger.info(f"Updated {len(updated)} imported action items")
+        except Exception as e:
+            self._write_failed()
+            logger.error(f"❌ Database import error: {e}")
+            raise
+
+        updated_ids = {item.id for item in updated}
+        created = [item for item in action_items if item.id not in updated_ids]
+        if created:
+            created = await self.create_multiple_action_items(created, keep_timestamps=True)
+        return created, updated
+
+    async def _fold_duplicates(self, action_items: List[ActionItem]) -> Tuple[List[ActionItem], List[ActionItem]]:
+        """
+        Split a batch into new items and the existing items their duplicates
+        were folded into
+        
+        Returns:
+            Tuple of (items to insert, existing items matched - merged when mode is merge)
+        """
+        batch = self.fold_batch()
+        for item in action_items:
+            await self.fold_duplicate(batch, item)
+
+        folded = len(action_items) - len(batch.fresh)
+        if folded:
+            logger.info(f"Folded {folded} near-duplicate action items ({self.duplicates.mode})")
+        return list(batch.fresh.values()), list(batch.existing.values())
+
+    def fold_batch(self) -> Optional[FoldedBatch]:
+        """Folding state for a batch built item by item, or None without duplicate detection"""
+        return FoldedBatch(self.duplicates.empty_copy()) if self.duplicates else None
+
+    async def fold_duplicate(self, batch: FoldedBatch, item: ActionItem) -> ActionItem:
+        """
+        Fold one new item into `batch`; returns the item it will be stored as:
+        itself, an earlier item of the batch or an existing stored item
+        """
+        # Hashed once for the batch lookup, the index lookup and the batch add
+        fingerprint = self.duplicates.fingerprint(item.text)
+        match = batch.index.find(item.text, fingerprint)
+        if match:
+            target = batch.fresh[match[0]]
+            if self.duplicates.mode == "merge":
+                target = batch.fresh[match[0]] = target.model_copy(update=merge_fields(target, item))
+                batch.index.add(target.id, target.text)
+            return target
+
+        # Until the first scan has indexed the store only this batch is checked,
+        # so ingest never waits on a full rebuild
+        match = self.duplicates.find(item.text, fingerprint) if self.duplicates.ready else None
+        stored = await self.get_action_item(match[0]) if match else None
+        if stored is None:
+            batch.fresh[item.id] = item
+            batch.index.add(item.id, item.text, fingerprint)
+            return item
+
+        if self.duplicates.mode == "merge":
+            updates = merge_fields(stored, item)
+            if updates != {"text": stored.text, "priority": stored.priority}:
+                stored = await self.update_action_item(stored.id, updates) or stored
+        batch.existing[stored.id] = stored
+        return stored
+
+    async def get_all_action_items(self) -> List[ActionItem]:
         """Fetch all action items"""
+        action_items, cursor = await self.get_action_items_page(limit=SCAN_PAGE_SIZE)
+        while cursor:
+            page, cursor = await self.get_action_items_page(limit=SCAN_PAGE_SIZE, cursor=cursor)
+            action_items.extend(page)
+        return action_items
+
+    async def iter_action_items(self, page_size: int = SCAN_PAGE_SIZE, **query) -> AsyncIterator[List[ActionItem]]:
+        """
+        Every item matching a query, one keyset page at a time, straight from
+        storage (pages are not cached); takes the filters and sort of
+        `_fetch_action_items_page`
+        """
+        if self.outbox and self.outbox.pending_count:
+            await self._wait_stored()
+        cursor = None
+        while True:
+            action_items, cursor = await self._fetch_action_items_page(limit=page_size, cursor=cursor, **query)
+            if action_items:
+                yield action_items
+            if not cursor:
+                return
+
+    async def get_action_item_stats(self, days: int = 30) -> dict:
+        """Aggregate counts, recounted from storage first if they may be off"""
+        if self.stats.stale:
+            await self.stats.reconcile(self._count_rows, only_if_stale=True)
+        return self.stats.snapshot(days=days)
+
+    async def search_action_items(
+        self,
+        query: str,
+        limit: int = 20,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> Tuple[List[dict], int]:
+        """Ranked full-text search (see SearchIndex.search)"""
+        await self._ensure_indexes()
+        return self.search_index.search(query, limit=limit, status=status, priority=priority)
+
+    async def _ensure_indexes(self):
+        """Rebuild the search and duplicate indexes from a full scan if never built or a write failed since"""
+        if not self._indexes_stale:
+            return
+        async with self._index_lock:
+            if not self._indexes_stale:
+                # Rebuilt while this call waited for the lock
+                return
+            self._indexes_stale = False
+            for index in self._indexes:
+                index.begin_rebuild()
+            try:
+                action_items = await self._scan_action_items()
+            except Exception:
+                self._indexes_stale = True
+                for index in self._indexes:
+                    index.abort_rebuild()
+                raise
+            for index in self._indexes:
+                await index.finish_rebuild(action_items)
+
+    async def _index_loop(self):
+        """Build the indexes at startup, then every `index_rebuild_interval` seconds if set"""
+        while True:
+            try:
+                await self._ensure_indexes()
+            except Exception as e:
+                logger.error(f"❌ Error building search indexes: {e}")
+            if not self.index_rebuild_interval:
+                return
+            await asyncio.sleep(self.index_rebuild_interval)
+            self._indexes_stale = True
+
+    async def _scan_action_items(self) -> List[ActionItem]:
+        """
+        Every item, read in keyset pages straight from storage (bypassing the
+        page cache), plus the items queued in the write outbox
+        """
+        # Taken first: a queued row flushed mid-scan may land on a page already read
+        queued = self.outbox.pending_rows() if self.outbox else []
+        action_items, cursor = await self._fetch_action_items_page(limit=SCAN_PAGE_SIZE)
+        while cursor:
+            page, cursor = await self._fetch_action_items_page(limit=SCAN_PAGE_SIZE, cursor=cursor)
+            action_items.extend(page)
+        stored = {item.id for item in action_items}
+        return action_items + [self._row_to_action_item(row) for row in queued if row["id"] not in stored]
+
+    def action_items_etag(self, **query) -> Optional[str]:
+        """ETag of the cached page for a query, if it is cached and fresh"""
+        if not self.cache:
+            return None
+        return self.cache.page_etag(self._page_key(**query))
+
+    def action_item_etag(self, item_id: str) -> Optional[str]:
+        """ETag of a cached single item, if it is cached and fresh"""
+        if not self.cache:
+            return None
+        return self.cache.item_etag(item_id)
+
+    @staticmethod
+    def _page_key(
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        search: Optional[str] = None,
+        sort_by: str = "created_at",
+        order: str = "desc",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> tuple:
+        return (status, priority, search, sort_by, order, limit, cursor)
+
+    async def get_action_items_page(self, **query) -> Tuple[List[ActionItem], Optional[str]]:
+        """Read-through cached version of `_fetch_action_items_page` (same arguments)"""
+        if self.outbox and self.outbox.pending_count:
+            await self._wait_stored()
+        key = self._page_key(**query)
+        if self.cache:
+            cached = self.cache.get_page(key)
+            if cached is not None:
+                return cached[0], cached[1]
+        return await self.page_flights.do((self._writes, key), lambda: self._load_page(key, query))
+
+    async def _load_page(self, key: tuple, query: dict) -> Tuple[List[ActionItem], Optional[str]]:
+        if not self.cache:
+            return await self._fetch_action_items_page(**query)
+        version = self.cache.version
+        action_items, next_cursor = await self._fetch_action_items_page(**query)
+        self.cache.set_page(key, action_items, next_cursor, version)
+        return action_items, next_cursor
+
+    async def get_action_item(self, item_id: str) -> Optional[ActionItem]:
+        """Fetch a single action item by id"""
+        if self.cache:
+            cached = self.cache.get_item(item_id)
+            if cached is not None:
+                return cached[0]
+
+        if self.outbox:
+            row = self.outbox.pending_row(item_id)
+            if row is not None:
+                return self._row_to_action_item(row)
+
+        return await self.item_flights.do((self._writes, item_id), lambda: self._load_item(item_id))
+
+    async def _load_item(self, item_id: str) -> Optional[ActionItem]:
+        version = self.cache.version if self.cache else None
+        try:
+            row = await self.storage.select_by_id(item_id)
+            if row is None:
+                return None
+            action_item = self._row_to_action_item(row)
+            if self.cache:
+                self.cache.set_item(action_item, version)
+            return action_item
+
+        except Exception as e:
+            logger.error(f"❌ Error retrieving item {item_id}: {e}")
+            raise
+
+    async def _fetch_action_items_page(
+        self,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        search: Optional[str] = None,
+        sort_by: str = "created_at",
+        order: str = "desc",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[ActionItem], Optional[str]]:
+        """
+        Fetch one page of action items with filters and sorting pushed down to storage
+        
+        Args:
+            status: Only items with this status
+            priority: Only items with this priority
+            search: Case-insensitive substring match on the item text
+            sort_by: created_at, priority or status (enum fields sort by rank, newest first within a rank)
+            order: asc or desc
+            limit: Page size (None returns every matching row)
+            cursor: Opaque cursor from a previous page
+            
+        Returns:
+            Tuple of (action items, cursor for the next page or None)
+        """
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {sort_by}")
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unsupported sort order: {order}")
+
+        after = None
+        if cursor:
+            cursor_sort, cursor_order, cursor_bucket, created_at, item_id = decode_cursor(cursor)
+            if (cursor_sort, cursor_order) != (sort_by, order):
+                raise ValueError("Cursor does not match the requested sort")
+            after = (cursor_bucket, created_at, item_id)
+
+        base_filters = {"status": status, "priority": priority, "search": search}
+
+        if sort_by in SORT_BUCKETS:
+            buckets = SORT_BUCKETS[sort_by] if order == "asc" else list(reversed(SORT_BUCKETS[sort_by]))
+            selected = status if sort_by == "status" else priority
+            if selected:
+                buckets = [bucket for bucket in buckets if bucket == selected]
+            if after:
+                buckets = buckets[buckets.index(after[0]):] if after[0] in buckets else []
+            keyset_order = "desc"
+        else:
+            buckets = [None]
+            keyset_order = order
+
         try:
-            url = f"{self.supabase_url}/rest/v1/action_items"
-            params = {"order": "created_at.desc"}
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-
-            data = response.json()
-            action_items = []
-            for row in data:
-                action_item = ActionItem(
-                    id=row["id"],
-                    text=row["text"],
-                    status=row["status"],
-                    priority=row["priority"],
-                    createdAt=datetime.fromisoformat(row["created_at"].replace('Z', '+00:00')),
-                    updatedAt=datetime.fromisoformat(row["updated_at"].replace('Z', '+00:00')) if row.get("updated_at") else None
+            rows = []
+            for bucket in buckets:
+                # Fetch one extra row to know whether another page exists
+                remaining = None if limit is None else limit + 1 - len(rows)
+                if remaining is not None and remaining <= 0:
+                    break
+
+                filters = dict(base_filters)
+                if bucket is not None:
+                    filters[sort_by] = bucket
+                bucket_rows = await self.storage.select_rows(
+                    filters,
+                    order=keyset_order,
+                    limit=remaining,
+                    after=after[1:] if after and after[0] == bucket else None,
                 )
-                action_items.append(action_item)
+                rows.extend((bucket, row) for row in bucket_rows)
+
+            next_cursor = None
+            if limit is not None and len(rows) > limit:
+                rows = rows[:limit]
+                last_bucket, last_row = rows[-1]
+                next_cursor = encode_cursor(sort_by, order, last_bucket, last_row["created_at"], last_row["id"])
+
+            action_items = [self._row_to_action_item(row) for _, row in rows]
 
             logger.info(f"Retrieved {len(action_items)} action items")
-            return action_items
+            return action_items, next_cursor
 
         except Exception as e:
             logger.error(f"❌ Error retrieving action items: {e}")
             raise
 
-    def update_action_item(self, item_id: str, updates: dict) -> Optional[ActionItem]:
-        """Update an existing action item"""
+    async def update_action_item(self, item_id: str, updates: dict) -> Optional[ActionItem]:
+        """Update an existing action item (in the write outbox if it is still queued there)"""
         try:
             updates["updated_at"] = datetime.utcnow().isoformat()
-            
-            url = f"{self.supabase_url}/rest/v1/action_items"
-            params = {"id": f"eq.{item_id}"}
-            response = requests.patch(url, json=updates, headers=self.headers, params=params)
-            response.raise_for_status()
 
-            data = response.json()
+            patched = await self.outbox.patch([item_id], updates) if self.outbox else []
+            if patched:
+                before, after = patched[0]
+                logger.info(f"Updated queued item {item_id}")
+                action_item = self._row_to_action_item(after)
+                self._record_write(upserted=[action_item], added=[after], removed=[before])
+                return action_item
+
+            # The stats need the old status/priority when either one changes
+            before = await self.storage.select_by_id(item_id) if {"status", "priority"} & set(updates) else None
+
+            data = await self.storage.update_rows(updates, ids=[item_id])
             if data:
                 logger.info(f"Updated item {item_id}")
-                row = data[0]
-                return ActionItem(
-                    id=row["id"],
-                    text=row["text"],
-                    status=row["status"],
-                    priority=row["priority"],
-                    createdAt=datetime.fromisoformat(row["created_at"].replace('Z', '+00:00')),
-                    updatedAt=datetime.fromisoformat(row["updated_at"].replace('Z', '+00:00')) if row.get("updated_at") else None
-                )
+                action_item = self._row_to_action_item(data[0])
+                if before is not None:
+                    self._record_write(upserted=[action_item], added=data, removed=[before])
+                else:
+                    self._record_write(upserted=[action_item])
+                return action_item
             else:
                 logger.warning(f"No item found with ID {item_id}")
                 return None
 
         except Exception as e:
+            self._write_failed()
             logger.error(f"❌ Error updating item: {e}")
             raise
 
-    def delete_action_item(self, item_id: str) -> bool:
+    async def delete_action_item(self, item_id: str) -> bool:
         """Delete an item from the database"""
         try:
-            url = f"{self.supabase_url}/rest/v1/action_items"
-            params = {"id": f"eq.{item_id}"}
-            response = requests.delete(url, headers=self.headers, params=params)
-            response.raise_for_status()
+            dropped = await self.outbox.discard([item_id]) if self.outbox else []
+            # Storage too: a flush may have stored the row even if it failed to report back
+            rows = await self.storage.delete_rows(ids=[item_id])
+
+            self._record_write(deleted=[item_id], removed=dropped or rows)
 
             logger.info(f"Deleted item {item_id}")
             return True
 
         except Exception as e:
+            self._write_failed()
             logger.error(f"❌ Error deleting item: {e}")
             raise
 
-    def test_connection(self) -> bool:
-        """Test Supabase connection"""
-        try:
-            url = f"{self.supabase_url}/rest/v1/action_items"
-            params = {"select": "id", "limit": "1"}
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
+    async def bulk_update_action_items(
+        self,
+        updates: dict,
+        ids: Optional[List[str]] = None,
+        filters: Optional[dict] = None,
+    ) -> Tuple[List[ActionItem], Dict[str, str]]:
+        """
+        Apply the same update to many action items
+        
+        Args:
+            updates: Fields to set (already validated by the caller)
+            ids: Item ids - chunked by the backend's `max_ids_per_call`
+            filters: Alternatively, a status/priority/search filter
+            
+        Returns:
+            Tuple of (updated items, {id: error} for chunks that failed)
+        """
+        updates = dict(updates, updated_at=datetime.utcnow().isoformat())
+        updated: List[ActionItem] = []
+        errors: Dict[str, str] = {}
+        if self.outbox and ids is not None:
+            # Items still queued are updated in the outbox; the rest in storage
+            patched = await self.outbox.patch(ids, updates)
+            if patched:
+                queued = [self._row_to_action_item(after) for _, after in patched]
+                self._record_write(
+                    upserted=queued,
+                    added=[after for _, after in patched],
+                    removed=[before for before, _ in patched],
+                )
+                updated.extend(queued)
+                patched_ids = {item.id for item in queued}
+                ids = [item_id for item_id in ids if item_id not in patched_ids]
+        elif ids is None and not await self._wait_stored():
+            logger.warning("Bulk update started with action items still queued for storage")
+        stored: List[ActionItem] = []
+        for chunk_ids in self._bulk_chunks(ids, filters):
+            try:
+                rows = await self.storage.update_rows(updates, ids=chunk_ids, filters=filters)
+                stored.extend(self._row_to_action_item(row) for row in rows)
+            except Exception as e:
+                logger.error(f"❌ Error bulk updating items: {e}")
+                if chunk_ids is None:
+                    raise
+                errors.update({item_id: str(e) for item_id in chunk_ids})
+
+        self._record_write(upserted=stored)
+        if stored and {"status", "priority"} & set(updates):
+            # The rows' previous values are not returned; recount before the next stats read
+            self.stats.mark_stale()
+        updated.extend(stored)
+        if errors:
+            self._write_failed()
+        logger.info(f"Bulk updated {len(updated)} items")
+        return updated, errors
+
+    async def bulk_delete_action_items(
+        self,
+        ids: Optional[List[str]] = None,
+        filters: Optional[dict] = None,
+    ) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Delete many action items
+        
+        Args:
+            ids: Item ids - chunked by the backend's `max_ids_per_call`
+            filters: Alternatively, a status/priority/search filter
             
-            logger.info("✅ Database connection test successful")
+        Returns:
+            Tuple of (deleted ids, {id: error} for chunks that failed)
+        """
+        removed: List[dict] = []
+        errors: Dict[str, str] = {}
+        dropped: List[dict] = []
+        if self.outbox and ids is not None:
+            # Queued items are dropped from the outbox so a later flush cannot store them
+            dropped = await self.outbox.discard(ids)
+        elif ids is None and not await self._wait_stored():
+            logger.warning("Bulk delete started with action items still queued for storage")
+        for chunk_ids in self._bulk_chunks(ids, filters):
+            try:
+                removed.extend(await self.storage.delete_rows(ids=chunk_ids, filters=filters))
+            except Exception as e:
+                logger.error(f"❌ Error bulk deleting items: {e}")
+                if chunk_ids is None:
+                    raise
+                errors.update({item_id: str(e) for item_id in chunk_ids})
+
+        dropped_ids = {row["id"] for row in dropped}
+        removed = dropped + [row for row in removed if row["id"] not in dropped_ids]
+        deleted = [row["id"] for row in removed]
+        self._record_write(deleted=deleted, removed=removed)
+        if errors:
+            self._write_failed()
+        logger.info(f"Bulk deleted {len(deleted)} items")
+        return deleted, errors
+
+    def _bulk_chunks(self, ids: Optional[List[str]], filters: Optional[dict]):
+        """Ids for each storage call of a bulk operation (a single None in filter mode)"""
+        if ids is not None:
+            step = self.storage.max_ids_per_call
+            for start in range(0, len(ids), step):
+                yield ids[start:start + step]
+        else:
+            if not any((filters or {}).values()):
+                raise ValueError("A bulk operation needs ids or at least one filter")
+            yield None
+
+    async def test_connection(self) -> bool:
+        """Test the storage backend connection"""
+        try:
+            await self.storage.ping()
+
+            logger.debug("✅ Database connection test successful")
             return True
         except Exception as e:
             logger.error(f"❌ Database connection failed: {e}")
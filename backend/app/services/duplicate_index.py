@@ -0,0 +1,187 @@
+import os
+import random
+import asyncio
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from ..models import ActionItem
+from .search_index import STOPWORDS, stem, tokenize
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MERSENNE_PRIME = (1 << 61) - 1
+PRIORITY_RANK = {"low": 0, "medium": 1, "high": 2}
+DUPLICATE_MODES = ("off", "skip", "merge")
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    """
+    Stemmed content words of an item. Action items are a sentence long, so
+    single words work better than n-grams: "John will prepare the Q4 report"
+    and "John to prepare Q4 report" have identical sets.
+    """
+    tokens = [token for token, _, _ in tokenize(text)]
+    words = frozenset(stem(token) for token in tokens if token not in STOPWORDS)
+    return words or frozenset(tokens)
+
+
+@lru_cache(maxsize=None)
+def _permutations(num_perm: int) -> List[Tuple[int, int]]:
+    rng = random.Random(num_perm)
+    return [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(MERSENNE_PRIME)) for _ in range(num_perm)]
+
+
+@lru_cache(maxsize=65536)
+def _word_signature(word: str, num_perm: int) -> Tuple[int, ...]:
+    """The word's value under each MinHash permutation (vocabularies are small, so this is cached)"""
+    value = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "big")
+    return tuple((a * value + b) % MERSENNE_PRIME for a, b in _permutations(num_perm))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+def merge_fields(existing: ActionItem, item: ActionItem) -> dict:
+    """Fields of `existing` after folding `item` into it: the more detailed text and the higher priority win"""
+    return {
+        "text": item.text if len(item.text) > len(existing.text) else existing.text,
+        "priority": max(item.priority, existing.priority, key=PRIORITY_RANK.get),
+    }
+
+
+class DuplicateIndex:
+    """
+    MinHash / LSH index of action item text for near-duplicate lookups.
+
+    Each item gets a MinHash signature of its shingles; the signature is cut
+    into bands and every band hashes to a bucket. Items sharing a bucket are
+    candidates, and candidates are confirmed with exact Jaccard similarity,
+    so a lookup touches a handful of buckets no matter how many items exist.
+    """
+
+    def __init__(self, threshold: float = 0.8, mode: str = "skip", num_perm: int = 32, bands: int = 8):
+        if mode not in DUPLICATE_MODES:
+            raise ValueError(f"Unknown duplicate mode: {mode} (expected one of {', '.join(DUPLICATE_MODES)})")
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.mode = mode
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        self._items: Dict[str, Tuple[str, FrozenSet[str], Tuple[int, ...]]] = {}  # id -> (text, shingles, band keys)
+        self._buckets: List[Dict[int, Set[str]]] = [{} for _ in range(bands)]
+        self._pending_writes: Optional[list] = None
+        self.ready = False
+
+    @classmethod
+    def from_env(cls) -> Optional["DuplicateIndex"]:
+        mode = os.getenv("DUPLICATE_MODE", "off").lower()
+        if mode == "off":
+            return None
+        return cls(threshold=float(os.getenv("DUPLICATE_THRESHOLD", "0.8")), mode=mode)
+
+    def empty_copy(self) -> "DuplicateIndex":
+        """An empty index with the same settings (used for the items of one batch)"""
+        return DuplicateIndex(self.threshold, self.mode, self.num_perm, self.bands)
+
+    def _band_keys(self, words: FrozenSet[str]) -> Tuple[int, ...]:
+        signatures = [_word_signature(word, self.num_perm) for word in words] or [(0,) * self.num_perm]
+        signature = list(map(min, *signatures)) if len(signatures) > 1 else list(signatures[0])
+        return tuple(
+            hash(tuple(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        )
+
+    def fingerprint(self, text: str) -> Tuple[FrozenSet[str], Tuple[int, ...]]:
+        """Shingles and band keys of a text; pass to `find` / `add` to hash a text once for several lookups"""
+        words = shingles(text)
+        return words, self._band_keys(words)
+
+    def add(self, item_id: str, text: str, fingerprint: Optional[Tuple[FrozenSet[str], Tuple[int, ...]]] = None):
+        self.remove(item_id)
+        words, keys = fingerprint or self.fingerprint(text)
+        entry = (text, words, keys)
+        self._items[item_id] = entry
+        for band, key in enumerate(entry[2]):
+            self._buckets[band].setdefault(key, set()).add(item_id)
+
+    def remove(self, item_id: str):
+        entry = self._items.pop(item_id, None)
+        if entry is None:
+            return
+        for band, key in enumerate(entry[2]):
+            bucket = self._buckets[band][key]
+            bucket.discard(item_id)
+            if not bucket:
+                del self._buckets[band][key]
+
+    def find(
+        self, text: str, fingerprint: Optional[Tuple[FrozenSet[str], Tuple[int, ...]]] = None
+    ) -> Optional[Tuple[str, float]]:
+        """(id, similarity) of the most similar item at or above the threshold, or None"""
+        if not self._items:
+            return None
+        words, keys = fingerprint or self.fingerprint(text)
+        candidates: Set[str] = set()
+        for band, key in enumerate(keys):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best = None
+        for item_id in candidates:
+            similarity = jaccard(words, self._items[item_id][1])
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (item_id, similarity)
+        return best
+
+    def record_write(self, upserted: Iterable[ActionItem] = (), deleted: Iterable[str] = ()):
+        """Apply a successful write (called by DatabaseService)"""
+        upserted = [(item.id, item.text) for item in upserted]
+        deleted = list(deleted)
+        if self._pending_writes is not None:
+            self._pending_writes.append((upserted, deleted))
+        for item_id, text in upserted:
+            self.add(item_id, text)
+        for item_id in deleted:
+            self.remove(item_id)
+
+    def begin_rebuild(self):
+        """Start journaling writes made while the full scan is loading"""
+        self._pending_writes = []
+
+    def abort_rebuild(self):
+        self._pending_writes = None
+
+    async def finish_rebuild(self, items: List[ActionItem]):
+        """Bring the index in line with `items` (a full scan), then replay journaled writes"""
+        rows = {item.id: item.text for item in items}
+        if not self.ready:
+            # First build: hashing is CPU-bound, so build a fresh index off the event loop
+            fresh = self.empty_copy()
+            await asyncio.to_thread(lambda: [fresh.add(item_id, text) for item_id, text in rows.items()])
+            self._items, self._buckets = fresh._items, fresh._buckets
+        else:
+            # Later scans usually differ in a few items; only those are rehashed
+            for item_id, text in rows.items():
+                entry = self._items.get(item_id)
+                if entry is None or entry[0] != text:
+                    self.add(item_id, text)
+            for item_id in [item_id for item_id in self._items if item_id not in rows]:
+                self.remove(item_id)
+
+        pending, self._pending_writes = self._pending_writes or [], None
+        for upserted, deleted in pending:
+            for item_id, text in upserted:
+                self.add(item_id, text)
+            for item_id in deleted:
+                self.remove(item_id)
+
+        self.ready = True
+        logger.info(f"Reconciled duplicate index ({len(self._items)} items)")
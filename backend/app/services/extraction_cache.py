@@ -0,0 +1,178 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_transcript(transcript: str) -> str:
+    """Collapse whitespace so re-pasted or re-wrapped transcripts hash the same"""
+    return WHITESPACE_RE.sub(" ", transcript).strip()
+
+
+def make_cache_key(transcript: str, system_prompt: str, model: str, temperature: float) -> str:
+    """Content address of an extraction: everything that determines the model output"""
+    digest = hashlib.sha256()
+    for part in (normalize_transcript(transcript), system_prompt, model, repr(temperature)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Two-tier cache of extraction results.
+
+    Tier 1 is a bounded in-process LRU with TTL. Tier 2 is a SQLite file that
+    survives restarts and is shared by all workers on the same host. Values are
+    the extracted items as plain dicts ({"text", "priority"}).
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 7 * 24 * 3600, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+        # Stats
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if db_path:
+            self._open_db()
+
+    @classmethod
+    def from_env(cls) -> Optional["ExtractionCache"]:
+        if os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() != "true":
+            return None
+        return cls(
+            max_entries=int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "256")),
+            ttl_seconds=float(os.getenv("EXTRACTION_CACHE_TTL", str(7 * 24 * 3600))),
+            db_path=os.getenv("EXTRACTION_CACHE_PATH", "data/extraction_cache.db") or None,
+        )
+
+    def _open_db(self):
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            # WAL lets several worker processes read while one writes
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS extraction_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM extraction_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self._db.commit()
+            logger.info(f"Extraction cache disk tier opened at {self.db_path}")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to open extraction cache at {self.db_path}, using memory only: {e}")
+            self._db = None
+
+    def _memory_get(self, key: str) -> Optional[List[dict]]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        value, created_at = entry
+        if time.time() - created_at > self.ttl_seconds:
+            del self._memory[key]
+            self.expirations += 1
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_set(self, key: str, value: List[dict], created_at: float):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_get(self, key: str) -> Optional[tuple]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT value, created_at FROM extraction_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        if time.time() - row[1] > self.ttl_seconds:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def _disk_set(self, key: str, value: List[dict], created_at: float):
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO extraction_cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), created_at),
+            )
+            self._db.commit()
+
+    async def get(self, key: str) -> Optional[List[dict]]:
+        value = self._memory_get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+
+        if self._db is not None:
+            try:
+                entry = await asyncio.to_thread(self._disk_get, key)
+            except sqlite3.Error as e:
+                logger.error(f"Extraction cache read failed: {e}")
+                entry = None
+            if entry is not None:
+                self.disk_hits += 1
+                # Promote to the memory tier
+                self._memory_set(key, entry[0], entry[1])
+                return entry[0]
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: List[dict]):
+        created_at = time.time()
+        self._memory_set(key, value, created_at)
+        if self._db is not None:
+            try:
+                await asyncio.to_thread(self._disk_set, key, value, created_at)
+            except sqlite3.Error as e:
+                logger.error(f"Extraction cache write failed: {e}")
+
+    def close(self):
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "disk_enabled": self._db is not None,
+        }
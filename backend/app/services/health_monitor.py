@@ -0,0 +1,119 @@
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class DependencyCheck:
+    """A dependency probe and the cached result of its last run"""
+
+    def __init__(self, name: str, probe: Callable[[], Awaitable[bool]], interval: float, critical: bool = True):
+        self.name = name
+        self.probe = probe
+        self.interval = interval
+        self.critical = critical  # Only critical dependencies decide readiness
+        self.healthy: Optional[bool] = None  # None until the first probe completes
+        self.last_checked: Optional[datetime] = None
+        self.latency_ms: Optional[float] = None
+        self.error: Optional[str] = None
+        self.consecutive_failures = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "status": "unknown" if self.healthy is None else ("connected" if self.healthy else "disconnected"),
+            "last_checked": self.last_checked.isoformat() + "Z" if self.last_checked else None,
+            "latency_ms": self.latency_ms,
+            "critical": self.critical,
+            "interval_seconds": self.interval,
+            "consecutive_failures": self.consecutive_failures,
+            "error": self.error,
+        }
+
+
+class HealthMonitor:
+    """
+    Probes each dependency in the background on its own interval and caches
+    the result, so health endpoints answer instantly and never hit a
+    dependency themselves. A failing critical dependency makes the service
+    unhealthy; a failing non-critical one only degrades it.
+    """
+
+    def __init__(self, probe_timeout: float = 5.0):
+        self.probe_timeout = probe_timeout
+        self.checks: Dict[str, DependencyCheck] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+
+    @classmethod
+    def from_env(cls) -> "HealthMonitor":
+        return cls(probe_timeout=float(os.getenv("HEALTH_PROBE_TIMEOUT", "5")))
+
+    def register(self, name: str, probe: Callable[[], Awaitable[bool]], interval: float, critical: bool = True):
+        """Add a probe; registered after `start` (a service built later), it starts probing at once"""
+        check = DependencyCheck(name, probe, interval, critical)
+        self.checks[name] = check
+        if self._running:
+            self._tasks.append(asyncio.create_task(self._loop(check), name=f"health-{name}"))
+
+    async def run_check(self, check: DependencyCheck):
+        started = time.perf_counter()
+        try:
+            healthy = await asyncio.wait_for(check.probe(), timeout=self.probe_timeout)
+            check.error = None if healthy else "probe reported failure"
+        except asyncio.TimeoutError:
+            healthy = False
+            check.error = f"probe timed out after {self.probe_timeout}s"
+        except Exception as e:
+            healthy = False
+            check.error = str(e)
+        check.latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        check.last_checked = datetime.utcnow()
+        check.consecutive_failures = 0 if healthy else check.consecutive_failures + 1
+        if check.healthy is not False and not healthy:
+            logger.warning(f"Dependency '{check.name}' is unhealthy: {check.error}")
+        elif check.healthy is False and healthy:
+            logger.info(f"Dependency '{check.name}' recovered")
+        check.healthy = healthy
+
+    async def _loop(self, check: DependencyCheck):
+        while True:
+            await self.run_check(check)
+            await asyncio.sleep(check.interval)
+
+    def start(self):
+        self._running = True
+        for check in self.checks.values():
+            self._tasks.append(asyncio.create_task(self._loop(check), name=f"health-{check.name}"))
+        logger.info(f"Health monitor started for: {', '.join(self.checks) or 'no dependencies'}")
+
+    async def stop(self):
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def status_of(self, name: str) -> str:
+        check = self.checks.get(name)
+        return check.to_dict()["status"] if check else "disconnected"
+
+    def is_ready(self) -> bool:
+        return all(check.healthy for check in self.checks.values() if check.critical)
+
+    def degraded(self) -> List[str]:
+        """Non-critical dependencies that failed or have not been probed yet"""
+        return [name for name, check in self.checks.items() if not check.critical and not check.healthy]
+
+    def overall_status(self) -> str:
+        if not self.is_ready():
+            return "unhealthy"
+        return "degraded" if self.degraded() else "healthy"
+
+    def snapshot(self) -> dict:
+        return {name: check.to_dict() for name, check in self.checks.items()}
@@ -0,0 +1,255 @@
+import os
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+import openai
+
+from .metrics import LLM_QUEUE_WAIT_SECONDS, LLM_REQUEST_SECONDS, LLM_RETRIES
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SchedulerTimeoutError(Exception):
+    """Raised when a request waits in the queue longer than its deadline"""
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        """Give back (or, if negative, charge) tokens after the real cost is known"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+def is_retryable(error: Exception) -> bool:
+    """429s (except exhausted quota), 5xx and connection errors are worth retrying"""
+    if isinstance(error, openai.APIStatusError):
+        if error.status_code == 429:
+            return getattr(error, "code", None) != "insufficient_quota"
+        return error.status_code >= 500
+    return isinstance(error, openai.APIConnectionError)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMScheduler:
+    """
+    Admission control for OpenAI calls.
+
+    Enforces the model's requests-per-minute and tokens-per-minute limits with
+    token buckets, caps the number of in-flight calls, queues excess requests
+    until a deadline and retries 429/5xx errors with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 200000,
+        max_concurrency: int = 8,
+        queue_timeout: float = 30.0,
+        max_retries: int = 3,
+        base_backoff: float = 0.5,
+        max_backoff: float = 20.0,
+    ):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bucket_lock = asyncio.Lock()
+
+        # Stats
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.total_requests = 0
+        self.total_retries = 0
+        self.total_timeouts = 0
+        self.total_failures = 0
+        self._wait_times = deque(maxlen=1000)
+
+    @classmethod
+    def from_env(cls) -> "LLMScheduler":
+        return cls(
+            requests_per_minute=int(os.getenv("LLM_RPM_LIMIT", "500")),
+            tokens_per_minute=int(os.getenv("LLM_TPM_LIMIT", "200000")),
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+            queue_timeout=float(os.getenv("LLM_QUEUE_TIMEOUT", "30")),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+        )
+
+    async def _acquire(self, estimated_tokens: int):
+        """Wait for a concurrency slot and for both rate-limit buckets"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.queue_timeout
+        self.queue_depth += 1
+        try:
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.total_timeouts += 1
+                raise SchedulerTimeoutError(f"LLM request queued longer than {self.queue_timeout}s")
+
+            try:
+                async with self._bucket_lock:
+                    while True:
+                        wait = max(
+                            self.request_bucket.time_until(1),
+                            self.token_bucket.time_until(estimated_tokens),
+                        )
+                        if wait == 0:
+                            self.request_bucket.consume(1)
+                            self.token_bucket.consume(estimated_tokens)
+                            break
+                        if loop.time() + wait > deadline:
+                            self.total_timeouts += 1
+                            raise SchedulerTimeoutError("LLM rate limit budget exhausted before the queue deadline")
+                        await asyncio.sleep(wait)
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.queue_depth -= 1
+            waited = loop.time() - started
+            self._wait_times.append(waited)
+            LLM_QUEUE_WAIT_SECONDS.observe(waited)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        delay = random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def run(self, call: Callable[[], Awaitable[T]], estimated_tokens: int) -> T:
+        """Run `call` once admitted, retrying transient OpenAI errors"""
+        self.total_requests += 1
+        attempt = 0
+        while True:
+            await self._acquire(estimated_tokens)
+            self.in_flight += 1
+            started = time.perf_counter()
+            try:
+                result = await call()
+                LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, "complete", "ok")
+                return result
+            except Exception as e:
+                LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, "complete", "error")
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    self.total_failures += 1
+                    raise
+                delay = self._backoff(attempt, _retry_after(e))
+                logger.warning(f"LLM call failed ({e.__class__.__name__}), retrying in {delay:.2f}s (attempt {attempt + 1}/{self.max_retries})")
+            finally:
+                self.in_flight -= 1
+                self._semaphore.release()
+            self.total_retries += 1
+            LLM_RETRIES.inc("complete")
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def stream(self, call: Callable[[], Awaitable[T]], estimated_tokens: int) -> AsyncIterator[T]:
+        """
+        Like `run`, but for streamed responses: the concurrency slot is held
+        until the caller leaves the block, not just until `call` returns.
+        Only opening the stream is retried.
+        """
+        self.total_requests += 1
+        attempt = 0
+        while True:
+            await self._acquire(estimated_tokens)
+            self.in_flight += 1
+            started = time.perf_counter()
+            try:
+                result = await call()
+                break
+            except BaseException as e:
+                LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, "stream", "error")
+                self.in_flight -= 1
+                self._semaphore.release()
+                if not isinstance(e, Exception):
+                    raise
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    self.total_failures += 1
+                    raise
+                delay = self._backoff(attempt, _retry_after(e))
+                logger.warning(f"LLM stream failed to open ({e.__class__.__name__}), retrying in {delay:.2f}s (attempt {attempt + 1}/{self.max_retries})")
+            self.total_retries += 1
+            LLM_RETRIES.inc("stream")
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        outcome = "error"
+        try:
+            yield result
+            outcome = "ok"
+        finally:
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, "stream", outcome)
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """Correct the token bucket once the real usage of a call is known"""
+        self.token_bucket.refund(estimated_tokens - actual_tokens)
+
+    def stats(self) -> dict:
+        waits = sorted(self._wait_times)
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "total_requests": self.total_requests,
+            "total_retries": self.total_retries,
+            "total_timeouts": self.total_timeouts,
+            "total_failures": self.total_failures,
+            "wait_time_avg_ms": round(sum(waits) / len(waits) * 1000, 2) if waits else 0.0,
+            "wait_time_p95_ms": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 2) if waits else 0.0,
+            "wait_time_max_ms": round(waits[-1] * 1000, 2) if waits else 0.0,
+            "request_tokens_available": round(self.request_bucket.tokens, 2),
+            "llm_tokens_available": round(self.token_bucket.tokens, 2),
+        }
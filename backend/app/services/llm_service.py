@@ -1,37 +1,27 @@
 import os
-from openai import OpenAI
-from typing import List
+from openai import AsyncOpenAI
+from typing import AsyncIterator, List, Optional
 from ..models import ActionItem
+from .llm_scheduler import LLMScheduler, SchedulerTimeoutError
+from .model_router import ModelRouter
+from .transcript_chunker import split_transcript
+from .transcript_filter import TranscriptFilter
+from .single_flight import SingleFlight
+from .extraction_cache import ExtractionCache, make_cache_key
+from .stream_parser import JSONArrayStreamParser
+from .metrics import LLM_COMPLETION_TOKENS, LLM_PARSE_SECONDS, LLM_PROMPT_TOKENS
+import asyncio
 import json
 import logging
+import re
+import time
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class LLMService:
-    """Service for interacting with OpenAI API to generate action items"""
-    
-    def __init__(self):
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        if not openai_api_key:
-            raise ValueError("OPENAI_API_KEY environment variable is not set")
-        self.client = OpenAI(api_key=openai_api_key)
-        self.model = "gpt-4o-mini"
-    
-    def extract_action_items(self, transcript: str) -> List[ActionItem]:
-        """
-        Extract action items from a meeting transcript using OpenAI     
-        
-        Args:
-            transcript: The meeting transcript text
-            
-        Returns:
-            List of ActionItem objects
-        """
-        try:
-            # Craft a detailed prompt for extracting action items with priority
-            system_prompt = """You are an AI assistant that extracts actionable tasks from meeting transcripts.
+# Craft a detailed prompt for extracting action items with priority
+SYSTEM_PROMPT = """You are an AI assistant that extracts actionable tasks from meeting transcripts.
 Your job is to identify clear, specific action items that need to be completed and assign priority levels.
 
 Rules:
@@ -55,68 +45,436 @@ Example output format:
   {"text": "Schedule follow-up meeting with client next week", "priority": "low"}
 ]"""
 
-            user_prompt = f"Extract action items from this meeting transcript:\n\n{transcript}"
+PRIORITY_RANK = {"low": 0, "medium": 1, "high": 2}
+
+
+def parse_action_items(content: str) -> List[ActionItem]:
+    """Parse the model's JSON array (optionally wrapped in a markdown fence) into ActionItems"""
+    started = time.perf_counter()
+    path = "json"
+    try:
+        try:
+            action_items_data = json.loads(content)
+            if not isinstance(action_items_data, list):
+                raise ValueError("Response is not a list")
+        except json.JSONDecodeError:
+            logger.warning("Failed to parse JSON, attempting to extract from markdown")
+            path = "markdown"
+            # Sometimes the API returns markdown code blocks, handle that
+            if "```json" in content:
+                content = content.split("```json")[1].split("```")[0].strip()
+            elif "```" in content:
+                content = content.split("```")[1].split("```")[0].strip()
+            action_items_data = json.loads(content)
+
+        # Convert to ActionItem objects
+        action_items = []
+        for item_data in action_items_data:
+            action_item = to_action_item(item_data)
+            if action_item:
+                action_items.append(action_item)
+        return action_items
+    except Exception:
+        path = "failed"
+        raise
+    finally:
+        LLM_PARSE_SECONDS.observe(time.perf_counter() - started, path)
+
+
+def record_token_usage(mode: str, usage):
+    """Record the prompt/completion token counts OpenAI reported for one call"""
+    LLM_PROMPT_TOKENS.observe(usage.prompt_tokens, mode)
+    LLM_COMPLETION_TOKENS.observe(usage.completion_tokens, mode)
+
+
+def to_action_item(item_data) -> Optional[ActionItem]:
+    """Convert one element of the model's JSON array to an ActionItem (None if unusable)"""
+    if isinstance(item_data, dict) and isinstance(item_data.get("text"), str) and item_data["text"].strip():
+        # New format with priority
+        priority = item_data.get("priority", "medium")
+        if priority not in ["high", "medium", "low"]:
+            priority = "medium"  # Default fallback
+        return ActionItem(text=item_data["text"].strip(), priority=priority)
+    elif isinstance(item_data, str) and item_data.strip():
+        # Fallback for old format (string only)
+        return ActionItem(text=item_data.strip(), priority="medium")
+    return None
+
+
+def _item_tokens(text: str) -> frozenset:
+    return frozenset(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def merge_action_items(groups: List[List[ActionItem]], similarity: float = 0.8) -> List[ActionItem]:
+    """
+    Merge per-chunk extractions into one list.
+
+    Items whose word sets overlap by at least `similarity` (Jaccard) are
+    treated as the same task, e.g. the same sentence seen in two overlapping
+    chunks. The more detailed wording and the highest priority win.
+    """
+    merged: List[ActionItem] = []
+    merged_tokens: List[frozenset] = []
+    for items in groups:
+        for item in items:
+            tokens = _item_tokens(item.text)
+            for index, existing_tokens in enumerate(merged_tokens):
+                union = tokens | existing_tokens
+                if union and len(tokens & existing_tokens) / len(union) >= similarity:
+                    existing = merged[index]
+                    text = item.text if len(item.text) > len(existing.text) else existing.text
+                    priority = max(item.priority, existing.priority, key=PRIORITY_RANK.get)
+                    merged[index] = existing.model_copy(update={"text": text, "priority": priority})
+                    merged_tokens[index] = existing_tokens | tokens
+                    break
+            else:
+                merged.append(item)
+                merged_tokens.append(tokens)
+    return merged
+
+
+class LLMService:
+    """Service for interacting with OpenAI API to generate action items"""
+    
+    def __init__(self):
+        openai_api_key = os.getenv("OPENAI_API_KEY")
+        if not openai_api_key:
+            raise ValueError("OPENAI_API_KEY environment variable is not set")
+        # Retries are owned by the scheduler so that they respect the rate limits
+        self.client = AsyncOpenAI(api_key=openai_api_key, max_retries=0)
+        # Cheapest model first, escalating to stronger ones on truncated or unparseable output
+        self.router = ModelRouter.from_env()
+        self.temperature = 0.3  # Lower temperature for more consistent outputs
+        self.scheduler = LLMScheduler.from_env()
+        self.cache = ExtractionCache.from_env()
+
+        # Long transcripts are split into chunks that are extracted in parallel
+        self.chunk_threshold_chars = int(os.getenv("LLM_CHUNK_THRESHOLD_CHARS", "12000"))
+        self.chunk_size_chars = int(os.getenv("LLM_CHUNK_SIZE_CHARS", "8000"))
+        self.chunk_overlap_chars = int(os.getenv("LLM_CHUNK_OVERLAP_CHARS", "600"))
+        self.min_output_tokens = 500
+        self.max_output_tokens = int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "2000"))
+
+        # Only the sentences likely to hold action items are sent, within a token budget
+        self.prefilter = TranscriptFilter.from_env()
+        # Concurrent extractions of the same transcript share one upstream call
+        self.in_flight = SingleFlight("extract_action_items")
+
+    def cache_key(self, transcript: str) -> str:
+        """Extraction cache key; pre-filter settings are part of it since they change the prompt"""
+        prompt = SYSTEM_PROMPT + (self.prefilter.signature() if self.prefilter else "")
+        return make_cache_key(transcript, prompt, self.router.signature(), self.temperature)
+
+    def prepare_transcript(self, transcript: str) -> str:
+        """
+        The text actually sent for one completion (pre-filtered when enabled).
+        Long transcripts are chunked first and each chunk goes through here, so
+        the token budget applies per completion and never cuts a transcript
+        down before the chunker sees it.
+        """
+        if not self.prefilter:
+            return transcript
+        filtered = self.prefilter.filter(transcript)
+        logger.info(
+            f"Pre-filter kept {filtered.kept_sentences}/{filtered.total_sentences} sentences "
+            f"({filtered.dropped_sentences} dropped), "
+            f"~{filtered.sent_tokens}/{filtered.original_tokens} tokens ({filtered.saved_tokens} saved)"
+        )
+        if filtered.dropped_relevant:
+            logger.warning(f"Pre-filter token budget dropped {filtered.dropped_relevant} relevant sentences")
+        return filtered.text
+
+    def output_token_budget(self, text: str) -> int:
+        """
+        Output budget that grows with the input (~1 token per 10 chars of
+        transcript), raised to what recent completions of similar size needed
+        """
+        budget = max(self.min_output_tokens, min(self.max_output_tokens, 300 + len(text) // 10))
+        return self.router.output_budget(len(text), budget, self.max_output_tokens)
+    
+    async def extract_action_items(self, transcript: str, use_cache: bool = True) -> List[ActionItem]:
+        """
+        Extract action items from a meeting transcript using OpenAI     
+        
+        Args:
+            transcript: The meeting transcript text
+            use_cache: Set to False to skip the extraction cache for this call
             
-            # Call OpenAI API
-            logger.info(f"Sending request to OpenAI API with model: {self.model}")
-            response = self.client.chat.completions.create(
-                model=self.model,
+        Returns:
+            List of ActionItem objects
+        """
+        try:
+            cache_key = self.cache_key(transcript)
+            if self.cache and use_cache:
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Extraction cache hit ({len(cached)} action items)")
+                    # Fresh ids: every analysis creates new rows
+                    return [ActionItem(text=item["text"], priority=item["priority"]) for item in cached]
+
+            extracted = await self.in_flight.do(cache_key, lambda: self._extract_and_cache(transcript, cache_key))
+            # Fresh ids here too: callers that shared the call still create their own rows
+            return [ActionItem(text=item["text"], priority=item["priority"]) for item in extracted]
+            
+        except SchedulerTimeoutError:
+            raise
+        except Exception as e:
+            logger.error(f"Error extracting action items: {str(e)}")
+            raise Exception(f"Failed to generate action items: {str(e)}")
+
+    async def _extract_and_cache(self, transcript: str, cache_key: str) -> List[dict]:
+        """One upstream extraction (chunked when long); returns the cached form {"text", "priority"}"""
+        if len(transcript) > self.chunk_threshold_chars:
+            action_items = await self.extract_action_items_chunked(transcript)
+        else:
+            action_items = await self._extract_from_text(self.prepare_transcript(transcript))
+        logger.info(f"Successfully extracted {len(action_items)} action items")
+
+        extracted = [{"text": item.text, "priority": item.priority} for item in action_items]
+        if self.cache:
+            await self.cache.set(cache_key, extracted)
+        return extracted
+
+    async def extract_action_items_chunked(self, transcript: str) -> List[ActionItem]:
+        """
+        Map-reduce extraction for long transcripts: split at speaker/paragraph
+        boundaries, extract every chunk concurrently and merge the results.
+        
+        Args:
+            transcript: The meeting transcript text
+            
+        Returns:
+            Deduplicated list of ActionItem objects
+        """
+        chunks = split_transcript(transcript, self.chunk_size_chars, self.chunk_overlap_chars)
+        logger.info(f"Extracting action items from {len(chunks)} chunks in parallel")
+        if self.prefilter:
+            # ~1 ms of regex work per 2k chars; keep long transcripts off the event loop
+            chunks = await asyncio.to_thread(lambda: [self.prepare_transcript(chunk) for chunk in chunks])
+
+        # Chunks run concurrently; the scheduler bounds how many are in flight
+        results = await asyncio.gather(*(self._extract_from_text(chunk) for chunk in chunks))
+        action_items = merge_action_items(results)
+
+        logger.info(f"Merged {sum(len(r) for r in results)} chunk items into {len(action_items)} action items")
+        return action_items
+
+    async def stream_action_items(self, transcript: str, use_cache: bool = True) -> AsyncIterator[ActionItem]:
+        """
+        Yield action items as the model generates them
+        
+        The completion is streamed and its JSON array parsed incrementally, so
+        each item is yielded as soon as its object closes. Cache hits and long
+        transcripts (which need chunking and a merge) yield the full result at once.
+        
+        Args:
+            transcript: The meeting transcript text
+            use_cache: Set to False to skip the extraction cache for this call
+        """
+        cache_key = self.cache_key(transcript)
+        if self.cache and use_cache:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Extraction cache hit ({len(cached)} action items)")
+                for item in cached:
+                    yield ActionItem(text=item["text"], priority=item["priority"])
+                return
+
+        if len(transcript) > self.chunk_threshold_chars:
+            # Nothing to stream from a map-reduce; shares the call with identical requests
+            extracted = await self.in_flight.do(cache_key, lambda: self._extract_and_cache(transcript, cache_key))
+            for item in extracted:
+                yield ActionItem(text=item["text"], priority=item["priority"])
+            return
+
+        text = self.prepare_transcript(transcript)
+        user_prompt = f"Extract action items from this meeting transcript:\n\n{text}"
+        max_tokens = self.output_token_budget(text)
+        estimated_tokens = (len(SYSTEM_PROMPT) + len(user_prompt)) // 4 + max_tokens
+        index = self.router.first_tier(len(text))
+        model = self.router.tiers[index].model
+
+        logger.info(f"Streaming request to OpenAI API with model: {model}")
+        parser = JSONArrayStreamParser()
+        parse_seconds = 0.0
+        content_parts = []
+        action_items = []
+        finish_reason = None
+        usage = None
+        opened_at = None
+
+        async def create():
+            nonlocal opened_at
+            opened_at = time.perf_counter()
+            return await self.client.chat.completions.create(
+                model=model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
-                temperature=0.3,  # Lower temperature for more consistent outputs
-                max_tokens=500
+                temperature=self.temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                # Usage arrives in a final chunk with no choices
+                stream_options={"include_usage": True}
             )
-            
+
+        try:
+            async with self.scheduler.stream(create, estimated_tokens=estimated_tokens) as stream:
+                async for chunk in stream:
+                    if chunk.usage:
+                        usage = chunk.usage
+                        self.scheduler.record_usage(estimated_tokens, chunk.usage.total_tokens)
+                        record_token_usage("stream", chunk.usage)
+                    if not chunk.choices:
+                        continue
+                    finish_reason = chunk.choices[0].finish_reason or finish_reason
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    content_parts.append(delta)
+                    started = time.perf_counter()
+                    elements = parser.feed(delta)
+                    parse_seconds += time.perf_counter() - started
+                    for element in elements:
+                        action_item = to_action_item(element)
+                        if action_item:
+                            action_items.append(action_item)
+                            yield action_item
+        except Exception:
+            if opened_at is not None:
+                self.router.record(index, len(text), "error", time.perf_counter() - opened_at)
+            raise
+        seconds = time.perf_counter() - opened_at
+
+        if parser.started:
+            LLM_PARSE_SECONDS.observe(parse_seconds, "stream")
+
+        outcome = "ok"
+        parse_error = None
+        if not parser.started:
+            # The model did not return an array at all; fall back to the regular parser
+            content = "".join(content_parts).strip()
+            logger.warning("Streamed response contained no JSON array, using fallback parse")
+            try:
+                parsed = parse_action_items(content)
+            except (ValueError, TypeError) as e:
+                parse_error = e
+                outcome = "truncated" if finish_reason == "length" else "invalid"
+            else:
+                for action_item in parsed:
+                    action_items.append(action_item)
+                    yield action_item
+        elif not parser.finished:
+            outcome = "truncated" if finish_reason == "length" else "invalid"
+        self.router.record(index, len(text), outcome, seconds, usage, max_tokens)
+
+        complete = outcome == "ok"
+        if not complete:
+            next_index = self.router.escalate(index, outcome)
+            if next_index is not None:
+                # Items already sent stay; the stronger model's extra ones follow
+                escalated = await self._extract_with_cascade(
+                    text, next_index, self.escalated_budget(max_tokens, outcome)
+                )
+                merged = merge_action_items([action_items, escalated])
+                for action_item in merged[len(action_items):]:
+                    yield action_item
+                action_items = merged
+                complete = True
+            elif parse_error is not None:
+                raise parse_error
+
+        logger.info(f"Successfully streamed {len(action_items)} action items")
+        # A truncated array (output budget exhausted) is not worth caching
+        if self.cache and complete:
+            await self.cache.set(cache_key, [{"text": item.text, "priority": item.priority} for item in action_items])
+
+    async def _extract_from_text(self, transcript: str) -> List[ActionItem]:
+        """Single extraction over a transcript (or one chunk of it), starting on the routed model tier"""
+        return await self._extract_with_cascade(
+            transcript, self.router.first_tier(len(transcript)), self.output_token_budget(transcript)
+        )
+
+    def escalated_budget(self, max_tokens: int, reason: str) -> int:
+        """Output budget for the next tier: doubled after a truncation, up to the cap"""
+        if reason == "truncated":
+            return max(max_tokens, min(self.max_output_tokens, max_tokens * 2))
+        return max_tokens
+
+    async def _extract_with_cascade(self, transcript: str, index: int, max_tokens: int) -> List[ActionItem]:
+        """
+        Completion on tier `index`, moving up a tier while the output is
+        truncated or cannot be parsed. If the strongest model's output is
+        truncated too, the items it completed are kept.
+        """
+        user_prompt = f"Extract action items from this meeting transcript:\n\n{transcript}"
+        while True:
+            model = self.router.tiers[index].model
+            # Rough prompt size estimate (~4 chars per token) plus the output budget
+            estimated_tokens = (len(SYSTEM_PROMPT) + len(user_prompt)) // 4 + max_tokens
+            seconds = 0.0
+
+            async def create():
+                # Timed per attempt, so queueing and retry backoff are not counted against the model
+                nonlocal seconds
+                started = time.perf_counter()
+                try:
+                    return await self.client.chat.completions.create(
+                        model=model,
+                        messages=[
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {"role": "user", "content": user_prompt}
+                        ],
+                        temperature=self.temperature,
+                        max_tokens=max_tokens
+                    )
+                finally:
+                    seconds = time.perf_counter() - started
+
+            # Call OpenAI API
+            logger.info(f"Sending request to OpenAI API with model: {model}")
+            try:
+                response = await self.scheduler.run(create, estimated_tokens=estimated_tokens)
+            except SchedulerTimeoutError:
+                raise
+            except Exception:
+                self.router.record(index, len(transcript), "error", seconds)
+                raise
+            if response.usage:
+                self.scheduler.record_usage(estimated_tokens, response.usage.total_tokens)
+                record_token_usage("complete", response.usage)
+
             # Extract the response content
-            content = response.choices[0].message.content.strip()
+            choice = response.choices[0]
+            content = (choice.message.content or "").strip()
             logger.info(f"Received response from OpenAI: {content}")
-            
-            # Parse the JSON response
+
             try:
-                action_items_data = json.loads(content)
-                if not isinstance(action_items_data, list):
-                    raise ValueError("Response is not a list")
-            except json.JSONDecodeError:
-                logger.warning("Failed to parse JSON, attempting to extract from markdown")
-                # Sometimes the API returns markdown code blocks, handle that
-                if "```json" in content:
-                    content = content.split("```json")[1].split("```")[0].strip()
-                elif "```" in content:
-                    content = content.split("```")[1].split("```")[0].strip()
-                action_items_data = json.loads(content)
-            
-            # Convert to ActionItem objects
-            action_items = []
-            for item_data in action_items_data:
-                if isinstance(item_data, dict) and "text" in item_data:
-                    # New format with priority
-                    priority = item_data.get("priority", "medium")
-                    if priority not in ["high", "medium", "low"]:
-                        priority = "medium"  # Default fallback
-                    action_item = ActionItem(text=item_data["text"].strip(), priority=priority)
-                    action_items.append(action_item)
-                elif isinstance(item_data, str) and item_data.strip():
-                    # Fallback for old format (string only)
-                    action_item = ActionItem(text=item_data.strip(), priority="medium")
-                    action_items.append(action_item)
-            
-            logger.info(f"Successfully extracted {len(action_items)} action items")
-            return action_items
-            
-        except Exception as e:
-            logger.error(f"Error extracting action items: {str(e)}")
-            raise Exception(f"Failed to generate action items: {str(e)}")
+                action_items = parse_action_items(content)
+                outcome = "ok"
+            except (ValueError, TypeError) as e:
+                parse_error = e
+                outcome = "truncated" if choice.finish_reason == "length" else "invalid"
+            self.router.record(index, len(transcript), outcome, seconds, response.usage, max_tokens)
+            if outcome == "ok":
+                return action_items
+
+            next_index = self.router.escalate(index, outcome)
+            if next_index is None:
+                if outcome == "truncated":
+                    # Out of stronger models: keep the complete elements of the truncated array
+                    action_items = [item for item in map(to_action_item, JSONArrayStreamParser().feed(content)) if item]
+                    logger.warning(f"{model} output was truncated at {max_tokens} tokens, kept {len(action_items)} complete action items")
+                    return action_items
+                raise parse_error
+            max_tokens = self.escalated_budget(max_tokens, outcome)
+            index = next_index
     
-    def test_connection(self) -> bool:
-        """Test if OpenAI API connection is working"""
+    async def test_connection(self) -> bool:
+        """Test if OpenAI API connection is working (model lookup - not billed)"""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": "Say 'API working'"}],
-                max_tokens=10
-            )
+            await self.client.models.retrieve(self.router.tiers[0].model)
             return True
         except Exception as e:
             error_msg = str(e)
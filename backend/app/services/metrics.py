@@ -0,0 +1,221 @@
+"""
+In-process metrics exposed at /metrics in the Prometheus text format.
+
+Counters and histograms are plain dicts keyed by label values, updated from
+the event loop without locks: recording is a dict lookup, a bisect and a few
+additions. Every metric lives in this module so the full catalogue is in one
+place. Values are per process; with several workers each one is scraped
+separately.
+"""
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Seconds; LATENCY_BUCKETS suit network calls, FAST_BUCKETS in-process work
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+FAST_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+ROW_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_registry: List["Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Metric(ABC):
+    """Base of the metric types; subclasses render their current values in `samples`"""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        _registry.append(self)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Sample lines in the text exposition format"""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonic count per label combination"""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1):
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class _Timer:
+    __slots__ = ("histogram", "label_values", "started")
+
+    def __init__(self, histogram: "Histogram", label_values: Tuple[str, ...]):
+        self.histogram = histogram
+        self.label_values = label_values
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, *self.label_values)
+
+
+class Histogram(Metric):
+    """Bucketed distribution (cumulative `le` buckets, sum and count) per label combination"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last slot is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def time(self, *label_values: str) -> _Timer:
+        """Context manager observing the elapsed seconds of its block"""
+        return _Timer(self, label_values)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric(Metric):
+    """
+    A gauge or counter read from existing state at scrape time, e.g. the LLM
+    scheduler's queue depth. `read` returns a number, or a dict mapping label
+    value tuples to numbers.
+    """
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], object], labels: Sequence[str] = (), type: str = "gauge"):
+        super().__init__(name, documentation, labels)
+        self.read = read
+        self.type = type
+
+    def samples(self) -> List[str]:
+        value = self.read()
+        if value is None:
+            return []
+        if not isinstance(value, dict):
+            value = {(): value}
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(number)}"
+            for key, number in sorted(value.items())
+        ]
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text exposition format"""
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+# HTTP
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests by route template and status code", ["method", "route", "status"])
+HTTP_REQUEST_SECONDS = Histogram("http_request_duration_seconds", "Time to produce the full HTTP response", ["method", "route"])
+RESPONSE_RENDER_SECONDS = Histogram(
+    "http_response_render_seconds", "Time to serialize JSON response bodies to bytes", buckets=FAST_BUCKETS
+)
+
+# LLM
+LLM_QUEUE_WAIT_SECONDS = Histogram("llm_queue_wait_seconds", "Time an LLM call waited for a concurrency slot and rate-limit budget")
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds", "OpenAI call latency (streams: until the stream is closed)", ["mode", "outcome"]
+)
+LLM_RETRIES = Counter("llm_retries_total", "OpenAI calls retried after a transient error", ["mode"])
+LLM_PROMPT_TOKENS = Histogram("llm_prompt_tokens", "Prompt tokens per OpenAI call", ["mode"], buckets=TOKEN_BUCKETS)
+LLM_COMPLETION_TOKENS = Histogram("llm_completion_tokens", "Completion tokens per OpenAI call", ["mode"], buckets=TOKEN_BUCKETS)
+LLM_PARSE_SECONDS = Histogram(
+    "llm_parse_duration_seconds", "Time to parse model output into action items, by parse path", ["path"], buckets=FAST_BUCKETS
+)
+LLM_PREFILTER_TOKENS = Counter(
+    "llm_prefilter_tokens_total", "Estimated transcript tokens before (original) and after (sent) pre-filtering", ["stage"]
+)
+LLM_MODEL_CALLS = Counter(
+    "llm_model_calls_total", "Extraction calls per model and outcome (ok, truncated, invalid, error)", ["model", "outcome"]
+)
+LLM_MODEL_SECONDS = Histogram("llm_model_duration_seconds", "Extraction call latency per model, excluding queueing", ["model"])
+LLM_MODEL_TOKENS = Counter("llm_model_tokens_total", "Tokens used per model, by kind (prompt or completion)", ["model", "kind"])
+LLM_ESCALATIONS = Counter(
+    "llm_escalations_total", "Extractions retried on the next model tier, by reason", ["from_model", "to_model", "reason"]
+)
+LLM_ROUTE_SKIPS = Counter(
+    "llm_route_skips_total", "Extractions routed past a model tier, by reason (length or escalation_rate)", ["model", "reason"]
+)
+
+# Transcript uploads
+TRANSCRIPT_UPLOAD_BYTES = Counter(
+    "transcript_upload_bytes_total", "Transcript upload bytes received and transcript text kept after caption stripping", ["stage"]
+)
+TRANSCRIPT_UPLOAD_SECONDS = Histogram("transcript_upload_duration_seconds", "Time to receive and strip one transcript upload")
+
+# Database
+DB_OPERATION_SECONDS = Histogram(
+    "db_operation_duration_seconds", "Storage backend round-trip time by operation", ["backend", "operation", "outcome"]
+)
+OUTBOX_FLUSH_SECONDS = Histogram("write_outbox_flush_duration_seconds", "Time to upsert one write outbox batch", ["outcome"])
+OUTBOX_BATCH_ROWS = Histogram("write_outbox_batch_rows", "Rows per successful write outbox flush", buckets=ROW_BUCKETS)
+OUTBOX_FLUSHED_ROWS = Counter("write_outbox_flushed_rows_total", "Rows moved from the write outbox to storage")
+
+# Bulk import / export
+BULK_ROWS = Counter("bulk_rows_total", "Rows exported or read from an import file", ["operation", "format"])
+BULK_SECONDS = Histogram("bulk_duration_seconds", "Duration of a whole export or import", ["operation"])
+
+# Change feed
+CHANGE_FEED_EVENTS = Counter("change_feed_events_total", "Action item changes published to the change feed", ["op"])
+CHANGE_FEED_DROPPED_SUBSCRIBERS = Counter(
+    "change_feed_dropped_subscribers_total", "Live change subscribers dropped (and told to reset) for falling behind"
+)
+
+# Request coalescing
+SINGLE_FLIGHT_CALLS = Counter(
+    "single_flight_calls_total", "Calls that made the upstream call (leader) or joined an identical one (coalesced)", ["operation", "role"]
+)
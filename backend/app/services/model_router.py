@@ -0,0 +1,223 @@
+import os
+import logging
+from bisect import bisect_right
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .metrics import LLM_ESCALATIONS, LLM_MODEL_CALLS, LLM_MODEL_SECONDS, LLM_MODEL_TOKENS, LLM_ROUTE_SKIPS
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Transcript size bands (chars sent to the model) that routing stats are kept per; the last one is open-ended
+LENGTH_BANDS = (2000, 4000, 8000)
+OUTCOMES = ("ok", "truncated", "invalid", "error")
+
+
+def band_label(band: int) -> str:
+    bounds = (0,) + LENGTH_BANDS
+    if band == len(LENGTH_BANDS):
+        return f"{bounds[band] // 1000}k+"
+    return f"{bounds[band] // 1000}k-{bounds[band + 1] // 1000}k"
+
+
+class ModelTier:
+    """One model of the cascade; `max_input_chars` (0: no limit) keeps longer transcripts off it"""
+
+    __slots__ = ("model", "max_input_chars")
+
+    def __init__(self, model: str, max_input_chars: int = 0):
+        self.model = model
+        self.max_input_chars = max_input_chars
+
+
+def parse_tiers(spec: str) -> List[ModelTier]:
+    """"gpt-4o-mini:8000,gpt-4o" -> tiers, cheapest first"""
+    tiers = []
+    for entry in spec.split(","):
+        model, _, max_chars = entry.strip().partition(":")
+        if model:
+            tiers.append(ModelTier(model, int(max_chars) if max_chars else 0))
+    if not tiers:
+        raise ValueError("LLM_MODEL_TIERS must name at least one model")
+    return tiers
+
+
+class _TierStats:
+    __slots__ = ("calls", "outcomes", "escalated", "skipped", "prompt_tokens", "completion_tokens", "latencies")
+
+    def __init__(self):
+        self.calls = 0
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.escalated = 0
+        self.skipped = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latencies: Deque[float] = deque(maxlen=1000)
+
+
+class ModelRouter:
+    """
+    Cheap-first model cascade for extraction calls.
+
+    Every extraction starts on the first tier that accepts the transcript's
+    length and escalates one tier at a time when the output is truncated
+    (finish_reason "length") or cannot be parsed. Escalation outcomes are
+    kept per tier and transcript size band: a tier that escalated in at least
+    `skip_rate` of its last `window` calls for a band is skipped for that
+    band, except for one probe call in every `probe_every`, so it is used
+    again once it recovers. The output budget for a band is raised to what
+    recent completions there needed.
+    """
+
+    def __init__(
+        self,
+        tiers: List[ModelTier],
+        skip_rate: float = 0.5,
+        window: int = 50,
+        min_samples: int = 10,
+        probe_every: int = 10,
+    ):
+        self.tiers = tiers
+        self.skip_rate = skip_rate
+        self.window = window
+        self.min_samples = min_samples
+        self.probe_every = probe_every
+        self._stats = [_TierStats() for _ in tiers]
+        # (tier index, band) -> recent calls, True where the call escalated
+        self._recent: Dict[Tuple[int, int], Deque[bool]] = {}
+        # band -> completion tokens recent calls needed
+        self._completions: Dict[int, Deque[int]] = {}
+        self._skips: Dict[Tuple[int, int], int] = {}
+
+        # Stats
+        self.routed = 0
+        self.escalations = 0
+
+    @classmethod
+    def from_env(cls) -> "ModelRouter":
+        return cls(
+            parse_tiers(os.getenv("LLM_MODEL_TIERS", "gpt-4o-mini,gpt-4o")),
+            skip_rate=float(os.getenv("LLM_ROUTE_SKIP_RATE", "0.5")),
+            window=int(os.getenv("LLM_ROUTE_WINDOW", "50")),
+            min_samples=int(os.getenv("LLM_ROUTE_MIN_SAMPLES", "10")),
+            probe_every=int(os.getenv("LLM_ROUTE_PROBE_EVERY", "10")),
+        )
+
+    def signature(self) -> str:
+        """The models that may answer (part of the extraction cache key)"""
+        return ",".join(tier.model for tier in self.tiers)
+
+    @staticmethod
+    def band(chars: int) -> int:
+        return bisect_right(LENGTH_BANDS, chars)
+
+    def first_tier(self, chars: int) -> int:
+        """Index of the tier an extraction of `chars` characters starts on"""
+        self.routed += 1
+        band = self.band(chars)
+        last = len(self.tiers) - 1
+        for index, tier in enumerate(self.tiers[:last]):
+            if tier.max_input_chars and chars > tier.max_input_chars:
+                self._skip(index, "length")
+                continue
+            if self._escalation_rate(index, band) >= self.skip_rate:
+                self._skips[(index, band)] = self._skips.get((index, band), 0) + 1
+                if self._skips[(index, band)] % self.probe_every:
+                    self._skip(index, "escalation_rate")
+                    continue
+            return index
+        return last
+
+    def _skip(self, index: int, reason: str):
+        self._stats[index].skipped += 1
+        LLM_ROUTE_SKIPS.inc(self.tiers[index].model, reason)
+
+    def _escalation_rate(self, index: int, band: int) -> float:
+        recent = self._recent.get((index, band))
+        if not recent or len(recent) < self.min_samples:
+            return 0.0
+        return sum(recent) / len(recent)
+
+    def output_budget(self, chars: int, budget: int, cap: int) -> int:
+        """`budget`, raised to 1.25x the p95 completion size recent calls in this band needed, up to `cap`"""
+        needed = sorted(self._completions.get(self.band(chars), ()))
+        if len(needed) < self.min_samples:
+            return budget
+        return max(budget, min(cap, int(needed[min(len(needed) - 1, int(len(needed) * 0.95))] * 1.25)))
+
+    def record(self, index: int, chars: int, outcome: str, seconds: float, usage=None, max_tokens: int = 0):
+        """One call's outcome: ok, truncated, invalid (unparseable output) or error (the call failed)"""
+        model = self.tiers[index].model
+        stats = self._stats[index]
+        stats.calls += 1
+        stats.outcomes[outcome] += 1
+        stats.latencies.append(seconds)
+        LLM_MODEL_CALLS.inc(model, outcome)
+        LLM_MODEL_SECONDS.observe(seconds, model)
+        if usage:
+            stats.prompt_tokens += usage.prompt_tokens
+            stats.completion_tokens += usage.completion_tokens
+            LLM_MODEL_TOKENS.inc(model, "prompt", amount=usage.prompt_tokens)
+            LLM_MODEL_TOKENS.inc(model, "completion", amount=usage.completion_tokens)
+        if outcome == "error":
+            return
+
+        band = self.band(chars)
+        recent = self._recent.get((index, band))
+        if recent is None:
+            recent = self._recent[(index, band)] = deque(maxlen=self.window)
+        recent.append(outcome != "ok")
+        completions = self._completions.get(band)
+        if completions is None:
+            completions = self._completions[band] = deque(maxlen=self.window)
+        if outcome == "ok" and usage:
+            completions.append(usage.completion_tokens)
+        elif outcome == "truncated":
+            # It needed more than it got; count it as twice the budget
+            completions.append(max_tokens * 2)
+
+    def escalate(self, index: int, reason: str) -> Optional[int]:
+        """The next tier after a truncated or invalid output, or None if `index` is the strongest"""
+        if index + 1 >= len(self.tiers):
+            return None
+        self._stats[index].escalated += 1
+        self.escalations += 1
+        LLM_ESCALATIONS.inc(self.tiers[index].model, self.tiers[index + 1].model, reason)
+        logger.warning(f"{self.tiers[index].model} output was {reason}, escalating to {self.tiers[index + 1].model}")
+        return index + 1
+
+    def stats(self) -> dict:
+        tiers = []
+        for tier, stats in zip(self.tiers, self._stats):
+            latencies = sorted(stats.latencies)
+            tiers.append({
+                "model": tier.model,
+                "max_input_chars": tier.max_input_chars or None,
+                "calls": stats.calls,
+                "outcomes": dict(stats.outcomes),
+                "escalated": stats.escalated,
+                "escalation_rate": round(stats.escalated / stats.calls, 4) if stats.calls else 0.0,
+                "skipped": stats.skipped,
+                "latency_avg_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+                "latency_p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 2) if latencies else 0.0,
+                "prompt_tokens": stats.prompt_tokens,
+                "completion_tokens": stats.completion_tokens,
+            })
+        return {
+            "routed": self.routed,
+            "escalations": self.escalations,
+            "escalation_rate": round(self.escalations / self.routed, 4) if self.routed else 0.0,
+            "tiers": tiers,
+            # Recent escalation rate per size band, which is what routing decides on
+            "bands": {
+                band_label(band): {
+                    self.tiers[index].model: round(self._escalation_rate(index, band), 4)
+                    for index in range(len(self.tiers) - 1)
+                    if (index, band) in self._recent
+                }
+                for band in range(len(LENGTH_BANDS) + 1)
+                if any((index, band) in self._recent for index in range(len(self.tiers) - 1))
+            },
+        }
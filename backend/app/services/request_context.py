@@ -0,0 +1,90 @@
+import re
+import time
+import uuid
+import logging
+from contextvars import ContextVar
+
+from .metrics import HTTP_REQUESTS, HTTP_REQUEST_SECONDS
+
+# Request id of the HTTP request being handled ("-" outside a request); tasks
+# spawned while handling a request inherit it
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+LOG_FORMAT = "%(levelname)s:%(name)s:[%(request_id)s] %(message)s"
+# Incoming ids are echoed into logs and headers, so only accept short, plain ones
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+class RequestIdFilter(logging.Filter):
+    """Adds `request_id` to every record passing through the handler"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+def install_request_id_logging():
+    """Prefix every line logged through the root handlers with the current request id"""
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(RequestIdFilter())
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+
+def _route_template(scope: dict, templates: dict) -> str:
+    """The matched route's path template, e.g. /api/action-items/{item_id}"""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    if endpoint not in templates:
+        templates.update({r.endpoint: r.path for r in scope["app"].routes if hasattr(r, "endpoint")})
+    return templates.get(endpoint, "unmatched")
+
+
+class RequestContextMiddleware:
+    """
+    Assigns each request an id (the caller's X-Request-ID if valid, otherwise
+    a new one), returns it in the X-Request-ID response header, and records
+    request count and latency per route template.
+
+    Plain ASGI rather than BaseHTTPMiddleware so streamed responses are not
+    buffered and the per-request cost stays at a couple of dict updates.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._templates = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            route = _route_template(scope, self._templates)
+            HTTP_REQUESTS.inc(scope["method"], route, str(status_code))
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, scope["method"], route)
+            request_id_var.reset(token)
@@ -0,0 +1,183 @@
+import os
+import zlib
+import time
+import asyncio
+from typing import Any, List, Optional
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from starlette.datastructures import Headers, MutableHeaders
+
+from ..models import ActionItem
+from .action_item_cache import encoded_etag
+from .metrics import RESPONSE_RENDER_SECONDS
+
+# Field order of the columnar list format
+ACTION_ITEM_COLUMNS = list(ActionItem.model_fields)
+
+
+def _brotli_module():
+    """Brotli compression needs the optional `brotli` package"""
+    try:
+        import brotli
+        return brotli
+    except ImportError:
+        return None
+
+
+def _default(obj: Any):
+    # Our models define no aliases or custom serializers, so their field dict
+    # encodes exactly as model_dump would; orjson handles the datetimes
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """orjson encoding that accepts pydantic models; UTC datetimes end in Z like pydantic's"""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    orjson response class, also used as the app default.
+
+    Endpoints that return one directly skip FastAPI's response-model
+    validation pass; use that for data that came from our own store and was
+    already validated on the way in.
+    """
+
+    def render(self, content: Any) -> bytes:
+        started = time.perf_counter()
+        body = dumps(content)
+        RESPONSE_RENDER_SECONDS.observe(time.perf_counter() - started)
+        return body
+
+
+def field_dicts(action_items: List[ActionItem]) -> List[dict]:
+    """Action items as their field dicts: orjson encodes these without a callback per item"""
+    return [item.__dict__ for item in action_items]
+
+
+def columnar(action_items: List[ActionItem]) -> dict:
+    """Action items as one array per field (no repeated keys per item)"""
+    rows = field_dicts(action_items)
+    return {column: [row[column] for row in rows] for column in ACTION_ITEM_COLUMNS}
+
+
+def _accepted_encodings(header: str) -> set:
+    """Content codings in an Accept-Encoding header, minus those refused with q=0"""
+    accepted = set()
+    for part in header.lower().split(","):
+        coding, _, params = part.partition(";")
+        name, _, value = params.strip().partition("=")
+        try:
+            if name.strip() == "q" and float(value) == 0:
+                continue
+        except ValueError:
+            pass
+        accepted.add(coding.strip())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Brotli (when the package is installed) or gzip compression of large
+    response bodies.
+
+    Only single-message bodies are compressed: streamed responses (NDJSON,
+    SSE) pass through untouched so their events are not held back in a
+    compressor's buffer. Big bodies are compressed in a worker thread. A
+    strong ETag gets an encoding suffix (`"...-gz"`), so caches never mix
+    up the compressed and identity bodies.
+    """
+
+    compressible_types = ("application/json", "text/")
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4, thread_threshold: int = 64 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.thread_threshold = thread_threshold
+        self.brotli = _brotli_module()
+
+    @staticmethod
+    def options_from_env() -> dict:
+        """Keyword arguments for app.add_middleware"""
+        return dict(
+            minimum_size=int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024")),
+            gzip_level=int(os.getenv("RESPONSE_GZIP_LEVEL", "6")),
+            brotli_quality=int(os.getenv("RESPONSE_BROTLI_QUALITY", "4")),
+        )
+
+    def _choose_encoding(self, scope) -> Optional[str]:
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if self.brotli and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return self.brotli.compress(body, quality=self.brotli_quality)
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        return compressor.compress(body) + compressor.flush()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self._choose_encoding(scope)
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        if_none_match = Headers(scope=scope).get("if-none-match", "")
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                if message["status"] == 304:
+                    # Echo the ETag of the representation the client holds
+                    headers = MutableHeaders(raw=message["headers"])
+                    etag = headers.get("etag")
+                    if etag and encoded_etag(etag, encoding) in if_none_match:
+                        headers["etag"] = encoded_etag(etag, encoding)
+                    await send(message)
+                    return
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not headers.get("content-type", "").startswith(self.compressible_types)
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            if len(body) >= self.thread_threshold:
+                body = await asyncio.to_thread(self._compress, body, encoding)
+            else:
+                body = self._compress(body, encoding)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(body))
+            if "etag" in headers:
+                headers["etag"] = encoded_etag(headers["etag"], encoding)
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
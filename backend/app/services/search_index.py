@@ -0,0 +1,305 @@
+import re
+import html
+import math
+import heapq
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from functools import lru_cache
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models import ActionItem, trusted_action_item
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9]+", re.IGNORECASE)
+QUERY_TERM_RE = re.compile(r"[a-z0-9]+\*?")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+# Longest first; only one suffix is removed per word
+SUFFIXES = [
+    ("ational", "ate"), ("ization", "ize"), ("fulness", "ful"), ("iveness", "ive"),
+    ("ements", ""), ("ement", ""), ("ments", ""), ("ment", ""), ("ness", ""),
+    ("ings", ""), ("ing", ""), ("edly", ""), ("ies", "y"), ("ers", ""), ("ed", ""),
+    ("er", ""), ("ly", ""), ("s", ""),
+]
+VOWELS = set("aeiouy")
+
+# Attributes holding the index itself (swapped wholesale on rebuild)
+INDEX_FIELDS = (
+    "_doc_ids", "_docs", "_doc_terms", "_doc_len", "_postings",
+    "_surface", "_vocabulary", "_next_doc", "_total_len",
+)
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Light suffix-stripping stemmer: report/reports/reported/reporting -> report"""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    for suffix, replacement in SUFFIXES:
+        if word.endswith(suffix):
+            if suffix == "s" and word[-2] in "sui":
+                # class, status, analysis
+                break
+            base = word[:len(word) - len(suffix)] + replacement
+            if len(base) >= 3 and VOWELS & set(base):
+                word = base
+            break
+    if len(word) > 4 and word.endswith("e"):
+        word = word[:-1]
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz" and word[-1] not in VOWELS:
+        # running -> runn -> run
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """(lowercase token, start, end) for every word in the text"""
+    return [(match.group().lower(), match.start(), match.end()) for match in TOKEN_RE.finditer(text)]
+
+
+class SearchIndex:
+    """
+    In-process inverted index over action item text with BM25 ranking.
+
+    Postings map each stemmed term to {doc: term frequency}. A sorted
+    vocabulary of surface (unstemmed) words serves prefix queries (`rep*`).
+    DatabaseService keeps it current on every write and rebuilds it from a
+    full scan on first use and after a failed write.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, max_expansions: int = 50):
+        self.k1 = k1
+        self.b = b
+        self.max_expansions = max_expansions
+        self._reset()
+        self._pending_writes: Optional[list] = None
+        self.ready = False
+
+    def _reset(self):
+        self._doc_ids: Dict[str, int] = {}        # item id -> internal doc number
+        self._docs: Dict[int, tuple] = {}          # doc -> (id, text, status, priority, createdAt, updatedAt)
+        self._doc_terms: Dict[int, Dict[str, int]] = {}
+        self._doc_len: Dict[int, int] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._surface: Dict[str, str] = {}         # surface word -> stem
+        self._vocabulary: List[str] = []           # sorted surface words
+        self._next_doc = 0
+        self._total_len = 0
+
+    # -- Maintenance ---------------------------------------------------------
+
+    def _add(self, row: tuple):
+        self._remove(row[0])
+        doc = self._next_doc
+        self._next_doc += 1
+
+        frequencies: Dict[str, int] = {}
+        for token, _, _ in tokenize(row[1]):
+            if token in STOPWORDS:
+                continue
+            term = self._surface.get(token)
+            if term is None:
+                term = self._surface[token] = stem(token)
+                insort(self._vocabulary, token)
+            frequencies[term] = frequencies.get(term, 0) + 1
+
+        self._doc_ids[row[0]] = doc
+        self._docs[doc] = row
+        self._doc_terms[doc] = frequencies
+        length = sum(frequencies.values())
+        self._doc_len[doc] = length
+        self._total_len += length
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[doc] = frequency
+
+    def _remove(self, item_id: str):
+        doc = self._doc_ids.pop(item_id, None)
+        if doc is None:
+            return
+        del self._docs[doc]
+        self._total_len -= self._doc_len.pop(doc)
+        for term in self._doc_terms.pop(doc):
+            postings = self._postings[term]
+            del postings[doc]
+            if not postings:
+                del self._postings[term]
+
+    @staticmethod
+    def _row(item: ActionItem) -> tuple:
+        return (item.id, item.text, item.status, item.priority, item.createdAt, item.updatedAt)
+
+    def record_write(self, upserted: Iterable[ActionItem] = (), deleted: Iterable[str] = ()):
+        """Apply a successful write (called by DatabaseService)"""
+        upserted = [self._row(item) for item in upserted]
+        deleted = list(deleted)
+        if self._pending_writes is not None:
+            # Replayed on top of the rebuilt index; keyed by id, so idempotent
+            self._pending_writes.append((upserted, deleted))
+        for row in upserted:
+            self._add(row)
+        for item_id in deleted:
+            self._remove(item_id)
+
+    def begin_rebuild(self):
+        """Start journaling writes made while the full scan is loading"""
+        self._pending_writes = []
+
+    def abort_rebuild(self):
+        self._pending_writes = None
+
+    async def finish_rebuild(self, items: List[ActionItem]):
+        """Bring the index in line with `items` (a full scan), then replay journaled writes"""
+        rows = {item.id: self._row(item) for item in items}
+        if not self.ready:
+            # First build: tokenizing is CPU-bound, so build a fresh index off the event loop
+            fresh = SearchIndex(self.k1, self.b, self.max_expansions)
+            await asyncio.to_thread(lambda: [fresh._add(row) for row in rows.values()])
+            for name in INDEX_FIELDS:
+                setattr(self, name, getattr(fresh, name))
+        else:
+            # Later scans usually differ in a few items; only those are re-indexed
+            for item_id, row in rows.items():
+                doc = self._doc_ids.get(item_id)
+                if doc is None or self._docs[doc] != row:
+                    self._add(row)
+            for item_id in [item_id for item_id in self._doc_ids if item_id not in rows]:
+                self._remove(item_id)
+
+        pending, self._pending_writes = self._pending_writes or [], None
+        for upserted, deleted in pending:
+            for row in upserted:
+                self._add(row)
+            for item_id in deleted:
+                self._remove(item_id)
+
+        self.ready = True
+        logger.info(f"Reconciled search index ({len(self._docs)} items, {len(self._postings)} terms)")
+
+    # -- Querying --------------------------------------------------------------
+
+    def _expand(self, raw: str) -> Set[str]:
+        """
+        Stemmed index terms matched by one query term (`rep*` is a prefix query);
+        short prefixes keep only their `max_expansions` most frequent terms
+        """
+        if not raw.endswith("*"):
+            return {stem(raw)} if raw not in STOPWORDS else set()
+        prefix = raw[:-1]
+        terms = set()
+        position = bisect_left(self._vocabulary, prefix)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(prefix):
+            terms.add(self._surface[self._vocabulary[position]])
+            position += 1
+        if len(terms) > self.max_expansions:
+            terms = set(heapq.nlargest(self.max_expansions, terms, key=lambda term: len(self._postings.get(term, ()))))
+        return terms
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> Tuple[List[dict], int]:
+        """
+        Rank items matching every query term by BM25
+
+        Args:
+            query: Words to match; a trailing `*` makes a word a prefix
+            limit: Maximum results returned
+            status: Only items with this status
+            priority: Only items with this priority
+
+        Returns:
+            Tuple of (results with action_item, score and snippet; total number of matches)
+        """
+        groups = [self._expand(raw) for raw in QUERY_TERM_RE.findall(query.lower())]
+        groups = [group for group in groups if group]
+        if not groups or not self._docs:
+            return [], 0
+
+        # Each query term matches the union of its expansions' postings
+        group_postings = []
+        for group in groups:
+            merged: Dict[int, List[Tuple[str, int]]] = {}
+            for term in group:
+                for doc, frequency in self._postings.get(term, {}).items():
+                    merged.setdefault(doc, []).append((term, frequency))
+            if not merged:
+                return [], 0
+            group_postings.append(merged)
+
+        group_postings.sort(key=len)
+        candidates = set(group_postings[0])
+        for merged in group_postings[1:]:
+            candidates.intersection_update(merged)
+            if not candidates:
+                return [], 0
+
+        if status or priority:
+            candidates = {
+                doc for doc in candidates
+                if (not status or self._docs[doc][2] == status) and (not priority or self._docs[doc][3] == priority)
+            }
+
+        doc_count = len(self._docs)
+        avg_len = self._total_len / doc_count if doc_count else 1.0
+        idf = {}
+        for merged in group_postings:
+            for matches in merged.values():
+                for term, _ in matches:
+                    if term not in idf:
+                        df = len(self._postings[term])
+                        idf[term] = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+        scored = []
+        for doc in candidates:
+            norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc] / avg_len)
+            score = 0.0
+            for merged in group_postings:
+                for term, frequency in merged[doc]:
+                    score += idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            scored.append((score, doc))
+
+        matched_terms = set().union(*groups)
+        results = []
+        for score, doc in heapq.nlargest(limit, scored):
+            row = self._docs[doc]
+            results.append({
+                # Indexed rows came from our own store: no re-validation
+                "action_item": trusted_action_item(
+                    id=row[0], text=row[1], status=row[2], priority=row[3], createdAt=row[4], updatedAt=row[5]
+                ),
+                "score": round(score, 4),
+                "snippet": self.snippet(row[1], matched_terms),
+            })
+        return results, len(scored)
+
+    def snippet(self, text: str, terms: Set[str], width: int = 160) -> str:
+        """HTML-escaped excerpt around the first match with matches wrapped in <mark>"""
+        spans = [
+            (start, end) for token, start, end in tokenize(text)
+            if token not in STOPWORDS and self._surface.get(token, stem(token)) in terms
+        ]
+        if not spans:
+            return html.escape(text[:width])
+
+        start = max(0, spans[0][0] - width // 4)
+        end = min(len(text), start + width)
+        parts, cursor = [], start
+        for span_start, span_end in spans:
+            if span_start < start or span_end > end:
+                continue
+            parts.append(html.escape(text[cursor:span_start]))
+            parts.append(f"<mark>{html.escape(text[span_start:span_end])}</mark>")
+            cursor = span_end
+        parts.append(html.escape(text[cursor:end]))
+        return ("…" if start > 0 else "") + "".join(parts) + ("…" if end < len(text) else "")
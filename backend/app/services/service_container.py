@@ -0,0 +1,214 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Generic, List, Optional, TypeVar
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _process_started() -> float:
+    """time.monotonic() at which this process started (from /proc on Linux, else now)"""
+    try:
+        with open("/proc/self/stat") as stat:
+            start_ticks = int(stat.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as uptime:
+            since_boot = float(uptime.read().split()[0])
+        return time.monotonic() - (since_boot - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.monotonic()
+
+
+# Startup timings in stats() count from here, so they include interpreter start and imports
+PROCESS_STARTED = _process_started()
+
+
+class LazyService(Generic[T]):
+    """
+    A service built on first use by an async `build` (construction, opening
+    connections and warming them up). Concurrent first uses share one build.
+    A failed build is not final: callers get None until `retry_seconds`
+    have passed, and the next use after that tries again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        build: Callable[[], Awaitable[T]],
+        close: Optional[Callable[[T], Awaitable[None]]] = None,
+        retry_seconds: float = 5.0,
+    ):
+        self.name = name
+        self.build = build
+        self.close_instance = close
+        self.retry_seconds = retry_seconds
+        self.instance: Optional[T] = None
+        self._task: Optional[asyncio.Task] = None
+        self._retry_at = 0.0
+
+        # Stats
+        self.attempts = 0
+        self.init_ms: Optional[float] = None
+        self.ready_after_ms: Optional[float] = None
+        self.error: Optional[str] = None
+
+    async def get(self) -> Optional[T]:
+        """The service, building it first if needed; None if it cannot be built right now"""
+        if self.instance is not None:
+            return self.instance
+        if self._task is None:
+            if time.monotonic() < self._retry_at:
+                return None
+            self._task = asyncio.create_task(self._build(), name=f"init-{self.name}")
+        # Shielded: a caller that disconnects does not cancel the build for everyone else
+        return await asyncio.shield(self._task)
+
+    async def _build(self) -> Optional[T]:
+        self.attempts += 1
+        started = time.monotonic()
+        try:
+            instance = await self.build()
+        except Exception as e:
+            self.error = str(e)
+            self._retry_at = time.monotonic() + self.retry_seconds
+            logger.error(f"Failed to initialize {self.name} (attempt {self.attempts}, retrying in {self.retry_seconds}s): {e}")
+            return None
+        finally:
+            self._task = None
+        self.instance = instance
+        self.error = None
+        self.init_ms = round((time.monotonic() - started) * 1000, 2)
+        self.ready_after_ms = round((time.monotonic() - PROCESS_STARTED) * 1000, 2)
+        logger.info(f"{self.name} initialized in {self.init_ms} ms (attempt {self.attempts})")
+        return instance
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        instance, self.instance = self.instance, None
+        if instance is not None and self.close_instance:
+            await self.close_instance(instance)
+
+    def stats(self) -> dict:
+        if self.instance is not None:
+            state = "ready"
+        elif self._task is not None:
+            state = "initializing"
+        else:
+            state = "failed" if self.error else "not_started"
+        return {
+            "status": state,
+            "attempts": self.attempts,
+            "init_ms": self.init_ms,
+            "ready_after_ms": self.ready_after_ms,
+            "error": self.error,
+        }
+
+
+class ServiceContainer:
+    """
+    The worker's services, built lazily and in the background.
+
+    `start` (called from the app lifespan) kicks off every build without
+    waiting, so the worker accepts connections at once and answers liveness
+    probes while connections are opened and warmed; readiness waits for the
+    `required` services only (the others are reported as degraded).
+    Requests that arrive first simply wait for the build in progress. With
+    `warm_up` off nothing is built until first used.
+    `drain` marks the worker as shutting down: readiness fails and the
+    registered drain callbacks run (e.g. ending live streams), before
+    `close` shuts services down in reverse order.
+    """
+
+    def __init__(self, warm_up: bool = True, retry_seconds: float = 5.0):
+        self.warm_up = warm_up
+        self.retry_seconds = retry_seconds
+        self.services: Dict[str, LazyService] = {}
+        self.required: List[str] = []
+        self.draining = False
+        self._drain_callbacks: List[Callable[[], None]] = []
+        self._warm_tasks: List[asyncio.Task] = []
+        self.started_after_ms: Optional[float] = None
+
+    @classmethod
+    def from_env(cls) -> "ServiceContainer":
+        return cls(
+            warm_up=os.getenv("SERVICE_WARMUP", "true").lower() == "true",
+            retry_seconds=float(os.getenv("SERVICE_INIT_RETRY_SECONDS", "5")),
+        )
+
+    def add(
+        self,
+        name: str,
+        build: Callable[[], Awaitable[T]],
+        close: Optional[Callable[[T], Awaitable[None]]] = None,
+        required: bool = True,
+    ) -> LazyService[T]:
+        service = LazyService(name, build, close, self.retry_seconds)
+        self.services[name] = service
+        if required:
+            self.required.append(name)
+        return service
+
+    def on_drain(self, callback: Callable[[], None]):
+        self._drain_callbacks.append(callback)
+
+    def start(self):
+        self.started_after_ms = round((time.monotonic() - PROCESS_STARTED) * 1000, 2)
+        self.draining = False
+        if self.warm_up:
+            self._warm_tasks = [asyncio.create_task(service.get()) for service in self.services.values()]
+
+    def drain(self):
+        if self.draining:
+            return
+        self.draining = True
+        logger.info("Draining: readiness now fails and live streams are being closed")
+        for callback in self._drain_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Drain callback failed: {e}")
+
+    async def close(self):
+        self.drain()
+        for task in self._warm_tasks:
+            task.cancel()
+        await asyncio.gather(*self._warm_tasks, return_exceptions=True)
+        self._warm_tasks = []
+        for service in reversed(list(self.services.values())):
+            try:
+                await service.close()
+            except Exception as e:
+                logger.error(f"Failed to close {service.name}: {e}")
+
+    def is_ready(self) -> bool:
+        """Not draining, and every required service built (lazily: none of them failed to build)"""
+        if self.draining:
+            return False
+        return all(
+            service.instance is not None or (not self.warm_up and service.error is None)
+            for service in (self.services[name] for name in self.required)
+        )
+
+    def degraded(self) -> List[str]:
+        """Optional services not built (lazily: that failed to build); they do not affect readiness"""
+        return [
+            name for name, service in self.services.items()
+            if name not in self.required and service.instance is None and (self.warm_up or service.error is not None)
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.monotonic() - PROCESS_STARTED, 2),
+            "lifespan_started_after_ms": self.started_after_ms,
+            "warm_up": self.warm_up,
+            "draining": self.draining,
+            "services": {name: service.stats() for name, service in self.services.items()},
+        }
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from .metrics import SINGLE_FLIGHT_CALLS
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Request coalescing: concurrent calls with the same key share one in-flight
+    upstream call and all receive its result (or its exception).
+
+    The upstream call runs as its own task, so a caller that is cancelled
+    (e.g. its client disconnected) does not cancel it for the others; it is
+    only cancelled once every caller has gone. Nothing is kept after the call
+    finishes, so a failure is never served to later callers. Callers get the
+    same result object and must not mutate it.
+    """
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self._calls: Dict[Hashable, _Call] = {}
+
+        # Stats
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = _Call(asyncio.create_task(func()))
+            call.task.add_done_callback(lambda _, key=key, call=call: self._forget(key, call))
+            self.leaders += 1
+            SINGLE_FLIGHT_CALLS.inc(self.operation, "leader")
+        else:
+            self.coalesced += 1
+            SINGLE_FLIGHT_CALLS.inc(self.operation, "coalesced")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every caller was cancelled; later callers start a fresh call
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> dict:
+        return {"in_flight": self.in_flight, "leaders": self.leaders, "coalesced": self.coalesced}
@@ -0,0 +1,247 @@
+import os
+import sqlite3
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+
+from .storage import StorageBackend
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("id", "text", "status", "priority", "created_at", "updated_at")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS action_items (
+    id TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_action_items_status_priority_created
+    ON action_items (status, priority, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_action_items_priority_created
+    ON action_items (priority, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_action_items_created
+    ON action_items (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_action_items_updated
+    ON action_items (updated_at);
+"""
+
+
+def _normalize_timestamp(value: Optional[str]) -> Optional[str]:
+    """
+    Fixed-width ISO timestamps, so text ordering matches time ordering
+    (isoformat() drops the microseconds when they are zero)
+    """
+    if not value:
+        return value
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    return parsed.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+def _like_pattern(search: str) -> str:
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _where(filters: Optional[dict]) -> Tuple[List[str], list]:
+    clauses, args = [], []
+    filters = filters or {}
+    if filters.get("status"):
+        clauses.append("status = ?")
+        args.append(filters["status"])
+    if filters.get("priority"):
+        clauses.append("priority = ?")
+        args.append(filters["priority"])
+    if filters.get("search"):
+        # LIKE is case-insensitive for ASCII, matching PostgREST's ilike
+        clauses.append("text LIKE ? ESCAPE '\\'")
+        args.append(_like_pattern(filters["search"]))
+    return clauses, args
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Embedded action item storage in a local SQLite file.
+
+    One connection in WAL mode guarded by a lock; queries run in a worker
+    thread so the event loop never blocks on disk.
+    """
+
+    name = "sqlite"
+    max_ids_per_call = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+            self._db = db
+            logger.info(f"✅ SQLite storage opened at {self.path}")
+        return self._db
+
+    async def _run(self, func, *args):
+        def call():
+            with self._lock:
+                return func(self._connect(), *args)
+        return await asyncio.to_thread(call)
+
+    async def open(self):
+        await self._run(lambda db: None)
+
+    async def close(self):
+        def close():
+            with self._lock:
+                if self._db is not None:
+                    self._db.close()
+                    self._db = None
+                    logger.info("Closed SQLite storage")
+        await asyncio.to_thread(close)
+
+    async def insert_rows(self, rows: List[dict]):
+        await self._insert(rows, "INSERT")
+
+    async def upsert_rows(self, rows: List[dict], overwrite: bool = False):
+        if overwrite:
+            updates = ", ".join(f"{column} = excluded.{column}" for column in COLUMNS if column != "id")
+            await self._insert(rows, "INSERT", f" ON CONFLICT(id) DO UPDATE SET {updates}")
+        else:
+            await self._insert(rows, "INSERT OR IGNORE")
+
+    async def _insert(self, rows: List[dict], statement: str, conflict: str = ""):
+        values = [
+            (
+                row["id"], row["text"], row["status"], row["priority"],
+                _normalize_timestamp(row["created_at"]), _normalize_timestamp(row.get("updated_at")),
+            )
+            for row in rows
+        ]
+
+        def insert(db: sqlite3.Connection):
+            # One prepared statement and one transaction for the whole batch
+            with db:
+                db.executemany(
+                    f"{statement} INTO action_items ({', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?){conflict}",
+                    values,
+                )
+
+        await self._run(insert)
+
+    async def select_rows(
+        self,
+        filters: dict,
+        order: str = "desc",
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[dict]:
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unsupported sort order: {order}")
+        clauses, args = _where(filters)
+        if after:
+            op = "<" if order == "desc" else ">"
+            clauses.append(f"(created_at {op} ? OR (created_at = ? AND id {op} ?))")
+            args.extend([after[0], after[0], after[1]])
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM action_items"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY created_at {order}, id {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+
+        def select(db: sqlite3.Connection):
+            return [dict(row) for row in db.execute(sql, args)]
+
+        return await self._run(select)
+
+    async def select_by_id(self, item_id: str) -> Optional[dict]:
+        def select(db: sqlite3.Connection):
+            row = db.execute(f"SELECT {', '.join(COLUMNS)} FROM action_items WHERE id = ?", (item_id,)).fetchone()
+            return dict(row) if row else None
+
+        return await self._run(select)
+
+    async def existing_ids(self, ids: List[str]) -> Set[str]:
+        def select(db: sqlite3.Connection):
+            found = set()
+            for start in range(0, len(ids), self.max_ids_per_call):
+                chunk = ids[start:start + self.max_ids_per_call]
+                sql = f"SELECT id FROM action_items WHERE id IN ({', '.join('?' for _ in chunk)})"
+                found.update(row["id"] for row in db.execute(sql, chunk))
+            return found
+
+        return await self._run(select)
+
+    @staticmethod
+    def _target(ids: Optional[List[str]], filters: Optional[dict]) -> Tuple[str, list]:
+        if ids is not None:
+            return f"id IN ({', '.join('?' for _ in ids)})", list(ids)
+        clauses, args = _where(filters)
+        if not clauses:
+            raise ValueError("A bulk operation needs ids or at least one filter")
+        return " AND ".join(clauses), args
+
+    async def update_rows(self, updates: dict, ids: Optional[List[str]] = None, filters: Optional[dict] = None) -> List[dict]:
+        if ids is not None and not ids:
+            return []
+        columns = [column for column in updates if column in COLUMNS and column != "id"]
+        values = [
+            _normalize_timestamp(updates[column]) if column.endswith("_at") else updates[column]
+            for column in columns
+        ]
+        where, args = self._target(ids, filters)
+        sql = (
+            f"UPDATE action_items SET {', '.join(f'{column} = ?' for column in columns)} "
+            f"WHERE {where} RETURNING {', '.join(COLUMNS)}"
+        )
+
+        def update(db: sqlite3.Connection):
+            with db:
+                return [dict(row) for row in db.execute(sql, values + args).fetchall()]
+
+        return await self._run(update)
+
+    async def delete_rows(self, ids: Optional[List[str]] = None, filters: Optional[dict] = None) -> List[dict]:
+        if ids is not None and not ids:
+            return []
+        where, args = self._target(ids, filters)
+        sql = f"DELETE FROM action_items WHERE {where} RETURNING id, status, priority, created_at"
+
+        def delete(db: sqlite3.Connection):
+            with db:
+                return [dict(row) for row in db.execute(sql, args).fetchall()]
+
+        return await self._run(delete)
+
+    async def count_rows(self) -> List[Tuple[str, str, str, int]]:
+        # Timestamps are stored fixed-width, so the first 10 characters are the day
+        sql = (
+            "SELECT status, priority, substr(created_at, 1, 10) AS day, COUNT(*) AS n "
+            "FROM action_items GROUP BY status, priority, day"
+        )
+
+        def count(db: sqlite3.Connection):
+            return [(row["status"], row["priority"], row["day"], row["n"]) for row in db.execute(sql)]
+
+        return await self._run(count)
+
+    async def ping(self) -> bool:
+        await self._run(lambda db: db.execute("SELECT 1").fetchone())
+        return True
@@ -0,0 +1,151 @@
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import List, Optional, Set, Tuple
+
+from .metrics import DB_OPERATION_SECONDS
+
+
+class StorageBackend(ABC):
+    """
+    Row-level storage for action items.
+
+    Rows are plain dicts using the database column names (id, text, status,
+    priority, created_at, updated_at). Filters are dicts with any of
+    `status`, `priority` and `search` (case-insensitive substring of text).
+    DatabaseService builds on this interface and owns caching, cursors and
+    conversion to ActionItem models.
+    """
+
+    # Label for metrics and logs
+    name = "storage"
+    # Maximum ids sent in one update/delete call
+    max_ids_per_call = 500
+
+    async def open(self):
+        """Acquire connections / pools (called from the app lifespan)"""
+
+    async def close(self):
+        """Release connections / pools"""
+
+    @abstractmethod
+    async def insert_rows(self, rows: List[dict]):
+        """Insert rows in one batch"""
+
+    @abstractmethod
+    async def upsert_rows(self, rows: List[dict], overwrite: bool = False):
+        """
+        Insert rows in one batch, skipping any whose id already exists, so
+        replaying the same rows is harmless (and never undoes later updates).
+        With `overwrite` an existing row is replaced instead (imports)
+        """
+
+    @abstractmethod
+    async def select_rows(
+        self,
+        filters: dict,
+        order: str = "desc",
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[dict]:
+        """
+        Rows matching `filters`, ordered by (created_at, id) in `order`,
+        starting strictly after the (created_at, id) keyset `after`
+        """
+
+    @abstractmethod
+    async def select_by_id(self, item_id: str) -> Optional[dict]:
+        """A single row, or None"""
+
+    @abstractmethod
+    async def existing_ids(self, ids: List[str]) -> Set[str]:
+        """The subset of `ids` that are stored"""
+
+    @abstractmethod
+    async def update_rows(self, updates: dict, ids: Optional[List[str]] = None, filters: Optional[dict] = None) -> List[dict]:
+        """Apply `updates` to the rows with these ids (or matching `filters`); returns the updated rows"""
+
+    @abstractmethod
+    async def delete_rows(self, ids: Optional[List[str]] = None, filters: Optional[dict] = None) -> List[dict]:
+        """
+        Delete the rows with these ids (or matching `filters`); returns the
+        deleted rows' id, status, priority and created_at
+        """
+
+    @abstractmethod
+    async def count_rows(self) -> List[Tuple[str, str, str, int]]:
+        """Row counts grouped by (status, priority, creation day as YYYY-MM-DD)"""
+
+    @abstractmethod
+    async def ping(self) -> bool:
+        """Cheap connectivity check"""
+
+
+class InstrumentedStorage(StorageBackend):
+    """Delegates to another backend, recording each call's round-trip time by operation"""
+
+    def __init__(self, backend: StorageBackend):
+        self.backend = backend
+        self.name = backend.name
+        self.max_ids_per_call = backend.max_ids_per_call
+
+    async def _timed(self, operation: str, call):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await call
+            outcome = "ok"
+            return result
+        finally:
+            DB_OPERATION_SECONDS.observe(time.perf_counter() - started, self.name, operation, outcome)
+
+    async def open(self):
+        await self.backend.open()
+
+    async def close(self):
+        await self.backend.close()
+
+    async def insert_rows(self, rows: List[dict]):
+        return await self._timed("insert", self.backend.insert_rows(rows))
+
+    async def upsert_rows(self, rows: List[dict], overwrite: bool = False):
+        return await self._timed("upsert", self.backend.upsert_rows(rows, overwrite=overwrite))
+
+    async def select_rows(
+        self,
+        filters: dict,
+        order: str = "desc",
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[dict]:
+        return await self._timed("select", self.backend.select_rows(filters, order=order, limit=limit, after=after))
+
+    async def select_by_id(self, item_id: str) -> Optional[dict]:
+        return await self._timed("select_by_id", self.backend.select_by_id(item_id))
+
+    async def existing_ids(self, ids: List[str]) -> Set[str]:
+        return await self._timed("select_ids", self.backend.existing_ids(ids))
+
+    async def update_rows(self, updates: dict, ids: Optional[List[str]] = None, filters: Optional[dict] = None) -> List[dict]:
+        return await self._timed("update", self.backend.update_rows(updates, ids=ids, filters=filters))
+
+    async def delete_rows(self, ids: Optional[List[str]] = None, filters: Optional[dict] = None) -> List[dict]:
+        return await self._timed("delete", self.backend.delete_rows(ids=ids, filters=filters))
+
+    async def count_rows(self) -> List[Tuple[str, str, str, int]]:
+        return await self._timed("count", self.backend.count_rows())
+
+    async def ping(self) -> bool:
+        return await self._timed("ping", self.backend.ping())
+
+
+def create_storage_backend() -> StorageBackend:
+    """Build the backend selected by STORAGE_BACKEND (supabase or sqlite)"""
+    backend = os.getenv("STORAGE_BACKEND", "supabase").lower()
+    if backend == "supabase":
+        from .supabase_storage import SupabaseStorage
+        return SupabaseStorage()
+    if backend == "sqlite":
+        from .sqlite_storage import SQLiteStorage
+        return SQLiteStorage(os.getenv("SQLITE_DB_PATH", "data/action_items.db"))
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend} (expected 'supabase' or 'sqlite')")
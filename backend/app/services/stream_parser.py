@@ -0,0 +1,73 @@
+import json
+from typing import Any, List
+
+
+class JSONArrayStreamParser:
+    """
+    Incrementally extracts the top-level elements of a JSON array from text
+    that arrives in arbitrary pieces (e.g. streamed completion deltas).
+
+    Anything before the opening '[' (such as a ```json fence) is ignored.
+    Each element is returned as soon as its closing brace or quote arrives.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self._depth = 0          # nesting depth inside the top-level array
+        self._in_string = False
+        self._escape = False
+        self._element: List[str] = []
+
+    def feed(self, text: str) -> List[Any]:
+        """Consume more text and return any elements completed by it"""
+        completed = []
+        for char in text:
+            if self.finished:
+                break
+            if not self.started:
+                if char == "[":
+                    self.started = True
+                continue
+
+            if self._in_string:
+                self._element.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 0:
+                        # A bare string element of the top-level array
+                        completed.append(self._pop_element())
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._element.append(char)
+            elif char in "{[":
+                self._depth += 1
+                self._element.append(char)
+            elif char in "}]":
+                if self._depth == 0:
+                    # Closing bracket of the top-level array
+                    self.finished = True
+                    break
+                self._depth -= 1
+                self._element.append(char)
+                if self._depth == 0:
+                    completed.append(self._pop_element())
+            elif self._depth > 0:
+                self._element.append(char)
+            # Commas and whitespace between top-level elements are skipped
+
+        return [element for element in completed if element is not None]
+
+    def _pop_element(self) -> Any:
+        raw = "".join(self._element)
+        self._element = []
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return None
@@ -0,0 +1,198 @@
+import os
+import logging
+import httpx
+from typing import List, Optional, Set, Tuple
+
+from .storage import StorageBackend
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    """HTTP/2 support in httpx needs the optional `h2` package"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _quote(value: str) -> str:
+    """Quote a value for use inside a PostgREST logical (or/and) filter"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _ilike_pattern(search: str) -> str:
+    # Escape LIKE wildcards and drop PostgREST's own '*' wildcard from user input
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_").replace("*", "")
+    return f"*{escaped}*"
+
+
+def _filter_params(status: Optional[str] = None, priority: Optional[str] = None, search: Optional[str] = None) -> dict:
+    """PostgREST query parameters for a filter dict"""
+    params = {}
+    if status:
+        params["status"] = f"eq.{status}"
+    if priority:
+        params["priority"] = f"eq.{priority}"
+    if search:
+        params["text"] = f"ilike.{_ilike_pattern(search)}"
+    return params
+
+
+def _id_in(ids: List[str]) -> str:
+    return "in.(" + ",".join(_quote(item_id) for item_id in ids) + ")"
+
+
+class SupabaseStorage(StorageBackend):
+    """Action item storage on the Supabase REST API (PostgREST)"""
+
+    name = "supabase"
+    # Keeps `id=in.(...)` URLs well under common 8 KB limits
+    max_ids_per_call = 150
+
+    def __init__(self):
+        self.supabase_url = os.getenv("SUPABASE_URL")
+        self.supabase_key = os.getenv("SUPABASE_KEY") or os.getenv("SUPABASE_ANON_KEY")
+
+        if not self.supabase_url or not self.supabase_key:
+            raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
+
+        # Set up headers for Supabase REST API
+        self.headers = {
+            "apikey": self.supabase_key,
+            "Authorization": f"Bearer {self.supabase_key}",
+            "Content-Type": "application/json",
+            "Prefer": "return=representation"
+        }
+
+        # Connection pool settings (shared by every request on this worker)
+        self.limits = httpx.Limits(
+            max_connections=int(os.getenv("DB_POOL_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("DB_POOL_MAX_KEEPALIVE", "10")),
+            keepalive_expiry=float(os.getenv("DB_POOL_KEEPALIVE_EXPIRY", "30")),
+        )
+        self.timeout = httpx.Timeout(
+            float(os.getenv("DB_TIMEOUT", "10")),
+            connect=float(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+        )
+        self.http2 = os.getenv("DB_HTTP2", "true").lower() == "true" and _http2_available()
+        self.client: Optional[httpx.AsyncClient] = None
+
+        logger.info("✅ Supabase REST API client initialized successfully")
+
+    async def open(self):
+        """Open the shared, pooled HTTP client"""
+        if self.client is None or self.client.is_closed:
+            self.client = httpx.AsyncClient(
+                base_url=f"{self.supabase_url}/rest/v1",
+                headers=self.headers,
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+            )
+            logger.info(f"Opened Supabase connection pool (http2={self.http2}, max_connections={self.limits.max_connections})")
+
+    async def close(self):
+        """Close the shared HTTP client and release pooled connections"""
+        if self.client is not None and not self.client.is_closed:
+            await self.client.aclose()
+            logger.info("Closed Supabase connection pool")
+        self.client = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        # Lazily open the pool when used outside the app lifespan (scripts, shells)
+        if self.client is None or self.client.is_closed:
+            await self.open()
+        return self.client
+
+    async def insert_rows(self, rows: List[dict]):
+        client = await self._get_client()
+        response = await client.post("/action_items", json=rows)
+        response.raise_for_status()
+
+    async def upsert_rows(self, rows: List[dict], overwrite: bool = False):
+        client = await self._get_client()
+        resolution = "merge-duplicates" if overwrite else "ignore-duplicates"
+        response = await client.post(
+            "/action_items",
+            json=rows,
+            params={"on_conflict": "id"},
+            headers={"Prefer": f"return=minimal,resolution={resolution}"},
+        )
+        response.raise_for_status()
+
+    async def select_rows(
+        self,
+        filters: dict,
+        order: str = "desc",
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[dict]:
+        params = _filter_params(**filters)
+        params["order"] = f"created_at.{order},id.{order}"
+        if limit is not None:
+            params["limit"] = str(limit)
+        if after:
+            op = "lt" if order == "desc" else "gt"
+            created_at, item_id = _quote(after[0]), _quote(after[1])
+            params["or"] = f"(created_at.{op}.{created_at},and(created_at.eq.{created_at},id.{op}.{item_id}))"
+
+        client = await self._get_client()
+        response = await client.get("/action_items", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def select_by_id(self, item_id: str) -> Optional[dict]:
+        client = await self._get_client()
+        response = await client.get("/action_items", params={"id": f"eq.{item_id}", "limit": "1"})
+        response.raise_for_status()
+        data = response.json()
+        return data[0] if data else None
+
+    async def existing_ids(self, ids: List[str]) -> Set[str]:
+        client = await self._get_client()
+        found = set()
+        for start in range(0, len(ids), self.max_ids_per_call):
+            chunk = ids[start:start + self.max_ids_per_call]
+            response = await client.get("/action_items", params={"select": "id", "id": _id_in(chunk)})
+            response.raise_for_status()
+            found.update(row["id"] for row in response.json())
+        return found
+
+    def _target_params(self, ids: Optional[List[str]], filters: Optional[dict]) -> dict:
+        if ids is not None:
+            return {"id": _id_in(ids)}
+        params = _filter_params(**(filters or {}))
+        if not params:
+            raise ValueError("A bulk operation needs ids or at least one filter")
+        return params
+
+    async def update_rows(self, updates: dict, ids: Optional[List[str]] = None, filters: Optional[dict] = None) -> List[dict]:
+        client = await self._get_client()
+        response = await client.patch("/action_items", json=updates, params=self._target_params(ids, filters))
+        response.raise_for_status()
+        return response.json()
+
+    async def delete_rows(self, ids: Optional[List[str]] = None, filters: Optional[dict] = None) -> List[dict]:
+        client = await self._get_client()
+        params = dict(self._target_params(ids, filters), select="id,status,priority,created_at")
+        response = await client.delete("/action_items", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def count_rows(self) -> List[Tuple[str, str, str, int]]:
+        # PostgREST cannot group by a date expression, so this calls the
+        # action_item_counts() SQL function (see README)
+        client = await self._get_client()
+        response = await client.post("/rpc/action_item_counts", json={})
+        response.raise_for_status()
+        return [(row["status"], row["priority"], str(row["day"])[:10], int(row["count"])) for row in response.json()]
+
+    async def ping(self) -> bool:
+        client = await self._get_client()
+        response = await client.get("/action_items", params={"select": "id", "limit": "1"})
+        response.raise_for_status()
+        return True
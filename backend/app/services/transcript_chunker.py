@@ -0,0 +1,97 @@
+import re
+from typing import List
+
+# "John:", "Sarah Lee:", "[00:12:03] Mike:" style speaker tags at the start of a line
+SPEAKER_TAG_RE = re.compile(r"^\s*(?:\[[^\]]{1,20}\]\s*)?[A-Z][\w .'-]{0,40}:\s")
+PARAGRAPH_BREAK_RE = re.compile(r"\n\s*\n")
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_into_segments(transcript: str) -> List[str]:
+    """
+    Split a transcript into natural segments: paragraphs, and within a
+    paragraph each speaker turn.
+    """
+    segments = []
+    for paragraph in PARAGRAPH_BREAK_RE.split(transcript):
+        current = []
+        for line in paragraph.splitlines():
+            if current and SPEAKER_TAG_RE.match(line):
+                segments.append("\n".join(current))
+                current = []
+            current.append(line)
+        if current:
+            segments.append("\n".join(current))
+    return [segment.strip() for segment in segments if segment.strip()]
+
+
+def _split_long_segment(segment: str, max_chars: int) -> List[str]:
+    """Break a segment that is larger than a chunk at sentence boundaries"""
+    pieces = []
+    current = ""
+    for sentence in SENTENCE_END_RE.split(segment):
+        while len(sentence) > max_chars:
+            # A single run-on "sentence" - fall back to a hard cut
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_transcript(transcript: str, max_chars: int = 8000, overlap_chars: int = 600) -> List[str]:
+    """
+    Split a transcript into chunks of at most `max_chars` characters.
+
+    Chunks break at speaker or paragraph boundaries, and each chunk starts
+    with the trailing segments of the previous one (up to `overlap_chars`)
+    so action items spanning a boundary keep their context.
+
+    Args:
+        transcript: The meeting transcript text
+        max_chars: Maximum chunk size in characters
+        overlap_chars: Amount of trailing context repeated in the next chunk
+
+    Returns:
+        List of transcript chunks (a single chunk for short transcripts)
+    """
+    if len(transcript) <= max_chars:
+        return [transcript]
+
+    segments = []
+    for segment in split_into_segments(transcript):
+        if len(segment) > max_chars:
+            segments.extend(_split_long_segment(segment, max_chars))
+        else:
+            segments.append(segment)
+
+    chunks = []
+    current: List[str] = []
+    current_len = 0
+    for segment in segments:
+        if current and current_len + len(segment) + 2 > max_chars:
+            chunks.append("\n\n".join(current))
+
+            # Carry trailing segments over as overlap
+            overlap: List[str] = []
+            overlap_len = 0
+            for previous in reversed(current):
+                if overlap_len + len(previous) > overlap_chars:
+                    break
+                overlap.insert(0, previous)
+                overlap_len += len(previous) + 2
+            if overlap_len + len(segment) + 2 > max_chars:
+                overlap, overlap_len = [], 0
+
+            current = overlap
+            current_len = overlap_len
+        current.append(segment)
+        current_len += len(segment) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
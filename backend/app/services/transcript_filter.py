@@ -0,0 +1,265 @@
+import os
+import re
+import logging
+from typing import List, Optional, Tuple
+
+from .transcript_chunker import SENTENCE_END_RE
+from .metrics import LLM_PREFILTER_TOKENS
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# "[00:12:03]", "00:12:03 -" or "(12:03)" at the start of a line
+TIMESTAMP_RE = re.compile(r"^\s*[\[(]?\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d+)?[\])]?\s*[-–]?\s*")
+# "John:", "SARAH LEE :", "mike:" at the start of a line
+SPEAKER_RE = re.compile(r"^([A-Za-z][\w.'-]*(?: [A-Za-z][\w.'-]*){0,3})\s*:\s+")
+FILLER_RE = re.compile(r"\b(?:u+m+|u+h+|e+r+m+|h+m+|uh-huh|mm-hmm)\b[,.]?\s*|\byou know,\s*", re.IGNORECASE)
+SPACES_RE = re.compile(r"[ \t]+")
+
+# Action-item cues: each family adds its weight once per sentence. Single
+# words are set lookups; the phrase patterns run on the lowercased sentence
+WORD_RE = re.compile(r"[a-z0-9'/-]+")
+COMMITMENT_RE = re.compile(
+    r"\b(?:will|shall|needs? to|ha(?:ve|s) to|must|should|going to|gonna|let's|let us|(?:can|could|would) you|"
+    r"please|make sure|action items?|to-?dos?|follow[- ]?up|take care of|responsible for|assign(?:ed)?|owner|owns|"
+    r"volunteer(?:ed)?|on it|(?:i|we|you|he|she|they)'ll|(?:i|we) can)\b"
+)
+DEADLINE_WORDS = frozenset("""
+    monday tuesday wednesday thursday friday saturday sunday today tonight tomorrow eod eow cob asap deadline due
+    january february march april june july august september october november december q1 q2 q3 q4
+""".split())
+DEADLINE_RE = re.compile(
+    r"\b(?:next (?:week|month|quarter|sprint|meeting|call)|end of (?:the )?(?:day|week|month|quarter|sprint)|"
+    r"by (?:then|the|next|end)|before (?:the|next|launch|release))\b|\b\d{1,2}/\d{1,2}\b"
+)
+ASSIGNEE_RE = re.compile(r"@\w+|\b[A-Z][a-z]+,? (?:will|to|needs to|should|can|is going to)\b|\b(?:I|we)(?:'ll| will)\b")
+IMPERATIVE_VERBS = frozenset("""
+    add arrange ask book call check circulate clean confirm contact create deploy document draft email file finalize
+    find fix follow get investigate look make merge move order organize plan prepare publish reach remove reply
+    review run schedule send set share ship start submit test update write
+""".split())
+SMALL_TALK_WORDS = frozenset("hi hello hey thanks weekend weather bye cheers".split())
+SMALL_TALK_RE = re.compile(
+    r"\b(?:good (?:morning|afternoon|evening)|how are you|how's it going|thank you|can you hear me|"
+    r"you're on mute|sounds good|no worries)\b"
+)
+# "Omar, file a ticket ..." - an imperative addressed to someone mid-sentence
+ADDRESSED_VERB_RE = re.compile(r"\b[A-Z][a-z]+, (?:please )?([a-z]+)\b")
+LEADING_WORDS = frozenset("ok okay so and also alright right then oh well please".split())
+
+GAP_MARKER = "..."
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token, the same estimate the LLM scheduler budgets with"""
+    return len(text) // 4
+
+
+def normalize_lines(transcript: str) -> List[Tuple[Optional[str], str]]:
+    """
+    Split a transcript into (speaker, text) turns: timestamps and filler words
+    dropped, whitespace collapsed, speaker tags in one casing ("JOHN SMITH" ->
+    "John Smith"). Lines without a tag continue the current turn; a blank line
+    ends it.
+    """
+    turns: List[Tuple[Optional[str], List[str]]] = []
+    current = None
+    for line in transcript.splitlines():
+        line = TIMESTAMP_RE.sub("", line)
+        if not line.strip():
+            current = None
+            continue
+        match = SPEAKER_RE.match(line)
+        if match:
+            speaker = SPACES_RE.sub(" ", match.group(1)).strip()
+            if speaker.isupper() or speaker.islower():
+                speaker = speaker.title()
+            current = (speaker, [])
+            turns.append(current)
+            line = line[match.end():]
+        elif current is None:
+            current = (None, [])
+            turns.append(current)
+        line = SPACES_RE.sub(" ", FILLER_RE.sub("", line)).strip()
+        if line:
+            current[1].append(line)
+    return [(speaker, " ".join(lines)) for speaker, lines in turns if lines]
+
+
+def score_sentence(sentence: str) -> float:
+    """Cheap action-item likelihood: positive for commitments, deadlines, assignees and imperatives"""
+    lowered = sentence.lower()
+    words = WORD_RE.findall(lowered)
+    score = 0.0
+    if COMMITMENT_RE.search(lowered):
+        score += 2.0
+    if not DEADLINE_WORDS.isdisjoint(words) or DEADLINE_RE.search(lowered):
+        score += 1.5
+    if ASSIGNEE_RE.search(sentence):
+        score += 1.0
+    first_word = next((word for word in words if word not in LEADING_WORDS), "")
+    addressed = ADDRESSED_VERB_RE.search(sentence)
+    if first_word in IMPERATIVE_VERBS or (addressed and addressed.group(1) in IMPERATIVE_VERBS):
+        score += 2.0
+    if not SMALL_TALK_WORDS.isdisjoint(words) or SMALL_TALK_RE.search(lowered):
+        score -= 2.0
+    if len(words) < 4:
+        score -= 1.0
+    return score
+
+
+class FilteredTranscript:
+    """Result of pre-filtering one transcript"""
+
+    __slots__ = ("text", "original_tokens", "sent_tokens", "kept_sentences", "total_sentences", "dropped_relevant")
+
+    def __init__(
+        self,
+        text: str,
+        original_tokens: int,
+        sent_tokens: int,
+        kept_sentences: int,
+        total_sentences: int,
+        dropped_relevant: int = 0,
+    ):
+        self.text = text
+        self.original_tokens = original_tokens
+        self.sent_tokens = sent_tokens
+        self.kept_sentences = kept_sentences
+        self.total_sentences = total_sentences
+        # Sentences at or above the threshold that did not fit the token budget
+        self.dropped_relevant = dropped_relevant
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(0, self.original_tokens - self.sent_tokens)
+
+    @property
+    def dropped_sentences(self) -> int:
+        return self.total_sentences - self.kept_sentences
+
+
+class TranscriptFilter:
+    """
+    Local pre-filter run before extraction.
+
+    The transcript is normalized, split into sentences, and each sentence is
+    scored for action-item cues. Sentences at or above `threshold` are kept
+    together with `context` neighbouring sentences on each side, best scores
+    first, until `token_budget` is reached; they are sent in their original
+    order, with "..." marking the gaps. Short transcripts, and transcripts
+    with no scoring sentence at all, are sent whole (normalized) so recall
+    never depends on the heuristics alone.
+    """
+
+    def __init__(self, token_budget: int = 3000, context: int = 1, threshold: float = 2.0, min_tokens: int = 300):
+        self.token_budget = token_budget
+        self.context = context
+        self.threshold = threshold
+        self.min_tokens = min_tokens
+
+        # Stats
+        self.transcripts = 0
+        self.original_tokens = 0
+        self.sent_tokens = 0
+        self.dropped_sentences = 0
+        self.dropped_relevant = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["TranscriptFilter"]:
+        if os.getenv("TRANSCRIPT_FILTER_ENABLED", "true").lower() != "true":
+            return None
+        return cls(
+            token_budget=int(os.getenv("TRANSCRIPT_FILTER_TOKEN_BUDGET", "3000")),
+            context=int(os.getenv("TRANSCRIPT_FILTER_CONTEXT_SENTENCES", "1")),
+            threshold=float(os.getenv("TRANSCRIPT_FILTER_THRESHOLD", "2.0")),
+            min_tokens=int(os.getenv("TRANSCRIPT_FILTER_MIN_TOKENS", "300")),
+        )
+
+    def signature(self) -> str:
+        """Settings that change what is sent to the model (part of the extraction cache key)"""
+        return f"prefilter:{self.token_budget}:{self.context}:{self.threshold}:{self.min_tokens}"
+
+    def filter(self, transcript: str) -> FilteredTranscript:
+        original_tokens = estimate_tokens(transcript)
+        turns = normalize_lines(transcript)
+        # (turn index, sentence) in transcript order
+        sentences = [
+            (turn_index, sentence)
+            for turn_index, (_, text) in enumerate(turns)
+            for sentence in SENTENCE_END_RE.split(text)
+            if sentence
+        ]
+
+        scores = [score_sentence(sentence) for _, sentence in sentences]
+        relevant = [index for index, score in enumerate(scores) if score >= self.threshold]
+        if original_tokens <= self.min_tokens or not relevant:
+            selected = range(len(sentences))
+        else:
+            selected = self._select(sentences, scores, relevant)
+
+        text = self._render(turns, sentences, selected)
+        dropped_relevant = len(set(relevant).difference(selected))
+        result = FilteredTranscript(
+            text, original_tokens, estimate_tokens(text), len(selected), len(sentences), dropped_relevant
+        )
+        self.transcripts += 1
+        self.original_tokens += result.original_tokens
+        self.sent_tokens += result.sent_tokens
+        self.dropped_sentences += result.dropped_sentences
+        self.dropped_relevant += result.dropped_relevant
+        LLM_PREFILTER_TOKENS.inc("original", amount=result.original_tokens)
+        LLM_PREFILTER_TOKENS.inc("sent", amount=result.sent_tokens)
+        return result
+
+    def _select(self, sentences: List[Tuple[int, str]], scores: List[float], relevant: List[int]) -> List[int]:
+        """Relevant sentences and their context windows, best scores first, within the token budget"""
+        selected = set()
+        used = 0
+        for index in sorted(relevant, key=lambda i: (-scores[i], i)):
+            window = [index] + [
+                neighbour
+                for offset in range(1, self.context + 1)
+                for neighbour in (index - offset, index + offset)
+                if 0 <= neighbour < len(sentences)
+            ]
+            for position, neighbour in enumerate(window):
+                if neighbour in selected:
+                    continue
+                # Speaker tag, separators and gap markers: a few tokens per sentence
+                cost = estimate_tokens(sentences[neighbour][1]) + 2
+                if used + cost > self.token_budget:
+                    if position == 0:
+                        break
+                    continue
+                selected.add(neighbour)
+                used += cost
+        return sorted(selected)
+
+    @staticmethod
+    def _render(turns: List[Tuple[Optional[str], str]], sentences: List[Tuple[int, str]], selected) -> str:
+        lines = []
+        previous = None
+        for index in selected:
+            turn_index, sentence = sentences[index]
+            if previous is not None and index != previous + 1:
+                lines.append(GAP_MARKER)
+            if previous is not None and index == previous + 1 and sentences[previous][0] == turn_index:
+                lines[-1] = f"{lines[-1]} {sentence}"
+            else:
+                speaker = turns[turn_index][0]
+                lines.append(f"{speaker}: {sentence}" if speaker else sentence)
+            previous = index
+        return "\n".join(lines)
+
+    def stats(self) -> dict:
+        return {
+            "transcripts": self.transcripts,
+            "original_tokens": self.original_tokens,
+            "sent_tokens": self.sent_tokens,
+            "saved_tokens": self.original_tokens - self.sent_tokens,
+            "dropped_sentences": self.dropped_sentences,
+            "dropped_relevant_sentences": self.dropped_relevant,
+            "saved_ratio": round(1 - self.sent_tokens / self.original_tokens, 4) if self.original_tokens else 0.0,
+        }
@@ -0,0 +1,321 @@
+import os
+import re
+import html
+import time
+import codecs
+import asyncio
+import logging
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterator, List, Optional
+
+from multipart.multipart import MultipartParser, parse_options_header
+
+from .metrics import TRANSCRIPT_UPLOAD_BYTES, TRANSCRIPT_UPLOAD_SECONDS
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPLOAD_FORMATS = ("txt", "vtt", "srt")
+MB = 1024 * 1024
+
+# "00:01:02,500 --> 00:01:04,000" (SRT) or "01:02.500 --> 01:04.000 align:start" (WebVTT)
+TIMING_RE = re.compile(r"^\s*(?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3}\s*-->\s*(?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3}")
+CUE_NUMBER_RE = re.compile(r"^\s*\d+\s*$")
+# WebVTT voice span: <v Roger Bingham> or <v.loud Roger>
+VOICE_RE = re.compile(r"<v(?:\.[\w.-]+)*\s+([^>]+)>")
+# Markup tags, inline cue timestamps (<00:00:01.000>) and SSA overrides ({\an8})
+TAG_RE = re.compile(r"<[^>]*>|\{\\[^}]*\}")
+VTT_BLOCKS = ("NOTE", "STYLE", "REGION")
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+class UnsupportedUploadError(ValueError):
+    pass
+
+
+class CaptionStripper:
+    """
+    Incremental caption-to-transcript conversion: feed decoded text as it
+    arrives and get back plain transcript lines.
+
+    For .vtt and .srt the WEBVTT header, NOTE/STYLE/REGION blocks, cue
+    numbers and identifiers, timing lines and markup are dropped. Each cue
+    becomes one line, tagged "Speaker: ..." when it has a voice span and the
+    speaker changed. A cue repeating the previous one (rolling captions) is
+    skipped. Plain .txt passes through unchanged.
+    """
+
+    def __init__(self, upload_format: str):
+        self.upload_format = upload_format
+        self._buffer = ""
+        self._first_line = True
+        self._skipping_block = False
+        self._in_cue = False
+        # A line before a timing line is a cue identifier, so it is held until the next line
+        self._held: Optional[str] = None
+        self._cue: List[str] = []
+        self._last_text: Optional[str] = None
+        self._last_speaker: Optional[str] = None
+
+    def feed(self, text: str) -> str:
+        if self.upload_format == "txt":
+            return text
+        lines = (self._buffer + text).split("\n")
+        self._buffer = lines.pop()
+        return "".join(self._line(line.rstrip("\r")) for line in lines)
+
+    def close(self) -> str:
+        out = self._line(self._buffer.rstrip("\r")) if self._buffer else ""
+        self._buffer = ""
+        return out + self._end_block()
+
+    def _line(self, line: str) -> str:
+        if self._first_line:
+            self._first_line = False
+            if line.startswith("WEBVTT"):
+                self._skipping_block = True
+                return ""
+
+        if not line.strip():
+            return self._end_block()
+        if self._skipping_block:
+            return ""
+
+        if TIMING_RE.match(line):
+            # Also closes a cue that was not followed by a blank line
+            out = self._flush_cue()
+            self._held = None
+            self._in_cue = True
+            return out
+        if self._in_cue:
+            self._cue.append(line)
+            return ""
+        if self.upload_format == "vtt" and line.split(" ", 1)[0] in VTT_BLOCKS:
+            self._skipping_block = True
+            return ""
+
+        # Text outside a cue: the previous held line was not a cue identifier after all
+        out = self._emit_held()
+        self._held = line
+        return out
+
+    def _end_block(self) -> str:
+        out = self._flush_cue() + self._emit_held()
+        self._in_cue = False
+        self._skipping_block = False
+        return out
+
+    def _emit_held(self) -> str:
+        held, self._held = self._held, None
+        if held is None or CUE_NUMBER_RE.match(held):
+            return ""
+        return self._emit(None, held)
+
+    def _flush_cue(self) -> str:
+        if not self._cue:
+            return ""
+        text = " ".join(self._cue)
+        self._cue = []
+        voice = VOICE_RE.search(text)
+        return self._emit(voice.group(1).strip() if voice else None, text)
+
+    def _emit(self, speaker: Optional[str], text: str) -> str:
+        text = " ".join(html.unescape(TAG_RE.sub("", text)).split())
+        if not text or text == self._last_text:
+            return ""
+        self._last_text = text
+        if speaker and speaker != self._last_speaker:
+            self._last_speaker = speaker
+            return f"{speaker}: {text}\n"
+        return text + "\n"
+
+
+class UploadedTranscript:
+    """A received transcript and what it took to ingest it"""
+
+    __slots__ = ("text", "filename", "upload_format", "use_cache", "received_bytes", "text_bytes", "seconds")
+
+    def __init__(
+        self, text: str, filename: str, upload_format: str, use_cache: bool,
+        received_bytes: int, text_bytes: int, seconds: float
+    ):
+        self.text = text
+        self.filename = filename
+        self.upload_format = upload_format
+        self.use_cache = use_cache
+        self.received_bytes = received_bytes
+        self.text_bytes = text_bytes
+        self.seconds = seconds
+
+    def stats(self) -> dict:
+        megabytes = self.received_bytes / MB
+        return {
+            "filename": self.filename,
+            "format": self.upload_format,
+            "received_bytes": self.received_bytes,
+            "text_bytes": self.text_bytes,
+            "ingest_seconds": round(self.seconds, 4),
+            "ms_per_mb": round(self.seconds * 1000 / megabytes, 2) if megabytes else 0.0,
+            "mb_per_second": round(megabytes / self.seconds, 2) if self.seconds else 0.0,
+        }
+
+
+class TranscriptUploadReceiver:
+    """
+    Streams a multipart transcript upload (a `file` part and an optional
+    `use_cache` field) through the caption stripper into a spooled temp
+    file: at most `spool_bytes` of cleaned text is held in memory while the
+    body arrives, the rest goes to disk, and the body is rejected once it
+    passes `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = 10 * MB, spool_bytes: int = MB):
+        self.max_bytes = max_bytes
+        self.spool_bytes = spool_bytes
+
+    @classmethod
+    def from_env(cls) -> "TranscriptUploadReceiver":
+        return cls(
+            max_bytes=int(os.getenv("TRANSCRIPT_UPLOAD_MAX_BYTES", str(10 * MB))),
+            spool_bytes=int(os.getenv("TRANSCRIPT_UPLOAD_SPOOL_BYTES", str(MB))),
+        )
+
+    async def receive(self, chunks: AsyncIterator[bytes], content_type: str, content_length: Optional[int] = None) -> UploadedTranscript:
+        if content_length is not None and content_length > self.max_bytes:
+            raise UploadTooLargeError(f"Upload exceeds the {self.max_bytes / MB:.3g} MB limit")
+        _, params = parse_options_header(content_type or "")
+        boundary = params.get(b"boundary")
+        if not boundary:
+            raise ValueError("Expected a multipart/form-data upload")
+
+        started = time.perf_counter()
+        spool = SpooledTemporaryFile(max_size=self.spool_bytes)
+        try:
+            state = _UploadState()
+            parser = MultipartParser(boundary, state.callbacks())
+            received = 0
+            async for chunk in chunks:
+                received += len(chunk)
+                if received > self.max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds the {self.max_bytes / MB:.3g} MB limit")
+                parser.write(chunk)
+                await _write(spool, state.take_output())
+            parser.finalize()
+            state.finish()
+            await _write(spool, state.take_output())
+
+            if state.filename is None:
+                raise ValueError("No transcript file in the upload (expected a `file` field)")
+            text_bytes = spool.tell()
+            spool.seek(0)
+            text = (await asyncio.to_thread(spool.read) if spool._rolled else spool.read()).decode("utf-8")
+        finally:
+            spool.close()
+
+        upload = UploadedTranscript(
+            text, state.filename, state.upload_format, state.use_cache, received, text_bytes, time.perf_counter() - started
+        )
+        TRANSCRIPT_UPLOAD_BYTES.inc("received", amount=received)
+        TRANSCRIPT_UPLOAD_BYTES.inc("text", amount=text_bytes)
+        TRANSCRIPT_UPLOAD_SECONDS.observe(upload.seconds)
+        stats = upload.stats()
+        logger.info(
+            f"Received {upload.filename} ({received} bytes, {text_bytes} bytes of text) in {upload.seconds:.3f}s "
+            f"({stats['ms_per_mb']} ms/MB)"
+        )
+        return upload
+
+
+async def _write(spool: SpooledTemporaryFile, data: bytes):
+    if not data:
+        return
+    # Once spooled to disk, writes go through a thread so the event loop never blocks on I/O
+    if spool._rolled:
+        await asyncio.to_thread(spool.write, data)
+    else:
+        spool.write(data)
+
+
+class _UploadState:
+    """multipart callbacks: the file part goes through the stripper, small fields are collected"""
+
+    def __init__(self):
+        self.filename: Optional[str] = None
+        self.upload_format: Optional[str] = None
+        self.use_cache = True
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._field: Optional[str] = None
+        self._field_data = b""
+        self._decoder = None
+        self._stripper: Optional[CaptionStripper] = None
+        self._output: List[str] = []
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self._part_begin,
+            "on_part_data": self._part_data,
+            "on_part_end": self._part_end,
+            "on_header_field": self._header_field,
+            "on_header_value": self._header_data,
+            "on_header_end": self._header_end,
+            "on_headers_finished": self._headers_finished,
+        }
+
+    def take_output(self) -> bytes:
+        output, self._output = self._output, []
+        return "".join(output).encode("utf-8")
+
+    def finish(self):
+        if self._stripper:
+            self._output.append(self._stripper.close())
+            self._stripper = None
+
+    def _part_begin(self):
+        self._disposition = b""
+        self._field = None
+        self._field_data = b""
+
+    def _header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def _header_data(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _header_end(self):
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _headers_finished(self):
+        _, options = parse_options_header(self._disposition)
+        self._field = options.get(b"name", b"").decode("utf-8", "replace")
+        if self._field != "file":
+            return
+        if self.filename is not None:
+            raise ValueError("Upload one transcript file at a time")
+        self.filename = options.get(b"filename", b"transcript.txt").decode("utf-8", "replace")
+        extension = self.filename.rsplit(".", 1)[-1].lower() if "." in self.filename else ""
+        if extension not in UPLOAD_FORMATS:
+            raise UnsupportedUploadError("Unsupported file type; upload a .txt, .vtt or .srt transcript")
+        self.upload_format = extension
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        self._stripper = CaptionStripper(extension)
+
+    def _part_data(self, data: bytes, start: int, end: int):
+        if self._field == "file":
+            self._output.append(self._stripper.feed(self._decoder.decode(data[start:end])))
+        elif len(self._field_data) < 1024:
+            self._field_data += data[start:end]
+
+    def _part_end(self):
+        if self._field == "file":
+            self._output.append(self._stripper.feed(self._decoder.decode(b"", final=True)))
+        elif self._field == "use_cache":
+            self.use_cache = self._field_data.decode("utf-8", "replace").strip().lower() not in ("false", "0", "no")
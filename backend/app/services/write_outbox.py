@@ -0,0 +1,370 @@
+import os
+import json
+import time
+import random
+import sqlite3
+import asyncio
+import logging
+import threading
+from itertools import islice
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .metrics import OUTBOX_BATCH_ROWS, OUTBOX_FLUSH_SECONDS, OUTBOX_FLUSHED_ROWS
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class OutboxStore:
+    """SQLite log of rows not yet written to storage; every commit is fsync'd"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            # WAL defaults to NORMAL, which can lose the last commits on power loss
+            self._db.execute("PRAGMA synchronous=FULL")
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL,
+                    row TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    parked INTEGER NOT NULL DEFAULT 0,
+                    enqueued_at REAL NOT NULL,
+                    last_error TEXT
+                );
+            """)
+            self._db.commit()
+
+    def append(self, rows: List[dict]) -> List[int]:
+        """Log rows in one transaction; returns their sequence numbers"""
+        now = time.time()
+        with self._lock:
+            seqs = [
+                self._db.execute(
+                    "INSERT INTO outbox (id, row, enqueued_at) VALUES (?, ?, ?)",
+                    (row["id"], json.dumps(row), now),
+                ).lastrowid
+                for row in rows
+            ]
+            self._db.commit()
+        return seqs
+
+    def load(self) -> List[sqlite3.Row]:
+        """Every logged row, oldest first; parked rows get a fresh set of attempts"""
+        with self._lock:
+            self._db.execute("UPDATE outbox SET parked = 0, attempts = 0 WHERE parked = 1")
+            rows = self._db.execute("SELECT seq, row, attempts, enqueued_at FROM outbox ORDER BY seq").fetchall()
+            self._db.commit()
+        return rows
+
+    def delete(self, seqs: List[int]):
+        with self._lock:
+            self._db.executemany("DELETE FROM outbox WHERE seq = ?", [(seq,) for seq in seqs])
+            self._db.commit()
+
+    def update(self, rows: Dict[int, dict]):
+        """Replace logged rows (seq -> row) in one transaction"""
+        with self._lock:
+            self._db.executemany(
+                "UPDATE outbox SET row = ? WHERE seq = ?",
+                [(json.dumps(row), seq) for seq, row in rows.items()],
+            )
+            self._db.commit()
+
+    def record_failure(self, seqs: List[int], error: str, parked: bool = False):
+        with self._lock:
+            self._db.executemany(
+                "UPDATE outbox SET attempts = attempts + 1, last_error = ?, parked = ? WHERE seq = ?",
+                [(error, int(parked), seq) for seq in seqs],
+            )
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class _Entry:
+    __slots__ = ("row", "attempts", "enqueued_at")
+
+    def __init__(self, row: dict, attempts: int, enqueued_at: float):
+        self.row = row
+        self.attempts = attempts
+        self.enqueued_at = enqueued_at
+
+
+class WriteOutbox:
+    """
+    Write-behind queue for new action items.
+
+    `append` makes rows durable in a local SQLite log and returns; a single
+    background flusher groups whatever is pending, from any number of
+    requests, into bulk upserts and removes rows from the log once they are
+    stored. Upserts skip ids that already exist, so a row replayed after a
+    crash between the upsert and the log delete is harmless.
+
+    Updates and deletes of a row still queued are applied to the log itself
+    (`patch`, `replace`, `discard`), never raced against an in-flight flush.
+
+    A failed flush is retried with jittered exponential backoff and half the
+    batch size, down to single rows; a row that still fails after
+    `max_attempts` is parked (kept in the log, not retried) until the next
+    start, when every logged row is replayed.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/write_outbox.db",
+        batch_size: int = 500,
+        linger: float = 0.02,
+        max_attempts: int = 20,
+        max_backoff: float = 30.0,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+        self.store: Optional[OutboxStore] = None
+        self._write: Optional[Callable[[List[dict]], Awaitable[None]]] = None
+
+        # seq -> entry, oldest first; ids map to their newest seq
+        self._pending: Dict[int, _Entry] = {}
+        self._parked: Dict[int, _Entry] = {}
+        self._seq_by_id: Dict[str, int] = {}
+        # Held for a whole flush attempt, so `discard`, `patch` and `replace` never race an in-flight upsert
+        self._flush_lock = asyncio.Lock()
+        self._flushed = asyncio.Condition()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # Stats
+        self.flushed_rows = 0
+        self.failed_flushes = 0
+        self.last_error: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["WriteOutbox"]:
+        if os.getenv("WRITE_OUTBOX_ENABLED", "true").lower() != "true":
+            return None
+        return cls(
+            path=os.getenv("WRITE_OUTBOX_PATH", "data/write_outbox.db"),
+            batch_size=int(os.getenv("WRITE_OUTBOX_BATCH_SIZE", "500")),
+            linger=float(os.getenv("WRITE_OUTBOX_LINGER_MS", "20")) / 1000,
+            max_attempts=int(os.getenv("WRITE_OUTBOX_MAX_ATTEMPTS", "20")),
+        )
+
+    async def open(self, write: Callable[[List[dict]], Awaitable[None]]):
+        """Replay the log and start flushing through `write` (a bulk upsert)"""
+        self._write = write
+        self.store = await asyncio.to_thread(OutboxStore, self.path)
+        for logged in await asyncio.to_thread(self.store.load):
+            self._add(logged["seq"], _Entry(json.loads(logged["row"]), logged["attempts"], logged["enqueued_at"]))
+        if self._pending:
+            logger.info(f"Replaying {len(self._pending)} action items from the write outbox")
+            self._wakeup.set()
+        self._task = asyncio.create_task(self._run(), name="write-outbox-flusher")
+
+    async def close(self, timeout: float = 5.0):
+        """Give pending rows a last chance to flush, then stop; anything left is replayed next start"""
+        if self._task is None:
+            return
+        await self.wait_flushed(timeout=timeout)
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if self._pending or self._parked:
+            logger.warning(f"{len(self._pending) + len(self._parked)} action items left in the write outbox")
+        self.store.close()
+
+    def _add(self, seq: int, entry: _Entry):
+        self._pending[seq] = entry
+        self._seq_by_id[entry.row["id"]] = seq
+
+    def _forget(self, seq: int, entry: _Entry):
+        if self._seq_by_id.get(entry.row["id"]) == seq:
+            del self._seq_by_id[entry.row["id"]]
+
+    async def append(self, rows: List[dict]):
+        """Durably queue rows for storage; returns once they are on disk"""
+        seqs = await asyncio.to_thread(self.store.append, rows)
+        now = time.time()
+        for seq, row in zip(seqs, rows):
+            self._add(seq, _Entry(row, 0, now))
+        self._wakeup.set()
+
+    def pending_row(self, item_id: str) -> Optional[dict]:
+        """The queued row for an id not yet in storage"""
+        seq = self._seq_by_id.get(item_id)
+        if seq is None:
+            return None
+        entry = self._pending.get(seq) or self._parked.get(seq)
+        return entry.row if entry else None
+
+    def pending_rows(self) -> List[dict]:
+        """Every queued row, parked ones included"""
+        return [entry.row for entry in list(self._pending.values()) + list(self._parked.values())]
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    @property
+    def parked_count(self) -> int:
+        return len(self._parked)
+
+    def oldest_pending_seconds(self) -> float:
+        oldest = next(iter(self._pending.values()), None)
+        return time.time() - oldest.enqueued_at if oldest else 0.0
+
+    async def wait_flushed(self, ids: Optional[Iterable[str]] = None, timeout: float = 1.0) -> bool:
+        """
+        Wait until the given ids (default: everything pending now) are stored.
+        Parked rows are not waited for. Returns False on timeout.
+        """
+        if ids is None:
+            if not self._pending:
+                return True
+            last = next(reversed(self._pending))
+            done = lambda: not self._pending or next(iter(self._pending)) > last
+        else:
+            ids = list(ids)
+            done = lambda: not any(self._seq_by_id.get(item_id) in self._pending for item_id in ids)
+        if done():
+            return True
+        try:
+            async with self._flushed:
+                await asyncio.wait_for(self._flushed.wait_for(done), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def discard(self, ids: Iterable[str]) -> List[dict]:
+        """Drop queued rows (e.g. the item was deleted before it was stored); returns the rows dropped"""
+        async with self._flush_lock:
+            seqs = [self._seq_by_id[item_id] for item_id in ids if item_id in self._seq_by_id]
+            if not seqs:
+                return []
+            await asyncio.to_thread(self.store.delete, seqs)
+            dropped = []
+            for seq in seqs:
+                entry = self._pending.pop(seq, None) or self._parked.pop(seq)
+                self._forget(seq, entry)
+                dropped.append(entry.row)
+        await self._notify()
+        return dropped
+
+    async def patch(self, ids: Iterable[str], updates: dict) -> List[Tuple[dict, dict]]:
+        """
+        Apply an update to queued rows, in the log and in memory, so the
+        flusher stores the updated row; ids not queued are left to storage
+
+        Returns:
+            List of (row before, row after) for each patched id
+        """
+        return await self._rewrite({item_id: lambda row: dict(row, **updates) for item_id in ids})
+
+    async def replace(self, rows: List[dict]) -> List[Tuple[dict, dict]]:
+        """Swap queued rows for new versions with the same ids; like `patch`, rows not queued are left to storage"""
+        return await self._rewrite({row["id"]: lambda _, row=row: row for row in rows})
+
+    async def _rewrite(self, changes: Dict[str, Callable[[dict], dict]]) -> List[Tuple[dict, dict]]:
+        async with self._flush_lock:
+            entries: Dict[int, _Entry] = {}
+            for item_id in changes:
+                seq = self._seq_by_id.get(item_id)
+                if seq is not None:
+                    entries[seq] = self._pending.get(seq) or self._parked[seq]
+            if not entries:
+                return []
+            rewritten = {seq: changes[entry.row["id"]](entry.row) for seq, entry in entries.items()}
+            await asyncio.to_thread(self.store.update, rewritten)
+            result = []
+            for seq, entry in entries.items():
+                result.append((entry.row, rewritten[seq]))
+                entry.row = rewritten[seq]
+        return result
+
+    def paused(self) -> asyncio.Lock:
+        """Lock that keeps the flusher from moving rows to storage while held"""
+        return self._flush_lock
+
+    async def _notify(self):
+        async with self._flushed:
+            self._flushed.notify_all()
+
+    async def _run(self):
+        limit = self.batch_size
+        failures = 0
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                # Let concurrent requests join this batch
+                await asyncio.sleep(self.linger)
+
+            async with self._flush_lock:
+                batch = list(islice(self._pending.items(), limit))
+                if not batch:
+                    continue
+                rows = [entry.row for _, entry in batch]
+                seqs = [seq for seq, _ in batch]
+                started = time.perf_counter()
+                try:
+                    await self._write(rows)
+                except Exception as e:
+                    OUTBOX_FLUSH_SECONDS.observe(time.perf_counter() - started, "error")
+                    failures += 1
+                    self.failed_flushes += 1
+                    self.last_error = str(e)
+                    # A lone row that keeps failing is set aside so it cannot block the rest
+                    park = len(batch) == 1 and batch[0][1].attempts + 1 >= self.max_attempts
+                    try:
+                        await asyncio.to_thread(self.store.record_failure, seqs, str(e), park)
+                    except Exception as log_error:
+                        logger.error(f"❌ Failed to record write outbox failure: {log_error}")
+                    for seq, entry in batch:
+                        entry.attempts += 1
+                    if park:
+                        self._parked[seqs[0]] = self._pending.pop(seqs[0])
+                        logger.error(f"❌ Parked action item {rows[0]['id']} after {self.max_attempts} failed writes: {e}")
+                    else:
+                        logger.warning(f"Write outbox flush of {len(rows)} rows failed (attempt {failures}): {e}")
+                    limit = max(1, limit // 2)
+                else:
+                    OUTBOX_FLUSH_SECONDS.observe(time.perf_counter() - started, "ok")
+                    OUTBOX_BATCH_ROWS.observe(len(rows))
+                    OUTBOX_FLUSHED_ROWS.inc(amount=len(rows))
+                    failures = 0
+                    limit = min(self.batch_size, limit * 2)
+                    self.flushed_rows += len(rows)
+                    try:
+                        await asyncio.to_thread(self.store.delete, seqs)
+                    except Exception as e:
+                        # Stored already; a replay of these rows is a no-op
+                        logger.error(f"❌ Failed to remove flushed rows from the write outbox: {e}")
+                    for seq, entry in batch:
+                        del self._pending[seq]
+                        self._forget(seq, entry)
+
+            await self._notify()
+            if failures:
+                await asyncio.sleep(random.uniform(0, min(self.max_backoff, 0.1 * 2 ** failures)))
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "parked": len(self._parked),
+            "oldest_pending_seconds": round(self.oldest_pending_seconds(), 3),
+            "flushed_rows": self.flushed_rows,
+            "failed_flushes": self.failed_flushes,
+            "last_error": self.last_error,
+        }
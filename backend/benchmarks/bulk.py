@@ -0,0 +1,86 @@
+"""
+Bulk import and export throughput against a running API, in rows per second.
+
+Imports `rows` generated action items as one streamed NDJSON upload, then
+streams the full export in both formats and counts the rows received.
+
+Run against an already running server with:
+    python -m benchmarks.bulk --base-url http://127.0.0.1:8000 --rows 20000
+(`python -m benchmarks.run` includes it.)
+"""
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from typing import AsyncIterator, Dict
+
+import httpx
+import orjson
+
+from .load import WORDS
+
+CHUNK_ROWS = 500
+
+
+async def generated_rows(rows: int) -> AsyncIterator[bytes]:
+    """The upload body, produced in chunks as it is sent"""
+    for start in range(0, rows, CHUNK_ROWS):
+        yield b"".join(
+            orjson.dumps({
+                "id": str(uuid.uuid4()),
+                # Shared words plus unique ones: with only the small shared vocabulary every
+                # row would land in the same near-duplicate buckets, unlike real items
+                "text": f"{' '.join(random.choices(WORDS, k=4))} {uuid.uuid4().hex[:8]} {uuid.uuid4().hex[:8]} #{start + offset}",
+                "priority": random.choice(["high", "medium", "low"]),
+            }) + b"\n"
+            for offset in range(min(CHUNK_ROWS, rows - start))
+        )
+
+
+async def run(base_url: str, rows: int = 5000) -> Dict[str, dict]:
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+        started = time.perf_counter()
+        response = await client.post(
+            "/api/action-items/import", content=generated_rows(rows), headers={"Content-Type": "application/x-ndjson"}
+        )
+        elapsed = time.perf_counter() - started
+        response.raise_for_status()
+        summary = response.json()
+        results[f"import ndjson[{rows} rows]"] = {
+            "rows": summary["imported"],
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(summary["rows"] / elapsed, 1),
+            "server_rows_per_second": summary["rows_per_second"],
+        }
+
+        for export_format in ("ndjson", "csv"):
+            started = time.perf_counter()
+            received = 0
+            async with client.stream("GET", "/api/action-items/export", params={"format": export_format}) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    received += chunk.count(b"\n")
+            elapsed = time.perf_counter() - started
+            # The CSV header line is not a row
+            received -= export_format == "csv"
+            results[f"export {export_format}"] = {
+                "rows": received,
+                "seconds": round(elapsed, 3),
+                "rows_per_second": round(received / elapsed, 1),
+            }
+    return results
+
+
+def print_results(results: Dict[str, dict]):
+    for name, result in results.items():
+        print(f"  {name:<28} {result['rows']:>8} rows  {result['seconds']:>8.2f} s  {result['rows_per_second']:>10.1f} rows/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import/export throughput")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rows", type=int, default=5000, help="rows to import")
+    args = parser.parse_args()
+    print_results(asyncio.run(run(args.base_url, args.rows)))
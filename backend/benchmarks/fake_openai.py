@@ -0,0 +1,161 @@
+"""
+Local stand-in for the OpenAI chat completions API.
+
+Returns one action item per sentence of the transcript in the user message,
+with configurable latency, streaming and injected 429s. Output longer than
+`max_tokens` (~4 chars per token) is cut off with finish_reason "length", and
+models can be made slower or made to answer with broken output:
+
+    FAKE_OPENAI_LATENCY_MS=300      # time before the response (or first chunk)
+    FAKE_OPENAI_CHUNK_DELAY_MS=5    # delay between streamed chunks
+    FAKE_OPENAI_429_RATE=0.0        # fraction of requests answered with 429
+    FAKE_OPENAI_MAX_ITEMS=10        # action items per response
+    FAKE_OPENAI_MODEL_LATENCY_MS=gpt-4o=400            # extra latency per model
+    FAKE_OPENAI_BAD_OUTPUT_RATE=gpt-4o-mini=0.1        # fraction of truncated / non-JSON answers per model
+
+Run with: python -m benchmarks.fake_openai --port 8101
+"""
+import os
+import re
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+LATENCY = float(os.getenv("FAKE_OPENAI_LATENCY_MS", "300")) / 1000
+CHUNK_DELAY = float(os.getenv("FAKE_OPENAI_CHUNK_DELAY_MS", "5")) / 1000
+RATE_LIMIT_RATE = float(os.getenv("FAKE_OPENAI_429_RATE", "0"))
+MAX_ITEMS = int(os.getenv("FAKE_OPENAI_MAX_ITEMS", "10"))
+PRIORITIES = ["high", "medium", "low"]
+
+
+def per_model(name: str) -> dict:
+    """"gpt-4o-mini=0.1,gpt-4o=0" -> {"gpt-4o-mini": 0.1, "gpt-4o": 0.0}"""
+    pairs = (entry.split("=", 1) for entry in os.getenv(name, "").split(",") if "=" in entry)
+    return {model.strip(): float(value) for model, value in pairs}
+
+
+MODEL_LATENCY = {model: ms / 1000 for model, ms in per_model("FAKE_OPENAI_MODEL_LATENCY_MS").items()}
+BAD_OUTPUT_RATE = per_model("FAKE_OPENAI_BAD_OUTPUT_RATE")
+
+app = FastAPI(title="Fake OpenAI")
+counters = {"requests": 0, "rate_limited": 0, "streamed": 0, "bad_output": 0, "by_model": {}}
+
+
+def action_items_for(prompt: str) -> str:
+    transcript = prompt.split("\n\n", 1)[-1]
+    sentences = [s.strip() for s in re.split(r"[.!?\n]+", transcript) if len(s.strip()) > 3]
+    items = [
+        {"text": sentence, "priority": PRIORITIES[index % len(PRIORITIES)]}
+        for index, sentence in enumerate(sentences[:MAX_ITEMS])
+    ]
+    return json.dumps(items)
+
+
+def answer_for(body: dict, prompt: str):
+    """(content, finish_reason) for a request, honouring max_tokens and the model's bad-output rate"""
+    content = action_items_for(prompt)
+    max_chars = body.get("max_tokens", 4096) * 4
+    if random.random() < BAD_OUTPUT_RATE.get(body.get("model"), 0):
+        counters["bad_output"] += 1
+        if random.random() < 0.5:
+            # Cut off mid-array, as if the output budget ran out
+            max_chars = len(content) // 2
+        else:
+            return f"Here are the action items I found: {content[1:-1]}", "stop"
+    if len(content) > max_chars:
+        return content[:max_chars], "length"
+    return content, "stop"
+
+
+def usage_for(prompt: str, content: str) -> dict:
+    prompt_tokens = len(prompt) // 4
+    completion_tokens = len(content) // 4
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+
+
+@app.get("/v1/models/{model}")
+async def retrieve_model(model: str):
+    return {"id": model, "object": "model", "created": 0, "owned_by": "fake"}
+
+
+@app.get("/stats")
+async def stats():
+    return counters
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    counters["requests"] += 1
+    model = body.get("model")
+    counters["by_model"][model] = counters["by_model"].get(model, 0) + 1
+    await asyncio.sleep(LATENCY + MODEL_LATENCY.get(model, 0))
+
+    if RATE_LIMIT_RATE and random.random() < RATE_LIMIT_RATE:
+        counters["rate_limited"] += 1
+        return JSONResponse(
+            status_code=429,
+            headers={"retry-after": "0.2"},
+            content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+        )
+
+    prompt = body["messages"][-1]["content"]
+    content, finish_reason = answer_for(body, prompt)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+
+    if not body.get("stream"):
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": finish_reason}],
+            "usage": usage_for(prompt, content),
+        }
+
+    counters["streamed"] += 1
+
+    async def chunks():
+        for start in range(0, len(content), 24):
+            delta = {"content": content[start:start + 24]}
+            if start == 0:
+                delta["role"] = "assistant"
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": body.get("model"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(CHUNK_DELAY)
+        done = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": body.get("model"),
+            "choices": [{"index": 0, "delta": {}, "finish_reason": finish_reason}],
+        }
+        yield f"data: {json.dumps(done)}\n\n"
+        if (body.get("stream_options") or {}).get("include_usage"):
+            usage = dict(done, choices=[], usage=usage_for(prompt, content))
+            yield f"data: {json.dumps(usage)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(chunks(), media_type="text/event-stream")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake OpenAI chat completions server")
+    parser.add_argument("--port", type=int, default=8101)
+    args = parser.parse_args()
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
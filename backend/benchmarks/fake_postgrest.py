@@ -0,0 +1,201 @@
+"""
+Local stand-in for the Supabase PostgREST `action_items` endpoints.
+
+Keeps rows in memory and understands the subset of PostgREST the app uses:
+`eq` / `lt` / `gt` / `in` / `ilike` filters, `or=(...)` / `and(...)` groups,
+`order`, `limit` and `select`, plus POST / PATCH / DELETE with
+`return=representation`, POST upserts (`resolution=merge-duplicates` or
+`ignore-duplicates`) and the `action_item_counts` RPC.
+
+    FAKE_POSTGREST_LATENCY_MS=2     # added to every request
+    FAKE_POSTGREST_SEED=1000        # rows created at startup
+    FAKE_POSTGREST_MAX_ROWS=1000    # cap on rows per read, like PostgREST's max-rows
+
+Run with: python -m benchmarks.fake_postgrest --port 8102
+"""
+import os
+import re
+import uuid
+import random
+import asyncio
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY = float(os.getenv("FAKE_POSTGREST_LATENCY_MS", "2")) / 1000
+SEED = int(os.getenv("FAKE_POSTGREST_SEED", "1000"))
+MAX_ROWS = int(os.getenv("FAKE_POSTGREST_MAX_ROWS", "1000"))
+RESERVED = {"order", "limit", "offset", "select", "on_conflict"}
+WORDS = "prepare review send update schedule draft finalize share the Q4 report budget roadmap deck client notes".split()
+
+app = FastAPI(title="Fake PostgREST")
+rows: List[dict] = []
+
+
+def seed(count: int):
+    base = datetime.utcnow() - timedelta(days=30)
+    for index in range(count):
+        created = (base + timedelta(seconds=index * 30)).isoformat()
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "text": " ".join(random.choices(WORDS, k=8)),
+            "status": random.choice(["pending", "completed"]),
+            "priority": random.choice(["high", "medium", "low"]),
+            "created_at": created,
+            "updated_at": created,
+        })
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return value
+
+
+def _split_top_level(expression: str) -> List[str]:
+    parts, depth, quoted, current = [], 0, False, ""
+    for index, char in enumerate(expression):
+        if char == '"' and (index == 0 or expression[index - 1] != "\\"):
+            quoted = not quoted
+        if not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == "," and depth == 0 and not quoted:
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    parts.append(current)
+    return parts
+
+
+def _condition(column: str, expression: str) -> Callable[[dict], bool]:
+    operator, _, value = expression.partition(".")
+    if operator == "in":
+        values = {_unquote(v) for v in _split_top_level(value.strip("()"))}
+        return lambda row: row.get(column) in values
+    value = _unquote(value)
+    if operator == "eq":
+        return lambda row: (row.get(column) or "") == value
+    if operator == "lt":
+        return lambda row: (row.get(column) or "") < value
+    if operator == "gt":
+        return lambda row: (row.get(column) or "") > value
+    if operator == "ilike":
+        needle = value.strip("*").replace("\\%", "%").replace("\\_", "_").replace("\\\\", "\\").lower()
+        return lambda row: needle in (row.get(column) or "").lower()
+    raise ValueError(f"Unsupported operator: {operator}")
+
+
+def _logical(expression: str) -> Callable[[dict], bool]:
+    match = re.match(r"^(or|and)\((.*)\)$", expression)
+    if match:
+        parts = [_logical(part) for part in _split_top_level(match.group(2))]
+        if match.group(1) == "or":
+            return lambda row: any(part(row) for part in parts)
+        return lambda row: all(part(row) for part in parts)
+    column, _, rest = expression.partition(".")
+    return _condition(column, rest)
+
+
+def _filter(params) -> Callable[[dict], bool]:
+    """Compile the filter query parameters once into a row predicate"""
+    predicates = []
+    for key, value in params.multi_items():
+        if key in RESERVED:
+            continue
+        if key in ("or", "and"):
+            predicates.append(_logical(f"{key}{value}"))
+        else:
+            predicates.append(_condition(key, value))
+    return lambda row: all(predicate(row) for predicate in predicates)
+
+
+def _select(selected: List[dict], params) -> List[dict]:
+    columns = params.get("select")
+    if not columns or columns == "*":
+        return selected
+    names = columns.split(",")
+    return [{name: row.get(name) for name in names} for row in selected]
+
+
+@app.get("/rest/v1/action_items")
+async def list_rows(request: Request):
+    await asyncio.sleep(LATENCY)
+    params = request.query_params
+    matches = _filter(params)
+    selected = [row for row in rows if matches(row)]
+    if "order" in params:
+        for part in reversed(params["order"].split(",")):
+            column, _, direction = part.partition(".")
+            selected.sort(key=lambda row: row.get(column) or "", reverse=direction == "desc")
+    limit = min(int(params["limit"]), MAX_ROWS) if "limit" in params else MAX_ROWS
+    return _select(selected[:limit], params)
+
+
+@app.post("/rest/v1/action_items", status_code=201)
+async def insert_rows(request: Request):
+    await asyncio.sleep(LATENCY)
+    body = await request.json()
+    new_rows = body if isinstance(body, list) else [body]
+    prefer = request.headers.get("prefer", "")
+    ids = {row["id"] for row in rows}
+    for row in new_rows:
+        if row["id"] in ids:
+            if "ignore-duplicates" in prefer:
+                continue
+            if "merge-duplicates" not in prefer:
+                return JSONResponse(status_code=409, content={"code": "23505", "message": "duplicate key value"})
+            rows[:] = [existing for existing in rows if existing["id"] != row["id"]]
+        rows.append(dict(row))
+        ids.add(row["id"])
+    return new_rows
+
+
+@app.patch("/rest/v1/action_items")
+async def update_rows(request: Request):
+    await asyncio.sleep(LATENCY)
+    updates = await request.json()
+    params = request.query_params
+    matches = _filter(params)
+    selected = [row for row in rows if matches(row)]
+    for row in selected:
+        row.update(updates)
+    return _select(selected, params)
+
+
+@app.delete("/rest/v1/action_items")
+async def delete_rows(request: Request):
+    await asyncio.sleep(LATENCY)
+    params = request.query_params
+    matches = _filter(params)
+    selected = [row for row in rows if matches(row)]
+    ids = {row["id"] for row in selected}
+    rows[:] = [row for row in rows if row["id"] not in ids]
+    return _select(selected, params)
+
+
+@app.post("/rest/v1/rpc/action_item_counts")
+async def action_item_counts():
+    await asyncio.sleep(LATENCY)
+    counts = Counter((row["status"], row["priority"], row["created_at"][:10]) for row in rows)
+    return [
+        {"status": status, "priority": priority, "day": day, "count": count}
+        for (status, priority, day), count in counts.items()
+    ]
+
+
+seed(SEED)
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake PostgREST server for action_items")
+    parser.add_argument("--port", type=int, default=8102)
+    args = parser.parse_args()
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,185 @@
+"""
+Load driver: fires requests at every endpoint of a running API and reports
+latency percentiles and throughput per endpoint.
+
+Run against an already running server with:
+    python -m benchmarks.load --base-url http://127.0.0.1:8000
+(`python -m benchmarks.run` starts the server and its fake dependencies for you.)
+"""
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+WORDS = "prepare review send update schedule draft finalize share report budget roadmap deck client notes hiring launch".split()
+
+
+def transcript(sentences: int = 5) -> str:
+    """A unique transcript whose sentences are unlikely to be near-duplicates of each other"""
+    lines = []
+    for _ in range(sentences):
+        speaker = random.choice(["Alice", "Bob", "Carol", "Dan"])
+        lines.append(f"{speaker}: {' '.join(random.sample(WORDS, 4))} {uuid.uuid4().hex[:8]} {uuid.uuid4().hex[:8]}.")
+    return "\n".join(lines)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Scenario:
+    """One endpoint under load; `call` performs a single request and returns the response"""
+
+    def __init__(self, name: str, call: Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]], ok=(200,)):
+        self.name = name
+        self.call = call
+        self.ok = ok
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    counter = iter(range(requests))
+
+    async def worker():
+        for index in counter:
+            start = time.perf_counter()
+            try:
+                response = await scenario.call(client, index)
+                await response.aread()
+                if response.status_code not in scenario.ok:
+                    errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+            except Exception as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+    }
+
+
+async def _create_items(client: httpx.AsyncClient, count: int) -> List[str]:
+    """Create items through the analyze endpoint (works with any storage backend)"""
+    ids: List[str] = []
+    while len(ids) < count:
+        response = await client.post("/api/transcripts/analyze", json={"transcript": transcript(10), "use_cache": False})
+        response.raise_for_status()
+        ids.extend(item["id"] for item in response.json()["action_items"])
+    return ids[:count]
+
+
+async def build_scenarios(client: httpx.AsyncClient, requests: int) -> List[Scenario]:
+    """Seed the data the item scenarios need and return every scenario"""
+    item_ids = await _create_items(client, 200)
+    delete_ids = await _create_items(client, requests)
+    bulk_delete_ids = await _create_items(client, requests * 5)
+    job = (await client.post("/api/batch-jobs", json={"transcripts": [transcript(3)]})).json()["job"]
+    duplicate_transcripts = [transcript() for _ in range(requests // 4 + 1)]
+
+    def get(path: str, **params):
+        return lambda c, i: c.get(path, params=params or None)
+
+    def analyze(c, i):
+        return c.post("/api/transcripts/analyze", json={"transcript": transcript(), "use_cache": False})
+
+    def analyze_cached(c, i):
+        return c.post("/api/transcripts/analyze", json={"transcript": "Alice: send the Q4 report by Friday. Bob: review the roadmap deck."})
+
+    def analyze_duplicates(c, i):
+        # Consecutive requests go out together, so groups of four send the same transcript at once
+        return c.post("/api/transcripts/analyze", json={"transcript": duplicate_transcripts[i // 4], "use_cache": False})
+
+    def analyze_stream(c, i):
+        return c.post("/api/transcripts/analyze/stream", json={"transcript": transcript(), "use_cache": False})
+
+    def upload(c, i):
+        cues = "".join(f"{n}\n00:00:{n:02d},000 --> 00:00:{n + 1:02d},000\n{line}\n\n" for n, line in enumerate(transcript().split("\n"), 1))
+        return c.post("/api/transcripts/upload", files={"file": ("meeting.srt", cues.encode(), "text/plain")}, data={"use_cache": "false"})
+
+    def put_item(c, i):
+        return c.put(f"/api/action-items/{random.choice(item_ids)}", json={"status": random.choice(["pending", "completed"])})
+
+    def bulk_update(c, i):
+        return c.post("/api/action-items/bulk-update", json={"ids": random.sample(item_ids, 50), "patch": {"priority": random.choice(["high", "low"])}})
+
+    def delete_item(c, i):
+        return c.delete(f"/api/action-items/{delete_ids[i]}")
+
+    def bulk_delete(c, i):
+        return c.post("/api/action-items/bulk-delete", json={"ids": bulk_delete_ids[i * 5:(i + 1) * 5]})
+
+    return [
+        Scenario("GET /", get("/")),
+        Scenario("GET /api/health", get("/api/health")),
+        Scenario("GET /api/health/live", get("/api/health/live")),
+        Scenario("GET /api/health/ready", get("/api/health/ready"), ok=(200, 503)),
+        Scenario("GET /api/llm/stats", get("/api/llm/stats")),
+        Scenario("GET /metrics", get("/metrics")),
+        Scenario("POST /api/transcripts/analyze", analyze),
+        Scenario("POST /api/transcripts/analyze (cached)", analyze_cached),
+        Scenario("POST /api/transcripts/analyze (concurrent duplicates)", analyze_duplicates),
+        Scenario("POST /api/transcripts/analyze/stream", analyze_stream),
+        Scenario("POST /api/transcripts/upload (.srt)", upload),
+        Scenario("POST /api/batch-jobs", lambda c, i: c.post("/api/batch-jobs", json={"transcripts": [transcript(3)]}), ok=(202,)),
+        Scenario("GET /api/batch-jobs", get("/api/batch-jobs")),
+        Scenario("GET /api/batch-jobs/{job_id}", get(f"/api/batch-jobs/{job['job_id']}")),
+        Scenario("GET /api/action-items", get("/api/action-items")),
+        Scenario("GET /api/action-items?limit=50", get("/api/action-items", limit=50)),
+        Scenario("GET /api/action-items?status&sort_by=priority", get("/api/action-items", status="pending", sort_by="priority", limit=50)),
+        Scenario("GET /api/action-items/stats", get("/api/action-items/stats")),
+        Scenario("GET /api/action-items/search", get("/api/action-items/search", q="rep* budget")),
+        Scenario("GET /api/action-items/{item_id}", lambda c, i: c.get(f"/api/action-items/{random.choice(item_ids)}")),
+        Scenario("PUT /api/action-items/{item_id}", put_item),
+        Scenario("POST /api/action-items/bulk-update", bulk_update),
+        Scenario("DELETE /api/action-items/{item_id}", delete_item),
+        Scenario("POST /api/action-items/bulk-delete", bulk_delete),
+    ]
+
+
+async def run(base_url: str, requests: int = 200, concurrency: int = 16, only: Optional[str] = None) -> Dict[str, dict]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        scenarios = await build_scenarios(client, requests)
+        results = {}
+        for scenario in scenarios:
+            if only and only not in scenario.name:
+                continue
+            results[scenario.name] = await run_scenario(client, scenario, requests, concurrency)
+            print_result(scenario.name, results[scenario.name])
+        return results
+
+
+def print_result(name: str, result: dict):
+    errors = f"  errors {result['errors']}" if result["errors"] else ""
+    print(
+        f"  {name:<52} {result['rps']:>9.1f} req/s  p50 {result['p50_ms']:>8.2f}  "
+        f"p95 {result['p95_ms']:>8.2f}  p99 {result['p99_ms']:>8.2f} ms{errors}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test every API endpoint")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--only", help="only run scenarios whose name contains this text")
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.requests, args.concurrency, args.only))
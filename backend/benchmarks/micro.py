@@ -0,0 +1,98 @@
+"""
+Micro-benchmarks for the CPU-bound hot paths.
+
+Run with: python -m benchmarks.micro
+"""
+import json
+import time
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+
+from app.services.llm_service import parse_action_items, merge_action_items
+from app.services.database_service import DatabaseService
+from app.services.stream_parser import JSONArrayStreamParser
+from app.services.metrics import Histogram
+
+WORDS = "prepare review send update schedule draft finalize share the Q4 report budget roadmap deck client notes by Friday".split()
+
+
+def _items(count: int) -> list:
+    rng = random.Random(count)
+    return [
+        {"text": " ".join(rng.choices(WORDS, k=10)), "priority": rng.choice(["high", "medium", "low"])}
+        for _ in range(count)
+    ]
+
+
+def _rows(count: int) -> list:
+    base = datetime(2024, 1, 1)
+    return [
+        {
+            "id": f"00000000-0000-0000-0000-{index:012d}",
+            "text": item["text"],
+            "status": "pending",
+            "priority": item["priority"],
+            "created_at": (base + timedelta(seconds=index)).isoformat() + "+00:00",
+            "updated_at": (base + timedelta(seconds=index)).isoformat() + "+00:00",
+        }
+        for index, item in enumerate(_items(count))
+    ]
+
+
+def measure(func: Callable[[], object], min_time: float = 0.5, clock: Callable[[], float] = time.perf_counter) -> Dict[str, float]:
+    """
+    Run `func` repeatedly for at least `min_time` seconds; per-call timings in
+    microseconds of `clock` (wall time by default, time.process_time for CPU)
+    """
+    func()  # warm-up
+    timings = []
+    deadline = time.perf_counter() + min_time
+    while time.perf_counter() < deadline or len(timings) < 5:
+        start = clock()
+        func()
+        timings.append((clock() - start) * 1e6)
+    timings.sort()
+    return {
+        "calls": len(timings),
+        "mean_us": round(sum(timings) / len(timings), 2),
+        "p50_us": round(timings[len(timings) // 2], 2),
+        "p95_us": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+    }
+
+
+def run(min_time: float = 0.5) -> Dict[str, dict]:
+    content = json.dumps(_items(10))
+    fenced = f"Here you go:\n```json\n{content}\n```"
+    rows = _rows(500)
+    groups = [[item for item in parse_action_items(json.dumps(_items(15)))] for _ in range(4)]
+    pieces = [content[start:start + 24] for start in range(0, len(content), 24)]
+
+    histogram = Histogram("benchmark_seconds", "Micro-benchmark histogram", ["operation", "outcome"])
+
+    def stream_parse():
+        parser = JSONArrayStreamParser()
+        for piece in pieces:
+            parser.feed(piece)
+
+    cases = {
+        "parse_action_items[10 items]": lambda: parse_action_items(content),
+        "parse_action_items[10 items, fenced]": lambda: parse_action_items(fenced),
+        "stream_parser[10 items]": stream_parse,
+        "row_to_action_item[500 rows]": lambda: [DatabaseService._row_to_action_item(row) for row in rows],
+        "merge_action_items[4x15 items]": lambda: merge_action_items(groups),
+        "histogram.observe[2 labels]": lambda: histogram.observe(0.0042, "select", "ok"),
+    }
+    return {name: measure(func, min_time) for name, func in cases.items()}
+
+
+def print_results(results: Dict[str, dict]):
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        print(f"  {name:<{width}}  mean {result['mean_us']:>10.2f} us  p50 {result['p50_us']:>10.2f} us  p95 {result['p95_us']:>10.2f} us")
+
+
+if __name__ == "__main__":
+    logging.getLogger("app").setLevel(logging.ERROR)
+    print_results(run())
@@ -0,0 +1,134 @@
+"""
+Transcript pre-filter: token savings and recall on the fixture corpus.
+
+benchmarks/fixtures/transcripts.json holds meeting transcripts with the
+action items a full-transcript extraction should return. Offline, recall is
+the share of those items whose sentence survives the filter, at the default
+token budget and at tighter ones. With --live, both the full transcript and
+the filtered one are sent through the configured OpenAI endpoint (the
+OPENAI_* environment) and recall is the share of full-transcript items also
+extracted from the filtered text.
+
+Run with: python -m benchmarks.prefilter [--live] [--min-recall 0.95]
+"""
+import re
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+from app.services.transcript_filter import TranscriptFilter
+
+from .micro import measure
+
+FIXTURES = Path(__file__).parent / "fixtures" / "transcripts.json"
+BUDGETS = [3000, 120, 80]
+ITEM_SIMILARITY = 0.5
+
+
+def load_fixtures() -> List[dict]:
+    return json.loads(FIXTURES.read_text())
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).lower()
+
+
+def _words(text: str) -> frozenset:
+    return frozenset(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def _matched(item: str, candidates: List[str]) -> bool:
+    words = _words(item)
+    for candidate in candidates:
+        other = _words(candidate)
+        if words | other and len(words & other) / len(words | other) >= ITEM_SIMILARITY:
+            return True
+    return False
+
+
+def run(min_time: float = 0.3) -> Dict[str, dict]:
+    fixtures = load_fixtures()
+    results = {}
+    for budget in BUDGETS:
+        # Fixture transcripts are short; min_tokens=0 filters them anyway
+        prefilter = TranscriptFilter(token_budget=budget, min_tokens=0)
+        expected = found = 0
+        for fixture in fixtures:
+            text = _normalize(prefilter.filter(fixture["transcript"]).text)
+            expected += len(fixture["action_items"])
+            found += sum(_normalize(item) in text for item in fixture["action_items"])
+        stats = prefilter.stats()
+        results[f"budget {budget} tokens[{len(fixtures)} transcripts]"] = {
+            "recall": round(found / expected, 4),
+            "original_tokens": stats["original_tokens"],
+            "sent_tokens": stats["sent_tokens"],
+            "saved_ratio": stats["saved_ratio"],
+        }
+
+    # CPU cost on one long transcript (the whole corpus back to back)
+    long_transcript = "\n\n".join(fixture["transcript"] for fixture in fixtures)
+    prefilter = TranscriptFilter(min_tokens=0)
+    result = measure(lambda: prefilter.filter(long_transcript), min_time, clock=time.process_time)
+    results[f"filter cpu[{len(long_transcript)} chars]"] = {"mean_us": result["mean_us"], "p95_us": result["p95_us"]}
+    return results
+
+
+async def run_live() -> Dict[str, float]:
+    """Full vs filtered extraction through the real (or configured) OpenAI endpoint"""
+    from app.services.llm_service import LLMService
+
+    service = LLMService()
+    prefilter = TranscriptFilter(min_tokens=0)
+    expected = found = 0
+    for fixture in load_fixtures():
+        full = await service._extract_from_text(fixture["transcript"])
+        filtered = await service._extract_from_text(prefilter.filter(fixture["transcript"]).text)
+        filtered_texts = [item.text for item in filtered]
+        missed = [item.text for item in full if not _matched(item.text, filtered_texts)]
+        expected += len(full)
+        found += len(full) - len(missed)
+        for text in missed:
+            print(f"  missed in {fixture['name']}: {text}")
+    stats = prefilter.stats()
+    return {"recall": round(found / expected, 4) if expected else 1.0, "saved_ratio": stats["saved_ratio"]}
+
+
+def print_results(results: Dict[str, dict]):
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        if "recall" in result:
+            print(
+                f"  {name:<{width}}  recall {result['recall']:>6.1%}  tokens {result['original_tokens']:>5} -> "
+                f"{result['sent_tokens']:>5}  saved {result['saved_ratio']:>6.1%}"
+            )
+        else:
+            print(f"  {name:<{width}}  cpu {result['mean_us'] / 1000:>8.2f} ms  p95 {result['p95_us'] / 1000:>8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcript pre-filter recall and token savings")
+    parser.add_argument("--live", action="store_true", help="also compare full vs filtered extraction via OpenAI")
+    parser.add_argument("--min-recall", type=float, default=0.95, help="fail if recall at the default budget is lower")
+    args = parser.parse_args()
+    logging.getLogger("app").setLevel(logging.ERROR)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    results = run()
+    print_results(results)
+    recall = next(iter(results.values()))["recall"]
+    if args.live:
+        live = asyncio.run(run_live())
+        print(f"  live extraction: recall {live['recall']:.1%} of full-transcript items, saved {live['saved_ratio']:.1%} tokens")
+        recall = min(recall, live["recall"])
+    if recall < args.min_recall:
+        print(f"Recall {recall:.1%} is below {args.min_recall:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
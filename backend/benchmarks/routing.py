@@ -0,0 +1,104 @@
+"""
+Model routing: latency, calls and escalation rate of the cheap-first cascade
+against sending everything to a single model.
+
+Runs LLMService in-process against a fake OpenAI server whose cheap model
+sometimes answers with truncated or non-JSON output and whose strong model
+is slower, e.g. one started with
+
+    FAKE_OPENAI_LATENCY_MS=300 FAKE_OPENAI_MODEL_LATENCY_MS=gpt-4o=300 \\
+    FAKE_OPENAI_BAD_OUTPUT_RATE=gpt-4o-mini=0.1 python -m benchmarks.fake_openai --port 8101
+
+and then: python -m benchmarks.routing --openai-base-url http://127.0.0.1:8101/v1
+(`python -m benchmarks.run` starts such a server and includes it.)
+"""
+import os
+import time
+import random
+import asyncio
+import logging
+import argparse
+from typing import Dict, List
+
+from app.services.llm_scheduler import LLMScheduler
+from app.services.llm_service import LLMService
+from app.services.model_router import ModelRouter, parse_tiers
+
+from .load import percentile, transcript
+
+CONFIGS = {
+    "cascade": "gpt-4o-mini,gpt-4o",
+    "cheap only": "gpt-4o-mini",
+    "strong only": "gpt-4o",
+}
+
+
+async def run_config(tiers: str, transcripts: List[str], concurrency: int) -> dict:
+    service = LLMService()
+    service.router = ModelRouter(parse_tiers(tiers))
+    service.scheduler = LLMScheduler(requests_per_minute=1000000, tokens_per_minute=1000000000, max_concurrency=concurrency)
+    latencies: List[float] = []
+    failures = 0
+    items = 0
+    pending = iter(transcripts)
+
+    async def worker():
+        nonlocal failures, items
+        for text in pending:
+            started = time.perf_counter()
+            try:
+                extracted = await service.extract_action_items(text, use_cache=False)
+                items += len(extracted)
+            except Exception:
+                failures += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    await service.client.close()
+    latencies.sort()
+    routing = service.router.stats()
+    calls = sum(tier["calls"] for tier in routing["tiers"])
+    return {
+        "extractions": len(transcripts),
+        "failures": failures,
+        "items_per_extraction": round(items / len(transcripts), 2),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "calls_per_extraction": round(calls / len(transcripts), 3),
+        "escalation_rate": routing["escalation_rate"],
+        "strong_model_share": round(routing["tiers"][-1]["calls"] / calls, 3) if len(routing["tiers"]) > 1 and calls else None,
+        "completion_tokens": {tier["model"]: tier["completion_tokens"] for tier in routing["tiers"]},
+    }
+
+
+def run(openai_base_url: str, requests: int = 200, concurrency: int = 16) -> Dict[str, dict]:
+    os.environ["OPENAI_BASE_URL"] = openai_base_url
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ["EXTRACTION_CACHE_ENABLED"] = "false"
+    # "cheap only" fails on every broken answer by design; those errors are counted, not logged
+    logging.getLogger("app.services.llm_service").setLevel(logging.CRITICAL)
+    random.seed(7)
+    # Mixed sizes, so extractions land in several routing bands
+    transcripts = [transcript(random.choice([3, 10, 40, 80])) for _ in range(requests)]
+    return {name: asyncio.run(run_config(tiers, transcripts, concurrency)) for name, tiers in CONFIGS.items()}
+
+
+def print_results(results: Dict[str, dict]):
+    for name, result in results.items():
+        share = f"  strong {result['strong_model_share']:>5.1%}" if result["strong_model_share"] is not None else ""
+        print(
+            f"  {name:<12} p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f} ms  "
+            f"{result['calls_per_extraction']:>5.2f} calls/extraction  escalated {result['escalation_rate']:>5.1%}  "
+            f"failed {result['failures']:>4}  {result['items_per_extraction']:>5.2f} items{share}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cheap-first model cascade vs single-model routing")
+    parser.add_argument("--openai-base-url", default="http://127.0.0.1:8101/v1")
+    parser.add_argument("--requests", type=int, default=200, help="extractions per routing config")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    logging.getLogger("app").setLevel(logging.ERROR)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    print_results(run(args.openai_base_url, args.requests, args.concurrency))
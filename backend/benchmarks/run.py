@@ -0,0 +1,232 @@
+"""
+Benchmark runner: starts the fake OpenAI and PostgREST servers and the API,
+runs the micro-benchmarks, the serialization, transcript pre-filter and
+upload ingestion benchmarks, the load driver, the bulk import/export and the
+model routing benchmarks, saves the results under benchmarks/results/
+and compares them with the previous run.
+
+Run from the backend directory:
+    python -m benchmarks.run
+    python -m benchmarks.run --storage sqlite --requests 500 --concurrency 32
+    python -m benchmarks.run --compare benchmarks/results/<earlier run>.json
+"""
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from . import bulk, load, micro, prefilter, routing, serialization, startup, upload
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return None
+
+
+def start(module: str, port: int, env: dict, log_path: Path) -> subprocess.Popen:
+    log = open(log_path, "w")
+    if module == "app.main":
+        command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    else:
+        command = [sys.executable, "-m", module, "--port", str(port)]
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_until_up(url: str, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], metrics: List[str]):
+    """Print the relative change of each metric against a previous run"""
+    for name, result in current.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        changes = []
+        for metric in metrics:
+            if previous.get(metric):
+                change = (result[metric] - previous[metric]) / previous[metric] * 100
+                changes.append(f"{metric} {change:+6.1f}%")
+        print(f"  {name:<52} " + "  ".join(changes))
+
+
+def latest_result(exclude: Optional[Path] = None) -> Optional[Path]:
+    runs = sorted(path for path in RESULTS_DIR.glob("*.json") if path != exclude)
+    return runs[-1] if runs else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the micro-benchmarks and the API load test against local fakes")
+    parser.add_argument("--storage", choices=["supabase", "sqlite"], default="supabase",
+                        help="supabase uses the fake PostgREST server; sqlite the embedded backend")
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--only", help="only run load scenarios whose name contains this text")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-load", action="store_true")
+    parser.add_argument("--openai-latency-ms", type=float, default=300)
+    parser.add_argument("--openai-429-rate", type=float, default=0.0)
+    parser.add_argument("--postgrest-latency-ms", type=float, default=2)
+    parser.add_argument("--seed-rows", type=int, default=1000, help="rows preloaded into the fake PostgREST")
+    parser.add_argument("--bulk-rows", type=int, default=5000, help="rows imported by the bulk import/export benchmark")
+    parser.add_argument("--routing-requests", type=int, default=200, help="extractions per config in the model routing benchmark")
+    parser.add_argument("--cheap-model-bad-output-rate", type=float, default=0.1,
+                        help="fraction of truncated / non-JSON answers from the cheap model in the routing benchmark")
+    parser.add_argument("--startup-workers", default="1,2,4", help="worker counts for the cold start benchmark")
+    parser.add_argument("--label", default="", help="free-form note stored with the results")
+    parser.add_argument("--compare", help="results file to compare against (default: the previous run)")
+    args = parser.parse_args()
+    # The app modules configure INFO logging on import; keep the driver's output readable
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(logging.ERROR)
+
+    result = {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "git_revision": git_revision(),
+        "label": args.label,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": vars(args),
+        "micro": {},
+        "serialization": {},
+        "prefilter": {},
+        "upload": {},
+        "load": {},
+        "bulk": {},
+        "routing": {},
+        "startup": {},
+    }
+
+    if not args.skip_micro:
+        print("Micro-benchmarks:")
+        result["micro"] = micro.run()
+        micro.print_results(result["micro"])
+        print(f"List response CPU per {serialization.ITEMS} items:")
+        result["serialization"] = serialization.run()
+        serialization.print_results(result["serialization"])
+        print("Transcript pre-filter (fixture corpus):")
+        result["prefilter"] = prefilter.run()
+        prefilter.print_results(result["prefilter"])
+        print("Transcript upload ingestion:")
+        result["upload"] = upload.run()
+        upload.print_results(result["upload"])
+
+    processes = []
+    workdir = Path(tempfile.mkdtemp(prefix="insightboard-bench-"))
+    try:
+        if not args.skip_load:
+            openai_port, postgrest_port, app_port = free_port(), free_port(), free_port()
+            env = dict(
+                os.environ,
+                FAKE_OPENAI_LATENCY_MS=str(args.openai_latency_ms),
+                FAKE_OPENAI_429_RATE=str(args.openai_429_rate),
+                FAKE_POSTGREST_LATENCY_MS=str(args.postgrest_latency_ms),
+                FAKE_POSTGREST_SEED=str(args.seed_rows),
+                OPENAI_API_KEY="benchmark",
+                OPENAI_BASE_URL=f"http://127.0.0.1:{openai_port}/v1",
+                SUPABASE_URL=f"http://127.0.0.1:{postgrest_port}",
+                SUPABASE_KEY="benchmark",
+                STORAGE_BACKEND=args.storage,
+                SQLITE_DB_PATH=str(workdir / "action_items.db"),
+                EXTRACTION_CACHE_PATH=str(workdir / "extraction_cache.db"),
+                BATCH_JOB_STORE_PATH=str(workdir / "batch_jobs.db"),
+                WRITE_OUTBOX_PATH=str(workdir / "write_outbox.db"),
+                LLM_RPM_LIMIT="100000",
+                LLM_TPM_LIMIT="100000000",
+            )
+            processes.append(start("benchmarks.fake_openai", openai_port, env, workdir / "fake_openai.log"))
+            processes.append(start("benchmarks.fake_postgrest", postgrest_port, env, workdir / "fake_postgrest.log"))
+            wait_until_up(f"http://127.0.0.1:{openai_port}/stats")
+            wait_until_up(f"http://127.0.0.1:{postgrest_port}/rest/v1/action_items?limit=1")
+            processes.append(start("app.main", app_port, env, workdir / "app.log"))
+            wait_until_up(f"http://127.0.0.1:{app_port}/api/health/live")
+
+            print(f"Load test ({args.requests} requests per endpoint, concurrency {args.concurrency}, storage {args.storage}):")
+            result["load"] = asyncio.run(load.run(f"http://127.0.0.1:{app_port}", args.requests, args.concurrency, args.only))
+            if not args.only:
+                print(f"Bulk import/export ({args.bulk_rows} rows imported):")
+                result["bulk"] = asyncio.run(bulk.run(f"http://127.0.0.1:{app_port}", args.bulk_rows))
+                bulk.print_results(result["bulk"])
+
+                # Its own fake: a flaky cheap model and a slower strong one, kept away from the load test
+                routing_port = free_port()
+                routing_env = dict(
+                    env,
+                    FAKE_OPENAI_429_RATE="0",
+                    FAKE_OPENAI_MODEL_LATENCY_MS=f"gpt-4o={args.openai_latency_ms}",
+                    FAKE_OPENAI_BAD_OUTPUT_RATE=f"gpt-4o-mini={args.cheap_model_bad_output_rate}",
+                )
+                processes.append(start("benchmarks.fake_openai", routing_port, routing_env, workdir / "fake_openai_routing.log"))
+                wait_until_up(f"http://127.0.0.1:{routing_port}/stats")
+                print(f"Model routing ({args.routing_requests} extractions per config, cheap model bad output rate {args.cheap_model_bad_output_rate}):")
+                result["routing"] = routing.run(f"http://127.0.0.1:{routing_port}/v1", args.routing_requests, args.concurrency)
+                routing.print_results(result["routing"])
+
+                worker_counts = [int(n) for n in args.startup_workers.split(",")]
+                print(f"Cold start to first request (app.serve, {args.startup_workers} workers, with and without warm-up):")
+                result["startup"] = startup.run(env, worker_counts, workdir)
+                startup.print_results(result["startup"])
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        print(f"Server logs: {workdir}")
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    path = RESULTS_DIR / f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-{result['git_revision'] or 'local'}.json"
+    path.write_text(json.dumps(result, indent=2))
+    print(f"Results saved to {path}")
+
+    baseline_path = Path(args.compare) if args.compare else latest_result(exclude=path)
+    if baseline_path and baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+        print(f"Compared with {baseline_path.name} ({baseline.get('git_revision')}, {baseline.get('label') or 'no label'}):")
+        compare(result["micro"], baseline.get("micro", {}), ["mean_us", "p95_us"])
+        compare(result["serialization"], baseline.get("serialization", {}), ["mean_us", "bytes"])
+        compare(result["prefilter"], baseline.get("prefilter", {}), ["recall", "saved_ratio", "mean_us"])
+        compare(result["upload"], baseline.get("upload", {}), ["ms_per_mb", "peak_mb"])
+        compare(result["load"], baseline.get("load", {}), ["rps", "p50_ms", "p95_ms", "p99_ms"])
+        compare(result["bulk"], baseline.get("bulk", {}), ["rows_per_second"])
+        compare(result["routing"], baseline.get("routing", {}), ["p50_ms", "p95_ms", "calls_per_extraction"])
+        compare(result["startup"], baseline.get("startup", {}), ["live_ms", "first_request_ms", "first_analysis_ms", "ready_ms", "drain_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+CPU cost of turning stored rows into a list response, per 10k items.
+
+"before" is the previous pipeline: every row re-validated through ActionItem,
+then FastAPI validating and serializing the list again through
+ActionItemsResponse and encoding it with the stdlib json module. "after" is
+the trusted-row fast path encoded with orjson, as objects and as columns, and
+the cost and size of compressing that body.
+
+Run with: python -m benchmarks.serialization
+"""
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models import ActionItem, ActionItemsResponse
+from app.services.database_service import DatabaseService
+from app.services.responses import CompressionMiddleware, columnar, dumps, field_dicts
+
+from .micro import measure
+
+ITEMS = 10_000
+
+
+def _rows(count: int) -> list:
+    base = datetime(2024, 1, 1)
+    return [
+        {
+            "id": f"00000000-0000-0000-0000-{index:012d}",
+            "text": f"Prepare the Q{index % 4 + 1} report and share it with the client by Friday ({index})",
+            "status": ("pending", "completed")[index % 2],
+            "priority": ("high", "medium", "low")[index % 3],
+            "created_at": (base + timedelta(seconds=index)).isoformat() + ".123456+00:00",
+            "updated_at": (base + timedelta(seconds=index, minutes=5)).isoformat() + ".654321+00:00",
+        }
+        for index in range(count)
+    ]
+
+
+def _validated_row(row: dict) -> ActionItem:
+    """The row conversion used before the trusted-row fast path"""
+    return ActionItem(
+        id=row["id"],
+        text=row["text"],
+        status=row["status"],
+        priority=row["priority"],
+        createdAt=datetime.fromisoformat(row["created_at"].replace('Z', '+00:00')),
+        updatedAt=datetime.fromisoformat(row["updated_at"].replace('Z', '+00:00')) if row.get("updated_at") else None
+    )
+
+
+def run(min_time: float = 1.0) -> Dict[str, dict]:
+    rows = _rows(ITEMS)
+    loop = asyncio.new_event_loop()
+    field = create_response_field(name="response", type_=ActionItemsResponse)
+    compression = CompressionMiddleware(None)
+
+    def before():
+        items = [_validated_row(row) for row in rows]
+        response = ActionItemsResponse(success=True, action_items=items, total_count=len(items))
+        content = loop.run_until_complete(serialize_response(field=field, response_content=response, is_coroutine=True))
+        return JSONResponse(content).body
+
+    def after():
+        items = [DatabaseService._row_to_action_item(row) for row in rows]
+        return dumps({"success": True, "action_items": field_dicts(items), "total_count": len(items), "next_cursor": None})
+
+    def after_columnar():
+        items = [DatabaseService._row_to_action_item(row) for row in rows]
+        return dumps({"success": True, "format": "columnar", "columns": columnar(items), "total_count": len(items), "next_cursor": None})
+
+    body = after()
+    columnar_body = after_columnar()
+    cases = {
+        f"before: validate + FastAPI serialize[{ITEMS} items]": (before, None),
+        f"after: trusted rows + orjson[{ITEMS} items]": (after, None),
+        f"after: trusted rows + orjson, columnar[{ITEMS} items]": (after_columnar, None),
+        f"gzip[{ITEMS} items]": (lambda: compression._compress(body, "gzip"), body),
+        f"gzip, columnar[{ITEMS} items]": (lambda: compression._compress(columnar_body, "gzip"), columnar_body),
+    }
+    if compression.brotli:
+        cases[f"brotli[{ITEMS} items]"] = (lambda: compression._compress(body, "br"), body)
+        cases[f"brotli, columnar[{ITEMS} items]"] = (lambda: compression._compress(columnar_body, "br"), columnar_body)
+
+    results = {}
+    try:
+        for name, (func, source) in cases.items():
+            result = measure(func, min_time, clock=time.process_time)
+            output = func()
+            result["bytes"] = len(output)
+            if source is not None:
+                result["ratio"] = round(len(source) / len(output), 2)
+            results[name] = result
+    finally:
+        loop.close()
+    return results
+
+
+def print_results(results: Dict[str, dict]):
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        ratio = f"  ratio {result['ratio']:>5.2f}x" if "ratio" in result else ""
+        print(f"  {name:<{width}}  cpu {result['mean_us'] / 1000:>8.2f} ms  {result['bytes']:>9} bytes{ratio}")
+
+
+if __name__ == "__main__":
+    logging.getLogger("app").setLevel(logging.ERROR)
+    print_results(run())
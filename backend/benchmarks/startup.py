@@ -0,0 +1,203 @@
+"""
+Cold start: how long `python -m app.serve` takes from spawn to serving, per
+worker count, with services warmed up in the background (SERVICE_WARMUP=true)
+and built on first use (false).
+
+For each configuration the server is spawned and measured for:
+
+- live_ms: spawn to the first /api/health/live answer, i.e. accepting connections
+- first_request_ms: latency of the first GET /api/action-items sent right then,
+  which waits for the database service if it is not built yet
+- first_analysis_ms: latency of the first transcript analysis after that, which
+  pays for the OpenAI connection unless warm-up already opened it
+- ready_ms: spawn to the first 200 from /api/health/ready
+- per worker (from /api/health "worker", sampled over fresh connections until
+  every worker answered): when its lifespan started and when its services
+  were ready, counted from the worker process's start, and their init time
+- drain_ms: SIGTERM to exit with a live change stream open, which the drain
+  closes instead of waiting out GRACEFUL_SHUTDOWN_TIMEOUT
+
+Runs against whatever the environment points the app at, e.g. the fakes:
+
+    OPENAI_API_KEY=benchmark OPENAI_BASE_URL=http://127.0.0.1:8101/v1 \\
+    SUPABASE_URL=http://127.0.0.1:8102 SUPABASE_KEY=benchmark python -m benchmarks.startup
+
+(`python -m benchmarks.run` starts the fakes and includes it.)
+"""
+import os
+import sys
+import time
+import signal
+import socket
+import asyncio
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from .load import percentile, transcript
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+WORKER_COUNTS = [1, 2, 4]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def poll(client: httpx.AsyncClient, url: str, started: float, timeout: float = 60) -> float:
+    """ms from `started` until `url` answers 200"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get(url, timeout=2)).status_code == 200:
+                return (time.perf_counter() - started) * 1000
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.01)
+    raise RuntimeError(f"{url} did not answer 200 within {timeout}s")
+
+
+async def worker_stats(client: httpx.AsyncClient, base_url: str, workers: int, timeout: float = 5) -> List[dict]:
+    """/api/health "worker" of each worker process (connections are not reused, so they spread)"""
+    seen: Dict[int, dict] = {}
+    deadline = time.perf_counter() + timeout
+    while len(seen) < workers and time.perf_counter() < deadline:
+        responses = await asyncio.gather(
+            *(client.get(f"{base_url}/api/health") for _ in range(workers * 2)), return_exceptions=True
+        )
+        for response in responses:
+            if isinstance(response, httpx.Response) and response.status_code == 200:
+                worker = response.json()["worker"]
+                seen[worker["pid"]] = worker
+    return list(seen.values())
+
+
+async def measure(env: dict, workers: int, warm_up: bool, log_path: Path) -> dict:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server_env = dict(
+        env, HOST="127.0.0.1", PORT=str(port), WEB_CONCURRENCY=str(workers),
+        SERVICE_WARMUP="true" if warm_up else "false", GRACEFUL_SHUTDOWN_TIMEOUT="10",
+        # Measures start-up only, so per-worker state is fine here
+        ALLOW_PER_WORKER_STATE="true",
+    )
+    # No keep-alive: every request opens a connection, as a new client would
+    limits = httpx.Limits(max_keepalive_connections=0)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        with open(log_path, "w") as log:
+            started = time.perf_counter()
+            process = subprocess.Popen(
+                [sys.executable, "-m", "app.serve"], cwd=BACKEND_DIR, env=server_env, stdout=log, stderr=subprocess.STDOUT
+            )
+            try:
+                live_ms = await poll(client, f"{base_url}/api/health/live", started)
+                request_started = time.perf_counter()
+                response = await client.get(f"{base_url}/api/action-items", params={"limit": 20})
+                first_request_ms = (time.perf_counter() - request_started) * 1000
+                if response.status_code != 200:
+                    raise RuntimeError(f"first request failed with {response.status_code}: {response.text[:200]}")
+                request_started = time.perf_counter()
+                response = await client.post(
+                    f"{base_url}/api/transcripts/analyze", json={"transcript": transcript(3), "use_cache": False}
+                )
+                first_analysis_ms = (time.perf_counter() - request_started) * 1000
+                if response.status_code != 200:
+                    raise RuntimeError(f"first analysis failed with {response.status_code}: {response.text[:200]}")
+                ready_ms = await poll(client, f"{base_url}/api/health/ready", started)
+                stats = await worker_stats(client, base_url, workers)
+                drain_ms, stream_closed = await drain(client, base_url, process)
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+
+    database_ready = sorted(w["services"]["database"]["ready_after_ms"] for w in stats if w["services"]["database"]["ready_after_ms"] is not None)
+    return {
+        "workers": workers,
+        "warm_up": warm_up,
+        "live_ms": round(live_ms, 2),
+        "first_request_ms": round(first_request_ms, 2),
+        "first_analysis_ms": round(first_analysis_ms, 2),
+        "ready_ms": round(ready_ms, 2),
+        "drain_ms": round(drain_ms, 2),
+        "stream_closed_by_drain": stream_closed,
+        "workers_seen": len(stats),
+        # Worker process start to its database service being ready (warmed workers only when lazy)
+        "worker_database_ready_p50_ms": round(percentile(database_ready, 0.5), 2) if database_ready else None,
+        "worker_database_ready_max_ms": database_ready[-1] if database_ready else None,
+        "per_worker": [
+            {
+                "pid": w["pid"],
+                "lifespan_started_after_ms": w["lifespan_started_after_ms"],
+                **{
+                    f"{name}_{key}": service[key]
+                    for name, service in w["services"].items()
+                    for key in ("ready_after_ms", "init_ms")
+                },
+            }
+            for w in stats
+        ],
+    }
+
+
+async def drain(client: httpx.AsyncClient, base_url: str, process: subprocess.Popen) -> tuple:
+    """(ms from SIGTERM to exit, whether an open change stream was ended by the server)"""
+    stream_ended = asyncio.Event()
+
+    async def follow():
+        try:
+            async with client.stream("GET", f"{base_url}/api/action-items/changes/stream", timeout=None) as response:
+                async for _ in response.aiter_bytes():
+                    pass
+            stream_ended.set()
+        except httpx.HTTPError:
+            pass
+
+    follower = asyncio.create_task(follow())
+    await asyncio.sleep(0.3)
+    started = time.perf_counter()
+    process.send_signal(signal.SIGTERM)
+    while process.poll() is None:
+        await asyncio.sleep(0.01)
+    drain_ms = (time.perf_counter() - started) * 1000
+    follower.cancel()
+    await asyncio.gather(follower, return_exceptions=True)
+    return drain_ms, stream_ended.is_set()
+
+
+def run(env: Optional[dict] = None, worker_counts: List[int] = WORKER_COUNTS, workdir: Optional[Path] = None) -> Dict[str, dict]:
+    env = dict(os.environ if env is None else env)
+    workdir = workdir or Path(tempfile.mkdtemp(prefix="insightboard-startup-"))
+    results = {}
+    for workers in worker_counts:
+        for warm_up in (True, False):
+            mode = "warm-up" if warm_up else "lazy"
+            results[f"startup {workers}w {mode}"] = asyncio.run(
+                measure(env, workers, warm_up, workdir / f"startup-{workers}w-{mode}.log")
+            )
+    return results
+
+
+def print_results(results: Dict[str, dict]):
+    for name, result in results.items():
+        ready = result["worker_database_ready_max_ms"]
+        print(
+            f"  {name:<20} live {result['live_ms']:>7.1f}  first request {result['first_request_ms']:>7.1f}  "
+            f"first analysis {result['first_analysis_ms']:>7.1f}  "
+            f"ready {result['ready_ms']:>7.1f}  slowest worker db ready {ready if ready is not None else '-':>7}  "
+            f"drain {result['drain_ms']:>7.1f} ms  ({result['workers_seen']} workers seen"
+            f"{', stream closed' if result['stream_closed_by_drain'] else ''})"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold start to first request per worker count")
+    parser.add_argument("--workers", default=",".join(map(str, WORKER_COUNTS)), help="comma-separated worker counts")
+    args = parser.parse_args()
+    print_results(run(worker_counts=[int(n) for n in args.workers.split(",")]))
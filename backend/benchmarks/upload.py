@@ -0,0 +1,99 @@
+"""
+Transcript upload ingestion: time per MB and peak memory.
+
+Builds multipart bodies holding .txt, .vtt and .srt transcripts of a few
+sizes and streams them in 64 KB chunks (the size uvicorn typically hands
+over) through TranscriptUploadReceiver, the code behind
+/api/transcripts/upload: multipart parsing, caption stripping and the
+spooled temp file. Peak memory is traced with tracemalloc. While the body
+streams in it stays near the spool size; the peak is reached at the end, when
+the transcript is read back and decoded into the string handed to the
+analysis pipeline (about twice the text size).
+
+Run with: python -m benchmarks.upload
+"""
+import time
+import asyncio
+import logging
+import tracemalloc
+from typing import AsyncIterator, Dict
+
+from app.services.transcript_upload import MB, TranscriptUploadReceiver
+
+from .load import transcript
+
+SIZES_MB = [1, 8]
+CHUNK_BYTES = 64 * 1024
+BOUNDARY = "----benchmark-boundary"
+
+
+def caption_file(upload_format: str, size: int) -> bytes:
+    """A transcript of roughly `size` bytes in the given format"""
+    lines = ["WEBVTT", ""] if upload_format == "vtt" else []
+    cue = 0
+    total = 0
+    while total < size:
+        cue += 1
+        text = f"Speaker {cue % 4}: {transcript(2)}"
+        start, end = cue * 3, cue * 3 + 3
+        if upload_format == "txt":
+            block = [text]
+        elif upload_format == "srt":
+            block = [str(cue), f"00:{start // 60 % 60:02d}:{start % 60:02d},000 --> 00:{end // 60 % 60:02d}:{end % 60:02d},000", text, ""]
+        else:
+            block = [f"{start // 60 % 60:02d}:{start % 60:02d}.000 --> {end // 60 % 60:02d}:{end % 60:02d}.000", f"<v Speaker {cue % 4}>{text}", ""]
+        lines.extend(block)
+        total += sum(len(line) + 1 for line in block)
+    return "\n".join(lines).encode("utf-8")
+
+
+def multipart_body(filename: str, content: bytes) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: text/plain\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+async def chunked(body: bytes) -> AsyncIterator[bytes]:
+    for start in range(0, len(body), CHUNK_BYTES):
+        yield body[start:start + CHUNK_BYTES]
+
+
+async def ingest(receiver: TranscriptUploadReceiver, body: bytes) -> dict:
+    content_type = f"multipart/form-data; boundary={BOUNDARY}"
+    started = time.process_time()
+    upload = await receiver.receive(chunked(body), content_type)
+    cpu = time.process_time() - started
+    # Traced separately: tracemalloc slows allocation-heavy code several times over
+    tracemalloc.start()
+    await receiver.receive(chunked(body), content_type)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "ms_per_mb": round(cpu * 1000 / (len(body) / MB), 2),
+        "text_ratio": round(upload.text_bytes / len(body), 3),
+        "peak_mb": round(peak / MB, 2),
+    }
+
+
+def run() -> Dict[str, dict]:
+    receiver = TranscriptUploadReceiver(max_bytes=max(SIZES_MB) * 2 * MB)
+    results = {}
+    for upload_format in ("txt", "vtt", "srt"):
+        for size in SIZES_MB:
+            body = multipart_body(f"meeting.{upload_format}", caption_file(upload_format, size * MB))
+            results[f"upload {upload_format}[{size} MB]"] = asyncio.run(ingest(receiver, body))
+    return results
+
+
+def print_results(results: Dict[str, dict]):
+    for name, result in results.items():
+        print(
+            f"  {name:<24} {result['ms_per_mb']:>8.2f} ms/MB  text {result['text_ratio']:>6.1%} of upload  "
+            f"peak {result['peak_mb']:>6.2f} MB"
+        )
+
+
+if __name__ == "__main__":
+    logging.getLogger("app").setLevel(logging.ERROR)
+    print_results(run())
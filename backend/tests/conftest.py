@@ -0,0 +1,75 @@
+import json
+
+import httpx
+import pytest
+
+from app.services.database_service import DatabaseService
+from app.services.supabase_storage import SupabaseStorage
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def row(n: int, priority: str = "medium", status: str = "pending") -> dict:
+    """A stored action item row"""
+    return {
+        "id": f"item-{n:02d}", "text": f"Task {n}", "status": status, "priority": priority,
+        "created_at": f"2024-01-01T00:{n:02d}:00", "updated_at": None,
+    }
+
+
+@pytest.fixture
+def postgrest(monkeypatch):
+    """
+    DatabaseService on Supabase whose PostgREST answers each request with the next entry
+    of `responses` (JSON rows, or an httpx.Response) and records the query
+    parameters in `requests`
+    """
+    monkeypatch.setenv("SUPABASE_URL", "http://postgrest.test")
+    monkeypatch.setenv("SUPABASE_KEY", "test")
+    monkeypatch.setenv("WRITE_OUTBOX_ENABLED", "false")
+    storage = SupabaseStorage()
+    service = DatabaseService(storage)
+    service.requests, service.responses = [], []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        service.requests.append(dict(request.url.params))
+        response = service.responses.pop(0)
+        if isinstance(response, httpx.Response):
+            return response
+        return httpx.Response(200, content=json.dumps(response))
+
+    storage.client = httpx.AsyncClient(base_url="http://postgrest.test/rest/v1", transport=httpx.MockTransport(handle))
+    return service
+
+
+@pytest.fixture
+async def make_database(tmp_path, monkeypatch):
+    """
+    Builds connected DatabaseServices on embedded SQLite files under tmp_path;
+    a call with the same `name` reopens the same store (and write outbox).
+    All of them are closed at teardown (closing twice is harmless)
+    """
+    monkeypatch.setenv("STORAGE_BACKEND", "sqlite")
+    opened = []
+
+    async def make(name: str = "db", outbox: bool = False, duplicate_mode: str = "off") -> DatabaseService:
+        monkeypatch.setenv("SQLITE_DB_PATH", str(tmp_path / f"{name}.db"))
+        monkeypatch.setenv("WRITE_OUTBOX_ENABLED", "true" if outbox else "false")
+        monkeypatch.setenv("WRITE_OUTBOX_PATH", str(tmp_path / f"{name}_outbox.db"))
+        monkeypatch.setenv("DUPLICATE_MODE", duplicate_mode)
+        db_service = DatabaseService()
+        await db_service.connect()
+        opened.append(db_service)
+        return db_service
+
+    yield make
+    for db_service in opened:
+        await db_service.close()
+
+
+@pytest.fixture
+async def database(make_database):
+    return await make_database()
@@ -0,0 +1,109 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.models import ActionItem
+from app.services.action_item_cache import ActionItemCache, encoded_etag, etag_matches
+
+from .conftest import row
+
+
+def item(n: int) -> ActionItem:
+    return ActionItem(id=f"item-{n}", text=f"Task {n}")
+
+
+def test_write_drops_pages_and_refreshes_items():
+    cache = ActionItemCache()
+    etag = cache.set_page("page", [item(1), item(2)], None, cache.version)
+    assert cache.get_page("page")[2] == etag
+
+    cache.record_write(upserted=[item(1)], deleted=["item-2"])
+
+    assert cache.get_page("page") is None
+    assert cache.get_item("item-1")[1] != etag
+    assert cache.get_item("item-2") is None
+
+
+def test_page_read_before_a_write_is_not_stored():
+    cache = ActionItemCache()
+    version = cache.version
+    cache.record_write(upserted=[item(1)])
+    assert cache.set_page("page", [item(1)], None, version) is None
+    assert cache.get_page("page") is None
+
+
+def test_entries_expire():
+    cache = ActionItemCache(ttl_seconds=0)
+    cache.set_page("page", [item(1)], None, cache.version)
+    assert cache.page_etag("page") is None
+
+
+def test_etag_matching():
+    assert etag_matches('"a-1-1"', '"a-1-1"')
+    assert etag_matches('"x", W/"a-1-1"', '"a-1-1"')
+    assert etag_matches("*", '"a-1-1"')
+    assert not etag_matches('"a-1-2"', '"a-1-1"')
+    assert not etag_matches(None, '"a-1-1"')
+
+
+@pytest.fixture
+def client(postgrest, monkeypatch):
+    monkeypatch.setattr(main.database, "instance", postgrest)
+    return TestClient(main.app)
+
+
+def test_list_answers_if_none_match_with_304(client, postgrest):
+    postgrest.responses = [[row(2), row(1)]]
+    first = client.get("/api/action-items", params={"limit": 10})
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    again = client.get("/api/action-items", params={"limit": 10}, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    # Answered from the cache
+    assert len(postgrest.requests) == 1
+
+    # Another query has its own ETag
+    postgrest.responses = [[row(2)]]
+    other = client.get("/api/action-items", params={"limit": 10, "status": "pending"}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+
+def test_write_changes_the_list_etag(client, postgrest):
+    postgrest.responses = [[row(2), row(1)]]
+    etag = client.get("/api/action-items").headers["ETag"]
+
+    # The current row (for the stats), then the updated one
+    postgrest.responses = [[row(1)], [dict(row(1), status="completed")]]
+    assert client.put("/api/action-items/item-01", json={"status": "completed"}).status_code == 200
+
+    postgrest.responses = [[row(2), dict(row(1), status="completed")]]
+    response = client.get("/api/action-items", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["action_items"][1]["status"] == "completed"
+
+
+def test_etag_with_encoding_suffix_matches():
+    etag = '"a-1-1"'
+    assert encoded_etag(etag, "gzip") == '"a-1-1-gz"'
+    assert encoded_etag('W/"a-1-1"', "br") == 'W/"a-1-1"'
+    assert etag_matches('"a-1-1-gz"', etag)
+    assert etag_matches('W/"a-1-1-br"', etag)
+
+
+def test_compressed_list_has_its_own_etag(client, postgrest):
+    postgrest.responses = [[dict(row(n), text="Long task text " * 10) for n in range(20, 0, -1)]]
+    plain = client.get("/api/action-items", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/api/action-items", headers={"Accept-Encoding": "gzip"})
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["ETag"] == encoded_etag(plain.headers["ETag"], "gzip")
+    assert compressed.json() == plain.json()
+
+    again = client.get(
+        "/api/action-items", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]}
+    )
+    assert again.status_code == 304
+    assert again.headers["ETag"] == compressed.headers["ETag"]
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.models import ActionItem
+from app.services.action_item_stats import ActionItemStats
+
+pytestmark = pytest.mark.anyio
+
+
+async def counted(database) -> dict:
+    """Snapshot of a fresh grouped count of the store"""
+    stats = ActionItemStats()
+    await stats.reconcile(database.storage.count_rows)
+    return stats.snapshot(days=1)
+
+
+def without_time(snapshot: dict) -> dict:
+    return {key: value for key, value in snapshot.items() if key != "last_reconciled"}
+
+
+async def test_writes_move_the_counters_by_their_delta(database):
+    await database.get_action_item_stats()
+    items = await database.create_multiple_action_items(
+        [ActionItem(text=f"Task {n}", priority=("high", "low")[n % 2]) for n in range(5)]
+    )
+    await database.update_action_item(items[0].id, {"status": "completed"})
+    await database.update_action_item(items[1].id, {"priority": "medium"})
+    await database.delete_action_item(items[2].id)
+    await database.bulk_delete_action_items(ids=[items[3].id, "missing"])
+
+    snapshot = await database.get_action_item_stats(days=1)
+    assert not database.stats.stale
+    assert snapshot["total"] == 3
+    assert snapshot["by_status"] == {"pending": 2, "completed": 1}
+    assert snapshot["by_status_priority"]["completed"]["high"] == 1
+    assert snapshot["by_priority"] == {"high": 2, "medium": 1, "low": 0}
+    assert snapshot["created_per_day"][0]["count"] == 3
+    assert without_time(snapshot) == without_time(await counted(database))
+
+
+async def test_bulk_status_update_recounts(database):
+    await database.create_multiple_action_items([ActionItem(text=f"Task {n}") for n in range(4)])
+    await database.get_action_item_stats()
+
+    await database.bulk_update_action_items({"status": "completed"}, filters={"status": "pending"})
+    assert database.stats.stale
+
+    snapshot = await database.get_action_item_stats()
+    assert snapshot["by_status"] == {"pending": 0, "completed": 4}
+
+
+async def test_reconcile_is_a_grouped_count():
+    stats = ActionItemStats()
+    stats.record_write(added=[("pending", "high", "2024-01-01")] * 7)
+
+    async def count():
+        return [("pending", "high", "2024-01-15", 2), ("completed", "low", "2024-01-15", 1)]
+
+    await stats.reconcile(count)
+    snapshot = stats.snapshot(days=2, today=date(2024, 1, 15))
+    assert snapshot["total"] == 3
+    assert snapshot["by_status_priority"]["pending"]["high"] == 2
+    assert snapshot["created_per_day"] == [{"date": "2024-01-14", "count": 0}, {"date": "2024-01-15", "count": 3}]
+
+
+async def test_write_during_a_count_leaves_the_stats_stale():
+    stats = ActionItemStats()
+    counting, release = asyncio.Event(), asyncio.Event()
+
+    async def count():
+        counting.set()
+        await release.wait()
+        return [("pending", "high", "2024-01-15", 1)]
+
+    task = asyncio.create_task(stats.reconcile(count))
+    await counting.wait()
+    stats.record_write(added=[("pending", "high", "2024-01-15")])
+    release.set()
+    await task
+
+    # The count may or may not include that write, so the next read recounts
+    assert stats.stale
+
+
+async def test_failed_count_keeps_the_stats_stale():
+    stats = ActionItemStats()
+
+    async def count():
+        raise RuntimeError("storage unavailable")
+
+    with pytest.raises(RuntimeError):
+        await stats.reconcile(count)
+    assert stats.stale
+
+
+async def test_supabase_counts_come_from_the_sql_function(postgrest):
+    postgrest.responses = [[
+        {"status": "pending", "priority": "high", "day": "2024-01-15", "count": 2},
+        {"status": "completed", "priority": "high", "day": "2024-01-14", "count": 1},
+    ]]
+    snapshot = await postgrest.get_action_item_stats()
+    assert snapshot["total"] == 3
+    assert snapshot["by_priority"]["high"] == 3
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from app.models import ActionItem
+from app.services import batch_jobs
+from app.services.batch_jobs import BatchJobManager, BatchJobStore
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeLLM:
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.calls = []
+
+    async def extract_action_items(self, transcript, use_cache=True):
+        self.calls.append(transcript)
+        if self.failures.get(transcript, 0):
+            self.failures[transcript] -= 1
+            raise RuntimeError(f"rate limited: {transcript}")
+        return [ActionItem(text=f"{transcript} task {n}") for n in range(2)]
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.writes = []
+
+    async def create_multiple_action_items(self, action_items):
+        self.writes.append(list(action_items))
+        return action_items
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(batch_jobs.random, "uniform", lambda low, high: 0)
+
+
+async def wait_finished(manager, job_id):
+    for _ in range(200):
+        job = await manager.get_job(job_id, include_items=True)
+        if job["status"] not in ("queued", "running"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job still {job['status']}")
+
+
+async def test_job_runs_every_transcript_and_batches_writes(tmp_path):
+    db = FakeDatabase()
+    manager = BatchJobManager(FakeLLM(), db, store_path=str(tmp_path / "jobs.db"), concurrency=2, write_interval=0.05)
+    await manager.start()
+    try:
+        job = await manager.submit(["a", "b", "c"])
+        job = await wait_finished(manager, job["job_id"])
+    finally:
+        await manager.stop()
+
+    assert job["status"] == "completed"
+    assert job["completed"] == 3 and job["action_items_created"] == 6
+    assert sum(len(write) for write in db.writes) == 6
+    # The writer groups results from several workers into one insert
+    assert len(db.writes) < 3
+
+
+async def test_failed_transcript_is_retried_then_recorded(tmp_path):
+    llm = FakeLLM(failures={"flaky": 1, "broken": 5})
+    manager = BatchJobManager(llm, FakeDatabase(), store_path=str(tmp_path / "jobs.db"), write_interval=0.01)
+    await manager.start()
+    try:
+        job = await manager.submit(["flaky", "broken"])
+        job = await wait_finished(manager, job["job_id"])
+    finally:
+        await manager.stop()
+
+    assert job["status"] == "completed_with_errors"
+    flaky, broken = job["items"]
+    assert (flaky["status"], flaky["attempts"]) == ("completed", 2)
+    assert (broken["status"], broken["attempts"]) == ("failed", 3)
+    assert "rate limited" in broken["error"]
+    assert llm.calls.count("broken") == 3
+
+
+async def test_interrupted_job_resumes_on_start(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = BatchJobStore(path)
+    store.create_job("job-1", ["done", "interrupted", "waiting"], use_cache=True)
+    store.start_item("job-1", 0)
+    store.finish_items([("job-1", 0, 2, None)])
+    store.start_item("job-1", 1)  # The process died while this one ran
+    store.close()
+
+    llm = FakeLLM()
+    manager = BatchJobManager(llm, FakeDatabase(), store_path=path, write_interval=0.01)
+    await manager.start()
+    try:
+        job = await wait_finished(manager, "job-1")
+    finally:
+        await manager.stop()
+
+    assert sorted(llm.calls) == ["interrupted", "waiting"]
+    assert job["status"] == "completed" and job["action_items_created"] == 6
@@ -0,0 +1,105 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from app.models import ActionItem
+from app.services.bulk_io import BulkImporter, export_stream
+
+pytestmark = pytest.mark.anyio
+
+ITEMS = [
+    ActionItem(
+        id=f"item-{n}",
+        text=text,
+        status=("pending", "completed")[n % 2],
+        priority=("high", "medium", "low")[n % 3],
+        createdAt=datetime(2024, 3, 1, 9, n),
+        updatedAt=datetime(2024, 3, 2, 9, n) if n % 2 else None,
+    )
+    for n, text in enumerate([
+        "Send the quarterly report to finance",
+        "Book a venue for the offsite, with parking",
+        'Ask legal about the "standard" NDA',
+        "Migrate the billing cron jobs\nto the new scheduler",
+        "Schedule interviews for the two backend roles",
+    ])
+]
+
+
+async def chunked(data: bytes, size: int = 7):
+    # Small chunks split records, and multi-byte characters, across reads
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def export(db_service, export_format: str) -> bytes:
+    pages = db_service.iter_action_items(page_size=2, order="asc")
+    first = await anext(pages, None)
+    return b"".join([chunk async for chunk in export_stream(first, pages, export_format)])
+
+
+async def import_(db_service, data: bytes, import_format: str) -> dict:
+    return await BulkImporter(batch_size=2).run(chunked(data), import_format, db_service.import_action_items)
+
+
+async def seed(db_service) -> bytes:
+    await db_service.create_multiple_action_items(ITEMS, keep_timestamps=True)
+    return await export(db_service, "ndjson")
+
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+async def test_export_import_round_trip(make_database, export_format):
+    source = await make_database("source")
+    await source.create_multiple_action_items(ITEMS, keep_timestamps=True)
+    exported = await export(source, export_format)
+
+    target = await make_database("target", outbox=True)
+    summary = await import_(target, exported, export_format)
+
+    assert summary["rows"] == summary["imported"] == len(ITEMS)
+    assert (summary["updated"], summary["duplicates"], summary["invalid"]) == (0, 0, 0)
+    assert await export(target, export_format) == exported
+    by_id = lambda item: item.id
+    assert sorted(await target.get_all_action_items(), key=by_id) == sorted(await source.get_all_action_items(), key=by_id)
+
+
+@pytest.mark.parametrize("outbox", [False, True])
+async def test_reimporting_an_edited_export_updates_it(make_database, outbox):
+    db_service = await make_database(outbox=outbox)
+    exported = await seed(db_service)
+
+    rows = [json.loads(line) for line in exported.splitlines()]
+    rows[0]["status"] = "completed"
+    rows[1]["text"] += " and catering"
+    edited = b"".join(json.dumps(row).encode() + b"\n" for row in rows)
+
+    summary = await import_(db_service, edited, "ndjson")
+
+    assert (summary["imported"], summary["updated"], summary["duplicates"]) == (0, len(ITEMS), 0)
+    assert (await db_service.get_action_item(rows[0]["id"])).status == "completed"
+    assert (await db_service.get_action_item(rows[1]["id"])).text.endswith("and catering")
+    assert len(await db_service.get_all_action_items()) == len(ITEMS)
+    completed = sum(row["status"] == "completed" for row in rows)
+    assert (await db_service.get_action_item_stats())["by_status"]["completed"] == completed
+
+
+async def test_import_skips_near_duplicates_of_other_items(make_database):
+    database = await make_database(duplicate_mode="skip")
+    await seed(database)
+    await database._ensure_indexes()
+    data = json.dumps({"text": "Send the quarterly report to finance!", "priority": "low"}).encode()
+
+    summary = await import_(database, data, "ndjson")
+
+    assert (summary["imported"], summary["updated"], summary["duplicates"]) == (0, 0, 1)
+    assert len(await database.get_all_action_items()) == len(ITEMS)
+
+
+async def test_invalid_rows_are_reported_by_line(database):
+    data = b'{"text": "Valid task"}\n{"priority": "high"}\n{"text": "Bad priority", "priority": "urgent"}\n'
+
+    summary = await import_(database, data, "ndjson")
+
+    assert (summary["rows"], summary["imported"], summary["invalid"]) == (3, 1, 2)
+    assert [error["line"] for error in summary["errors"]] == [2, 3]
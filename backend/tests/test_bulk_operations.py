@@ -0,0 +1,76 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+from .conftest import row
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def client(postgrest, monkeypatch):
+    monkeypatch.setattr(main.database, "instance", postgrest)
+    return TestClient(main.app)
+
+
+async def test_long_id_lists_are_chunked(postgrest):
+    rows = [dict(row(n % 60), id=f"item-{n:03d}") for n in range(200)]
+    ids = [r["id"] for r in rows]
+    postgrest.responses = [rows[:150], rows[150:]]
+
+    deleted, errors = await postgrest.bulk_delete_action_items(ids=ids)
+
+    assert deleted == ids and not errors
+    assert [request["id"].count(",") + 1 for request in postgrest.requests] == [150, 50]
+
+
+async def test_filter_is_one_request(postgrest):
+    postgrest.responses = [[dict(row(1), status="completed")]]
+    updated, _ = await postgrest.bulk_update_action_items(
+        {"status": "completed"}, filters={"priority": "high", "search": "deck"}
+    )
+    assert [item.status for item in updated] == ["completed"]
+    assert postgrest.requests == [{"priority": "eq.high", "text": "ilike.*deck*"}]
+
+
+def test_results_report_each_id(client, postgrest):
+    ids = [f"item-{n:03d}" for n in range(160)]
+    postgrest.responses = [[row(1)], httpx.Response(503, content=b"{}")]
+
+    response = client.post("/api/action-items/bulk-update", json={"ids": ["item-01"] + ids, "patch": {"status": "completed"}})
+
+    body = response.json()
+    assert response.status_code == 200
+    assert not body["success"] and body["matched_count"] == 1
+    statuses = {result["id"]: result["status"] for result in body["results"]}
+    assert statuses["item-01"] == "updated"
+    assert statuses["item-000"] == "not_found"
+    # The second chunk failed as a whole
+    assert statuses["item-159"] == "error"
+
+
+@pytest.mark.parametrize("payload", [
+    {"patch": {"status": "completed"}},
+    {"ids": ["a"], "filter": {"status": "pending"}, "patch": {"status": "completed"}},
+    {"filter": {}, "patch": {"status": "completed"}},
+    {"ids": ["a"], "patch": {}},
+    {"ids": ["a"], "patch": {"text": "renamed"}},
+])
+def test_invalid_requests_are_rejected(client, payload):
+    assert client.post("/api/action-items/bulk-update", json=payload).status_code == 422
+
+
+async def test_sqlite_bulk_operations(database):
+    rows = [dict(row(n), priority=("high", "low")[n % 2]) for n in range(6)]
+    await database.storage.insert_rows(rows)
+
+    updated, _ = await database.bulk_update_action_items({"status": "completed"}, filters={"priority": "high"})
+    assert sorted(item.id for item in updated) == ["item-00", "item-02", "item-04"]
+
+    deleted, _ = await database.bulk_delete_action_items(ids=["item-00", "item-01", "missing"])
+    assert sorted(deleted) == ["item-00", "item-01"]
+
+    remaining, _ = await database.get_action_items_page(status="completed")
+    assert sorted(item.id for item in remaining) == ["item-02", "item-04"]
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from app.models import ActionItem
+from app.services.change_feed import ChangeFeed
+
+pytestmark = pytest.mark.anyio
+
+
+def test_changes_since_returns_the_latest_state_of_each_item():
+    feed = ChangeFeed()
+    first, second = ActionItem(text="Send the report"), ActionItem(text="Book the venue")
+    feed.publish(upserted=[first])
+    cursor = feed.cursor
+
+    feed.publish(upserted=[second])
+    feed.publish(upserted=[first.model_copy(update={"status": "completed"})])
+    feed.publish(deleted=[second.id])
+
+    changes, next_cursor, has_more = feed.changes_since(cursor)
+    assert [(event.op, event.id) for event in changes] == [("upsert", first.id), ("delete", second.id)]
+    assert changes[0].action_item.status == "completed"
+    assert next_cursor == feed.cursor and not has_more
+    assert feed.changes_since(next_cursor)[0] == []
+
+
+def test_changes_since_pages_with_a_limit():
+    feed = ChangeFeed()
+    cursor = feed.cursor
+    feed.publish(upserted=[ActionItem(text=f"Task {n}") for n in range(5)])
+
+    changes, cursor, has_more = feed.changes_since(cursor, limit=3)
+    assert len(changes) == 3 and has_more
+    changes, _, has_more = feed.changes_since(cursor, limit=3)
+    assert len(changes) == 2 and not has_more
+
+
+@pytest.mark.parametrize("cursor", ["other-0", "garbage", None])
+def test_cursors_from_elsewhere_need_a_reset(cursor):
+    feed = ChangeFeed()
+    feed.publish(upserted=[ActionItem(text="Send the report")])
+    assert feed.changes_since(cursor) == (None, feed.cursor, False)
+
+
+def test_evicted_and_reset_windows_need_a_reset():
+    feed = ChangeFeed(max_events=2)
+    cursor = feed.cursor
+    feed.publish(upserted=[ActionItem(text=f"Task {n}") for n in range(3)])
+    assert feed.changes_since(cursor)[0] is None
+
+    cursor = feed.cursor
+    feed.reset()
+    assert feed.changes_since(cursor)[0] is None
+
+
+async def test_subscribers_resume_then_follow_live_changes():
+    feed = ChangeFeed()
+    cursor = feed.cursor
+    feed.publish(upserted=[ActionItem(text="Send the report")])
+
+    events = feed.subscribe(cursor)
+    assert (await events.__anext__()).op == "upsert"
+    feed.publish(deleted=["item-1"])
+    event = await events.__anext__()
+    assert (event.op, event.id) == ("delete", "item-1")
+    assert event.frame.startswith(f"id: {feed.cursor}\nevent: delete\n".encode())
+    await events.aclose()
+    assert feed.subscriber_count == 0
+
+
+async def test_a_subscriber_that_falls_behind_is_reset():
+    feed = ChangeFeed(queue_size=1)
+    events = feed.subscribe()
+    # Registers the subscriber, then waits for the first batch
+    waiting = asyncio.ensure_future(events.__anext__())
+    await asyncio.sleep(0)
+    feed.publish(upserted=[ActionItem(text="Task 1")])
+    assert (await waiting).op == "upsert"
+
+    feed.publish(upserted=[ActionItem(text="Task 2")])
+    feed.publish(upserted=[ActionItem(text="Task 3")])
+    assert [(await events.__anext__()).op for _ in range(2)] == ["upsert", "reset"]
+    assert feed.dropped_subscribers == 1
@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.database_service import decode_cursor, encode_cursor
+
+from .conftest import row
+
+pytestmark = pytest.mark.anyio
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("priority", "asc", "high", "2024-01-15T10:30:00", "item-1")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("priority", "asc", "high", "2024-01-15T10:30:00", "item-1")
+
+
+def test_cursor_without_bucket():
+    cursor = encode_cursor("created_at", "desc", None, "2024-01-15T10:30:00", "item-1")
+    assert decode_cursor(cursor) == ("created_at", "desc", None, "2024-01-15T10:30:00", "item-1")
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", encode_cursor("created_at", "desc", None, "t", "id")[:-4]])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+async def test_pages_use_a_keyset_not_an_offset(postgrest):
+    postgrest.responses = [[row(n) for n in (9, 8, 7)], [row(6)]]
+
+    items, cursor = await postgrest.get_action_items_page(limit=2, status="pending")
+    assert [item.id for item in items] == ["item-09", "item-08"]
+    # One extra row tells whether another page exists
+    assert postgrest.requests[0] == {
+        "status": "eq.pending", "order": "created_at.desc,id.desc", "limit": "3",
+    }
+
+    items, cursor = await postgrest.get_action_items_page(limit=2, status="pending", cursor=cursor)
+    assert [item.id for item in items] == ["item-06"]
+    assert cursor is None
+    assert postgrest.requests[1]["or"] == (
+        '(created_at.lt."2024-01-01T00:08:00",and(created_at.eq."2024-01-01T00:08:00",id.lt."item-08"))'
+    )
+    assert "offset" not in postgrest.requests[1]
+
+
+async def test_enum_sort_pages_through_buckets(postgrest):
+    postgrest.responses = [[row(1, "high")], [row(2, "medium"), row(3, "medium")]]
+
+    items, cursor = await postgrest.get_action_items_page(limit=2, sort_by="priority", order="desc")
+    assert [item.priority for item in items] == ["high", "medium"]
+    assert [(r["priority"], r["limit"]) for r in postgrest.requests] == [("eq.high", "3"), ("eq.medium", "2")]
+    assert decode_cursor(cursor)[:3] == ("priority", "desc", "medium")
+
+    # The next page resumes inside the medium bucket, then moves on to low
+    postgrest.responses = [[row(3, "medium")], []]
+    items, _ = await postgrest.get_action_items_page(limit=2, sort_by="priority", order="desc", cursor=cursor)
+    assert [r["priority"] for r in postgrest.requests[2:]] == ["eq.medium", "eq.low"]
+    assert "or" in postgrest.requests[2] and "or" not in postgrest.requests[3]
+
+
+async def test_cursor_must_match_sort(postgrest):
+    cursor = encode_cursor("created_at", "desc", None, "2024-01-01T00:00:00", "item-00")
+    with pytest.raises(ValueError):
+        await postgrest.get_action_items_page(limit=10, cursor=cursor, sort_by="priority")
+
+
+async def seed(database, count: int = 25):
+    base = datetime(2024, 1, 1)
+    rows = [
+        {
+            "id": f"item-{n:02d}",
+            "text": f"Task number {n}",
+            "priority": ("high", "medium", "low")[n % 3],
+            "status": ("pending", "completed")[n % 2],
+            # Pairs share a timestamp so the id breaks ties
+            "created_at": (base + timedelta(minutes=n // 2)).isoformat(),
+            "updated_at": None,
+        }
+        for n in range(count)
+    ]
+    await database.storage.insert_rows(rows)
+    return rows
+
+
+async def read_all(database, page_size: int, **query):
+    pages, cursor = [], None
+    while True:
+        items, cursor = await database.get_action_items_page(limit=page_size, cursor=cursor, **query)
+        pages.append(items)
+        if not cursor:
+            return pages
+
+
+@pytest.mark.parametrize("sort_by", ["created_at", "priority", "status"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_pages_cover_every_item_once(database, sort_by, order):
+    rows = await seed(database)
+    pages = await read_all(database, 10, sort_by=sort_by, order=order)
+    assert [len(page) for page in pages] == [10, 10, 5]
+    ids = [item.id for page in pages for item in page]
+    assert sorted(ids) == sorted(row["id"] for row in rows)
+
+    unpaged, cursor = await database.get_action_items_page(sort_by=sort_by, order=order)
+    assert cursor is None
+    assert [item.id for item in unpaged] == ids
+
+
+async def test_pages_with_filter(database):
+    rows = await seed(database)
+    pages = await read_all(database, 4, status="completed")
+    ids = [item.id for page in pages for item in page]
+    assert sorted(ids) == sorted(row["id"] for row in rows if row["status"] == "completed")
+
+
+async def test_exact_last_page_has_no_cursor(database):
+    await seed(database, count=20)
+    pages = await read_all(database, 10)
+    assert [len(page) for page in pages] == [10, 10]
+
@@ -0,0 +1,109 @@
+import pytest
+
+from app.models import ActionItem
+from app.services.duplicate_index import DuplicateIndex, jaccard, shingles
+
+pytestmark = pytest.mark.anyio
+
+REPORT = "Send the quarterly report to the finance team by Friday"
+REPORT_AGAIN = "Send the quarterly report to the finance team by Friday please"
+VENUE = "Book a venue for the offsite in March"
+
+
+async def stored_ids(db_service):
+    return sorted(item.id for item in await db_service.get_all_action_items())
+
+
+async def indexed(db_service):
+    """Wait until the duplicate index has been built from storage"""
+    await db_service._ensure_indexes()
+    return db_service
+
+
+def test_near_duplicates_match_and_others_do_not():
+    index = DuplicateIndex()
+    index.add("report", REPORT)
+    index.add("venue", VENUE)
+
+    match = index.find(REPORT_AGAIN)
+    assert match[0] == "report" and match[1] == jaccard(shingles(REPORT), shingles(REPORT_AGAIN))
+    assert index.find("Send the venue contract to legal") is None
+
+    index.remove("report")
+    assert index.find(REPORT_AGAIN) is None
+
+
+async def test_duplicates_in_one_batch_are_folded(make_database):
+    db_service = await make_database(duplicate_mode="skip")
+    first, second, other = ActionItem(text=REPORT), ActionItem(text=REPORT_AGAIN), ActionItem(text=VENUE)
+
+    saved = await db_service.create_multiple_action_items([first, second, other])
+
+    assert [item.id for item in saved] == [first.id, other.id]
+    assert await stored_ids(db_service) == sorted([first.id, other.id])
+
+
+async def test_duplicate_of_a_stored_item_returns_it(make_database):
+    db_service = await indexed(await make_database(duplicate_mode="skip"))
+    [stored] = await db_service.create_multiple_action_items([ActionItem(text=REPORT)])
+
+    saved = await db_service.create_multiple_action_items([ActionItem(text=REPORT_AGAIN), ActionItem(text=VENUE)])
+
+    assert saved[-1].id == stored.id
+    assert len(await stored_ids(db_service)) == 2
+
+
+async def test_merge_mode_keeps_the_longer_text_and_higher_priority(make_database):
+    db_service = await indexed(await make_database(duplicate_mode="merge"))
+    [stored] = await db_service.create_multiple_action_items([ActionItem(text=REPORT, priority="low")])
+
+    [merged] = await db_service.create_multiple_action_items([ActionItem(text=REPORT_AGAIN, priority="high")])
+
+    assert merged.id == stored.id
+    assert (merged.text, merged.priority) == (REPORT_AGAIN, "high")
+    assert (await db_service.get_action_item(stored.id)).priority == "high"
+
+
+async def test_merge_mode_updates_a_queued_match(make_database):
+    db_service = await indexed(await make_database(outbox=True, duplicate_mode="merge"))
+
+    async def down(rows):
+        raise ConnectionError("storage is down")
+
+    # Storage is down, so the first item stays queued in the outbox
+    db_service.storage.upsert_rows = down
+    [stored] = await db_service.create_multiple_action_items([ActionItem(text=REPORT, priority="low")])
+
+    [merged] = await db_service.create_multiple_action_items([ActionItem(text=REPORT_AGAIN, priority="high")])
+
+    assert merged.id == stored.id
+    assert merged.priority == "high"
+
+    del db_service.storage.upsert_rows
+    assert await db_service.outbox.wait_flushed(timeout=5)
+    assert await stored_ids(db_service) == [stored.id]
+    assert (await db_service.storage.select_by_id(stored.id))["priority"] == "high"
+
+
+async def test_folding_item_by_item_matches_the_batch_fold(make_database):
+    database = await make_database(duplicate_mode="skip")
+    items = [ActionItem(text=REPORT), ActionItem(text=VENUE), ActionItem(text=REPORT_AGAIN)]
+    batch = database.fold_batch()
+    folded = [await database.fold_duplicate(batch, item) for item in items]
+
+    assert [item.id for item in folded] == [items[0].id, items[1].id, items[0].id]
+
+    saved = await database.create_multiple_action_items(items, folded=batch)
+    assert sorted(item.id for item in saved) == sorted([items[0].id, items[1].id])
+    # Every id handed out while folding is stored
+    for item in folded:
+        assert await database.get_action_item(item.id) is not None
+
+
+async def test_duplicate_detection_is_off_by_default(database):
+    assert database.fold_batch() is None
+
+    saved = await database.create_multiple_action_items([ActionItem(text=REPORT), ActionItem(text=REPORT)])
+
+    assert len(saved) == 2
+    assert len(await stored_ids(database)) == 2
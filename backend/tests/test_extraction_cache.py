@@ -0,0 +1,49 @@
+import pytest
+
+from app.services.extraction_cache import ExtractionCache, make_cache_key
+
+pytestmark = pytest.mark.anyio
+
+ITEMS = [{"text": "Send the report", "priority": "high"}]
+
+
+def test_key_ignores_whitespace_but_not_settings():
+    key = make_cache_key("Alice:  send\nthe report", "prompt", "gpt-4o-mini", 0.3)
+    assert key == make_cache_key("  Alice: send the   report ", "prompt", "gpt-4o-mini", 0.3)
+    assert key != make_cache_key("Alice: send the report", "prompt", "gpt-4o", 0.3)
+    assert key != make_cache_key("Alice: send the report", "prompt", "gpt-4o-mini", 0.7)
+
+
+async def test_memory_tier_evicts_least_recently_used():
+    cache = ExtractionCache(max_entries=2)
+    await cache.set("a", ITEMS)
+    await cache.set("b", ITEMS)
+    assert await cache.get("a") == ITEMS
+    await cache.set("c", ITEMS)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == ITEMS
+    assert cache.evictions == 1
+
+
+async def test_disk_tier_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ExtractionCache(db_path=path)
+    await cache.set("a", ITEMS)
+    cache.close()
+
+    reopened = ExtractionCache(db_path=path)
+    assert await reopened.get("a") == ITEMS
+    assert reopened.disk_hits == 1
+    # Promoted to memory on the way out
+    assert await reopened.get("a") == ITEMS
+    assert reopened.memory_hits == 1
+    reopened.close()
+
+
+async def test_expired_entries_are_misses(tmp_path):
+    cache = ExtractionCache(ttl_seconds=0, db_path=str(tmp_path / "cache.db"))
+    await cache.set("a", ITEMS)
+    assert await cache.get("a") is None
+    assert cache.misses == 1
+    cache.close()
@@ -0,0 +1,94 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.services.health_monitor import HealthMonitor
+
+pytestmark = pytest.mark.anyio
+
+
+def probe(result):
+    async def run():
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return run
+
+
+async def test_failing_non_critical_check_only_degrades():
+    monitor = HealthMonitor()
+    monitor.register("database", probe(True), 15)
+    monitor.register("openai", probe(RuntimeError("quota exceeded")), 60, critical=False)
+    for check in monitor.checks.values():
+        await monitor.run_check(check)
+
+    assert monitor.is_ready()
+    assert monitor.degraded() == ["openai"]
+    assert monitor.overall_status() == "degraded"
+    assert monitor.snapshot()["openai"]["error"] == "quota exceeded"
+
+
+async def test_failing_critical_check_is_unhealthy():
+    monitor = HealthMonitor()
+    monitor.register("database", probe(False), 15)
+    await monitor.run_check(monitor.checks["database"])
+
+    assert not monitor.is_ready()
+    assert monitor.overall_status() == "unhealthy"
+    assert monitor.checks["database"].consecutive_failures == 1
+
+
+async def test_slow_probe_times_out():
+    async def slow():
+        await asyncio.sleep(1)
+        return True
+
+    monitor = HealthMonitor(probe_timeout=0.01)
+    monitor.register("database", slow, 15)
+    await monitor.run_check(monitor.checks["database"])
+    assert monitor.status_of("database") == "disconnected"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monitor = HealthMonitor()
+    monkeypatch.setattr(main, "health_monitor", monitor)
+    monkeypatch.setattr(main.database, "instance", SimpleNamespace(outbox=None, changes=None))
+    monkeypatch.setattr(main.llm, "instance", object())
+    monkeypatch.setattr(main.batch_jobs, "instance", object())
+    return TestClient(main.app), monitor
+
+
+async def test_endpoints_report_the_monitor_status(client):
+    client, monitor = client
+    monitor.register("database", probe(True), 15)
+    monitor.register("openai", probe(False), 60, critical=False)
+    for check in monitor.checks.values():
+        await monitor.run_check(check)
+
+    assert client.get("/api/health").json()["status"] == "degraded"
+    ready = client.get("/api/health/ready")
+    assert ready.status_code == 200
+    assert ready.json()["degraded"] == ["openai"]
+
+    monitor.checks["database"].probe = probe(False)
+    await monitor.run_check(monitor.checks["database"])
+    assert client.get("/api/health").json()["status"] == "unhealthy"
+    assert client.get("/api/health/ready").status_code == 503
+
+
+async def test_missing_openai_does_not_block_readiness(client, monkeypatch):
+    client, monitor = client
+    # No OpenAI key: the LLM service, and the batch jobs that need it, cannot be built
+    monkeypatch.setattr(main.llm, "instance", None)
+    monkeypatch.setattr(main.batch_jobs, "instance", None)
+    monitor.register("database", probe(True), 15)
+    await monitor.run_check(monitor.checks["database"])
+
+    assert client.get("/api/health/ready").json() == {
+        "status": "ready", "degraded": ["batch_jobs", "llm"], "checks": monitor.snapshot(),
+    }
+    assert client.get("/api/health").json()["status"] == "degraded"
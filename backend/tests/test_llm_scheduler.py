@@ -0,0 +1,109 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from app.services.llm_scheduler import LLMScheduler, SchedulerTimeoutError, TokenBucket, is_retryable
+
+pytestmark = pytest.mark.anyio
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def status_error(status_code: int, code: str = None, retry_after: str = None) -> openai.APIStatusError:
+    headers = {"retry-after": retry_after} if retry_after else {}
+    response = httpx.Response(status_code, request=REQUEST, headers=headers)
+    return openai.APIStatusError("error", response=response, body={"code": code} if code else None)
+
+
+def scheduler(**kwargs) -> LLMScheduler:
+    return LLMScheduler(**dict(dict(base_backoff=0.001, max_backoff=0.01), **kwargs))
+
+
+def test_retryable_errors():
+    assert is_retryable(status_error(429))
+    assert is_retryable(status_error(503))
+    assert is_retryable(openai.APIConnectionError(request=REQUEST))
+    assert not is_retryable(status_error(429, code="insufficient_quota"))
+    assert not is_retryable(status_error(400))
+    assert not is_retryable(ValueError("bad json"))
+
+
+async def test_transient_errors_are_retried():
+    llm = scheduler(max_retries=3)
+    errors = [status_error(429), status_error(502)]
+
+    async def call():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert await llm.run(call, estimated_tokens=10) == "ok"
+    assert (llm.total_retries, llm.total_failures, llm.in_flight) == (2, 0, 0)
+
+
+async def test_gives_up_after_max_retries():
+    llm = scheduler(max_retries=2)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        raise status_error(500)
+
+    with pytest.raises(openai.APIStatusError):
+        await llm.run(call, estimated_tokens=10)
+    assert len(calls) == 3
+    assert llm.total_failures == 1
+
+
+async def test_client_errors_are_not_retried():
+    llm = scheduler()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        raise status_error(400)
+
+    with pytest.raises(openai.APIStatusError):
+        await llm.run(call, estimated_tokens=10)
+    assert len(calls) == 1
+
+
+async def test_concurrency_is_capped():
+    llm = scheduler(max_concurrency=2)
+    running, peak = 0, 0
+
+    async def call():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await asyncio.gather(*(llm.run(call, estimated_tokens=1) for _ in range(6)))
+    assert peak == 2
+
+
+async def test_request_budget_exhausted_before_deadline():
+    llm = scheduler(requests_per_minute=1, queue_timeout=0.05)
+
+    async def call():
+        return "ok"
+
+    assert await llm.run(call, estimated_tokens=1) == "ok"
+    with pytest.raises(SchedulerTimeoutError):
+        await llm.run(call, estimated_tokens=1)
+    assert llm.total_timeouts == 1
+    assert llm.stats()["queue_depth"] == 0
+
+
+def test_token_bucket_refund():
+    bucket = TokenBucket(rate_per_minute=600)
+    bucket.consume(500)
+    assert bucket.time_until(200) > 0
+    bucket.refund(400)
+    assert bucket.time_until(200) == 0
+    # Refunds never overfill the bucket
+    bucket.refund(10_000)
+    assert bucket.tokens == bucket.capacity
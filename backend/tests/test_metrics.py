@@ -0,0 +1,38 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.services import metrics
+
+
+@pytest.fixture
+def histogram():
+    histogram = metrics.Histogram("test_seconds", "Test histogram", ["stage"], buckets=(0.1, 1.0))
+    yield histogram
+    metrics._registry.remove(histogram)
+
+
+def test_histogram_buckets_are_cumulative(histogram):
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "parse")
+
+    assert histogram.samples() == [
+        'test_seconds_bucket{stage="parse",le="0.1"} 1',
+        'test_seconds_bucket{stage="parse",le="1"} 3',
+        'test_seconds_bucket{stage="parse",le="+Inf"} 4',
+        'test_seconds_sum{stage="parse"} 6.05',
+        'test_seconds_count{stage="parse"} 4',
+    ]
+
+
+def test_requests_get_an_id_and_are_counted_by_route():
+    client = TestClient(main.app)
+
+    response = client.get("/api/health/live", headers={"X-Request-ID": "abc-123"})
+    assert response.headers["X-Request-ID"] == "abc-123"
+    # Ids that are not short and plain are replaced
+    assert client.get("/api/health/live", headers={"X-Request-ID": "bad id\n"}).headers["X-Request-ID"] != "bad id\n"
+
+    body = client.get("/metrics").text
+    assert "# TYPE http_requests_total counter" in body
+    assert 'route="/api/health/live"' in body
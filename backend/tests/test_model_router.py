@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.llm_service import LLMService
+from app.services.model_router import ModelRouter, parse_tiers
+
+pytestmark = pytest.mark.anyio
+
+ITEMS = '[{"text": "Send the report", "priority": "high"}, {"text": "Book the venue", "priority": "low"}]'
+
+
+def router(**kwargs) -> ModelRouter:
+    return ModelRouter(parse_tiers("cheap:3000,strong"), **dict(dict(min_samples=4, window=4, probe_every=3), **kwargs))
+
+
+def test_parse_tiers():
+    tiers = parse_tiers(" gpt-4o-mini:8000 , gpt-4o ")
+    assert [(tier.model, tier.max_input_chars) for tier in tiers] == [("gpt-4o-mini", 8000), ("gpt-4o", 0)]
+    with pytest.raises(ValueError):
+        parse_tiers(" , ")
+
+
+def test_long_transcripts_skip_tiers_that_do_not_accept_them():
+    models = router()
+    assert models.first_tier(1000) == 0
+    assert models.first_tier(5000) == 1
+    assert models.stats()["tiers"][0]["skipped"] == 1
+
+
+def test_a_tier_that_keeps_escalating_is_skipped_with_probes():
+    models = router()
+    for _ in range(4):
+        models.record(0, 1000, "invalid", 0.01)
+
+    assert [models.first_tier(1000) for _ in range(6)] == [1, 1, 0, 1, 1, 0]
+    # Other size bands are routed on their own outcomes
+    assert models.first_tier(2500) == 0
+
+    for _ in range(4):
+        models.record(0, 1000, "ok", 0.01)
+    assert models.first_tier(1000) == 0
+
+
+def test_output_budget_follows_recent_completions():
+    models = router()
+    assert models.output_budget(1000, 500, 4000) == 500
+    for _ in range(4):
+        models.record(0, 1000, "truncated", 0.01, max_tokens=800)
+
+    assert models.output_budget(1000, 500, 4000) == 2000
+    assert models.output_budget(1000, 500, 1200) == 1200
+    assert models.output_budget(5000, 500, 4000) == 500
+
+
+def completion(content: str, finish_reason: str = "stop"):
+    choice = SimpleNamespace(message=SimpleNamespace(content=content), finish_reason=finish_reason)
+    return SimpleNamespace(choices=[choice], usage=None)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("EXTRACTION_CACHE_ENABLED", "false")
+    monkeypatch.setenv("LLM_MODEL_TIERS", "cheap,strong")
+    monkeypatch.setenv("LLM_MAX_OUTPUT_TOKENS", "4000")
+    service = LLMService()
+    service.calls = []
+    service.replies = {}
+
+    async def create(model, max_tokens, **kwargs):
+        service.calls.append((model, max_tokens))
+        return service.replies[model]
+
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return service
+
+
+async def test_truncated_output_escalates_with_a_bigger_budget(service):
+    service.replies = {"cheap": completion(ITEMS[:60], "length"), "strong": completion(ITEMS)}
+
+    items = await service.extract_action_items("Bob: I will send the report.")
+
+    assert [item.text for item in items] == ["Send the report", "Book the venue"]
+    (cheap, budget), (strong, escalated) = service.calls
+    assert (cheap, strong) == ("cheap", "strong")
+    assert escalated == min(4000, budget * 2)
+    assert service.router.stats()["escalations"] == 1
+
+
+async def test_unparseable_output_escalates(service):
+    service.replies = {"cheap": completion("Sure! Here are the items."), "strong": completion(ITEMS)}
+
+    items = await service.extract_action_items("Bob: I will send the report.")
+
+    assert len(items) == 2
+    assert service.router.stats()["tiers"][0]["outcomes"]["invalid"] == 1
+
+
+async def test_the_strongest_tier_keeps_complete_items_when_truncated(service):
+    service.replies = {"cheap": completion(ITEMS[:60], "length"), "strong": completion(ITEMS[:70], "length")}
+
+    items = await service.extract_action_items("Bob: I will send the report.")
+
+    assert [item.text for item in items] == ["Send the report"]
@@ -0,0 +1,33 @@
+import json
+from datetime import datetime
+
+from app.models import ActionItem, trusted_action_item
+from app.services.responses import columnar, dumps, field_dicts
+
+
+def items():
+    return [
+        ActionItem(id="a", text="Send the deck", priority="high", createdAt=datetime(2024, 1, 15, 10, 30)),
+        ActionItem(id="b", text="Book the room", createdAt=datetime(2024, 1, 15, 10, 31, 5, 250000),
+                   updatedAt=datetime(2024, 1, 16)),
+    ]
+
+
+def test_fast_encoding_matches_pydantic():
+    for item in items():
+        assert json.loads(dumps(item)) == json.loads(item.model_dump_json())
+    assert json.loads(dumps(field_dicts(items()))) == [json.loads(item.model_dump_json()) for item in items()]
+
+
+def test_trusted_items_equal_validated_ones():
+    for item in items():
+        trusted = trusted_action_item(**item.model_dump())
+        assert trusted == item
+        assert dumps(trusted) == dumps(item)
+
+
+def test_columnar_layout():
+    table = columnar(items())
+    assert list(table) == list(ActionItem.model_fields)
+    assert table["id"] == ["a", "b"]
+    assert table["updatedAt"][0] is None
@@ -0,0 +1,102 @@
+import pytest
+
+from app.models import ActionItem
+from app.services.search_index import SearchIndex, stem
+
+pytestmark = pytest.mark.anyio
+
+
+async def build(*texts: str, **fields) -> SearchIndex:
+    index = SearchIndex()
+    index.begin_rebuild()
+    await index.finish_rebuild([ActionItem(id=f"item-{n}", text=text, **fields) for n, text in enumerate(texts)])
+    return index
+
+
+def ids(results):
+    return [result["action_item"].id for result in results]
+
+
+def test_stemming():
+    assert {stem(word) for word in ("report", "reports", "reported", "reporting")} == {"report"}
+    assert stem("status") == "status"
+    assert stem("running") == "run"
+
+
+async def test_every_word_must_match_and_frequent_matches_rank_higher():
+    index = await build(
+        "Send the Q4 report to finance",
+        "Review the report draft",
+        "Q4 report, then report again",
+        "Book the offsite",
+    )
+    results, total = index.search("q4 reporting")
+    assert total == 2
+    assert ids(results) == ["item-2", "item-0"]
+
+    assert index.search("offsite")[1] == 1
+    assert index.search("the") == ([], 0)
+
+
+async def test_prefix_queries():
+    index = await build("Prepare the budget", "Budgeting review", "Bundle the slides")
+    assert sorted(ids(index.search("bud*")[0])) == ["item-0", "item-1"]
+    assert index.search("bu*")[1] == 3
+
+
+async def test_filters_and_snippets():
+    index = await build("Ship <script> fix & review", status="completed")
+    results, _ = index.search("review", status="completed")
+    assert results[0]["snippet"] == "Ship &lt;script&gt; fix &amp; <mark>review</mark>"
+    assert index.search("review", status="pending") == ([], 0)
+
+
+async def test_writes_during_a_rebuild_are_kept():
+    index = SearchIndex()
+    index.begin_rebuild()
+    index.record_write(upserted=[ActionItem(id="new", text="Call the vendor")])
+    index.record_write(deleted=["old"])
+    await index.finish_rebuild([ActionItem(id="old", text="Call the landlord")])
+    assert ids(index.search("call")[0]) == ["new"]
+
+
+async def test_database_keeps_the_index_current(database):
+    await database.create_multiple_action_items([ActionItem(text="Draft the roadmap")])
+    item = await database.create_action_item(ActionItem(text="Share the roadmap deck"))
+    assert (await database.search_action_items("roadmap"))[1] == 2
+
+    await database.delete_action_item(item.id)
+    results, total = await database.search_action_items("roadmap")
+    assert total == 1 and results[0]["action_item"].text == "Draft the roadmap"
+
+
+async def test_failed_write_triggers_a_rebuild(database):
+    await database.search_action_items("anything")
+    await database.storage.insert_rows([{
+        "id": "outside", "text": "Written by another process", "status": "pending", "priority": "low",
+        "created_at": "2024-01-01T00:00:00", "updated_at": None,
+    }])
+    assert (await database.search_action_items("process"))[1] == 0
+
+    with pytest.raises(Exception):
+        # Duplicate primary key
+        await database.create_action_item(ActionItem(id="outside", text="Clash"))
+    assert (await database.search_action_items("process"))[1] == 1
+
+
+async def test_search_filter_pages_agree_with_ranked_search(database):
+    await database.create_multiple_action_items(
+        [ActionItem(text=f"{('Budget', 'Hiring')[n % 2]} task {n}") for n in range(45)]
+    )
+    pages, cursor = [], None
+    while True:
+        page, cursor = await database.get_action_items_page(limit=10, cursor=cursor, search="budget")
+        pages.append(page)
+        if not cursor:
+            break
+
+    listed = [item.id for page in pages for item in page]
+    assert [len(page) for page in pages] == [10, 10, 3]
+    assert len(set(listed)) == 23
+    results, total = await database.search_action_items("budget", limit=100)
+    assert total == 23 and set(ids(results)) == set(listed)
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from app import serve
+from app.services.service_container import ServiceContainer
+
+pytestmark = pytest.mark.anyio
+
+PER_WORKER = ("CHANGE_FEED_ENABLED", "ACTION_ITEM_CACHE_ENABLED", "WRITE_OUTBOX_ENABLED")
+
+
+@pytest.fixture
+def workers(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "2")
+    for name in PER_WORKER + ("DUPLICATE_MODE", "ALLOW_PER_WORKER_STATE"):
+        monkeypatch.delenv(name, raising=False)
+    return monkeypatch
+
+
+def test_per_worker_features_follow_the_env(workers):
+    assert len(serve.per_worker_features()) == 3
+    for name in PER_WORKER:
+        workers.setenv(name, "false")
+    assert serve.per_worker_features() == []
+    workers.setenv("DUPLICATE_MODE", "merge")
+    assert serve.per_worker_features() == ["duplicate index (DUPLICATE_MODE)"]
+
+
+def test_multiple_workers_with_per_worker_state_are_refused(workers):
+    with pytest.raises(SystemExit) as exit_info:
+        serve.main()
+    assert exit_info.value.code == 2
+
+
+async def test_readiness_waits_for_required_services_only():
+    services = ServiceContainer(retry_seconds=60)
+    builds = []
+
+    async def build_database():
+        builds.append("database")
+        return "db"
+
+    async def build_llm():
+        builds.append("llm")
+        raise RuntimeError("no OpenAI key")
+
+    database = services.add("database", build_database)
+    llm = services.add("llm", build_llm, required=False)
+    assert not services.is_ready()
+
+    services.start()
+    await asyncio.gather(*services._warm_tasks)
+    assert services.is_ready()
+    assert services.degraded() == ["llm"]
+    assert await database.get() == "db"
+    # A failed build is only retried once `retry_seconds` have passed
+    assert await llm.get() is None
+    assert builds == ["database", "llm"]
+
+    services.drain()
+    assert not services.is_ready()
+    await services.close()
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from app.models import ActionItem
+from app.services.llm_service import LLMService
+from app.services.single_flight import SingleFlight
+
+from .conftest import row
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_calls_share_one_upstream_call():
+    flights = SingleFlight("test")
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["result"]
+
+    results = await asyncio.gather(*(flights.do("key", upstream) for _ in range(5)), flights.do("other", upstream))
+
+    assert len(calls) == 2
+    assert results[:5] == [["result"]] * 5
+    assert flights.stats() == {"in_flight": 0, "leaders": 2, "coalesced": 4}
+
+
+async def test_failures_reach_every_caller_and_are_not_kept():
+    flights = SingleFlight("test")
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ConnectionError("upstream down")
+
+    results = await asyncio.gather(flights.do("key", upstream), flights.do("key", upstream), return_exceptions=True)
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+    with pytest.raises(ConnectionError):
+        await flights.do("key", upstream)
+    assert len(calls) == 2
+
+
+async def test_a_cancelled_caller_does_not_cancel_the_others():
+    flights = SingleFlight("test")
+    started = []
+
+    async def upstream():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.create_task(flights.do("key", upstream))
+    second = asyncio.create_task(flights.do("key", upstream))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "done"
+    assert first.cancelled()
+    assert len(started) == 1
+
+
+async def test_the_call_is_cancelled_once_every_caller_is_gone():
+    flights = SingleFlight("test")
+    finished = []
+
+    async def upstream():
+        await asyncio.sleep(0.05)
+        finished.append(1)
+
+    caller = asyncio.create_task(flights.do("key", upstream))
+    await asyncio.sleep(0.01)
+    caller.cancel()
+    await asyncio.sleep(0.1)
+
+    assert finished == []
+    assert flights.in_flight == 0
+
+
+async def test_identical_list_reads_share_one_query(postgrest):
+    postgrest.responses = [[row(2), row(1)]]
+
+    pages = await asyncio.gather(*(postgrest.get_action_items_page(limit=10) for _ in range(3)))
+
+    assert len(postgrest.requests) == 1
+    assert all([item.id for item in items] == ["item-02", "item-01"] for items, _ in pages)
+
+
+async def test_identical_extractions_share_one_completion(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("EXTRACTION_CACHE_ENABLED", "false")
+    service = LLMService()
+    calls = []
+
+    async def extract(text):
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        return [ActionItem(text="Send the report", priority="high")]
+
+    service._extract_from_text = extract
+    first, second = await asyncio.gather(
+        service.extract_action_items("Bob: I will send the report."),
+        service.extract_action_items("Bob: I will send the report."),
+    )
+
+    assert len(calls) == 1
+    assert [item.text for item in first] == [item.text for item in second] == ["Send the report"]
+    # Each caller still gets its own rows
+    assert first[0].id != second[0].id
@@ -0,0 +1,60 @@
+from app.services.stream_parser import JSONArrayStreamParser
+
+TEXT = (
+    '```json\n[\n'
+    '  {"text": "Send the \\"final\\" deck", "priority": "high"},\n'
+    '  {"text": "Check [brackets] and {braces} in strings", "priority": "low"},\n'
+    '  {"text": "Nested", "tags": [1, {"a": [2]}]},\n'
+    '  "bare string"\n'
+    ']\n```'
+)
+EXPECTED = [
+    {"text": 'Send the "final" deck', "priority": "high"},
+    {"text": "Check [brackets] and {braces} in strings", "priority": "low"},
+    {"text": "Nested", "tags": [1, {"a": [2]}]},
+    "bare string",
+]
+
+
+def parse(pieces):
+    parser = JSONArrayStreamParser()
+    elements = []
+    for piece in pieces:
+        elements += parser.feed(piece)
+    return parser, elements
+
+
+def test_whole_text():
+    parser, elements = parse([TEXT])
+    assert elements == EXPECTED
+    assert parser.finished
+
+
+def test_split_at_every_position():
+    for split in range(len(TEXT) + 1):
+        _, elements = parse([TEXT[:split], TEXT[split:]])
+        assert elements == EXPECTED, f"split at {split}"
+
+
+def test_one_character_at_a_time():
+    _, elements = parse(TEXT)
+    assert elements == EXPECTED
+
+
+def test_elements_are_returned_as_soon_as_they_close():
+    parser = JSONArrayStreamParser()
+    assert parser.feed('[{"text": "a"}, {"text": ') == [{"text": "a"}]
+    assert parser.feed('"b"}') == [{"text": "b"}]
+    assert not parser.finished
+    assert parser.feed("]") == []
+    assert parser.finished
+
+
+def test_text_after_the_array_is_ignored():
+    _, elements = parse(['[{"a": 1}]', ' [{"b": 2}]'])
+    assert elements == [{"a": 1}]
+
+
+def test_malformed_element_is_skipped():
+    _, elements = parse(['[{"a": 1,}, {"b": 2}]'])
+    assert elements == [{"b": 2}]
@@ -0,0 +1,63 @@
+from app.models import ActionItem
+from app.services.llm_service import merge_action_items
+from app.services.transcript_chunker import split_into_segments, split_transcript
+
+
+def meeting(turns: int) -> str:
+    speakers = ["Alice", "Bob", "Carol"]
+    return "\n".join(
+        f"{speakers[n % 3]}: Item {n}. We agreed that someone should follow up on topic {n} by Friday."
+        for n in range(turns)
+    )
+
+
+def test_segments_break_at_speakers_and_paragraphs():
+    text = "Alice: Hello.\nstill Alice\nBob: Hi.\n\nCarol: New paragraph."
+    assert split_into_segments(text) == ["Alice: Hello.\nstill Alice", "Bob: Hi.", "Carol: New paragraph."]
+
+
+def test_short_transcript_is_one_chunk():
+    text = meeting(3)
+    assert split_transcript(text, max_chars=8000) == [text]
+
+
+def test_chunks_respect_the_size_and_keep_every_turn():
+    text = meeting(200)
+    chunks = split_transcript(text, max_chars=2000, overlap_chars=300)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 2000 for chunk in chunks)
+    for n in range(200):
+        assert any(f"Item {n}." in chunk for chunk in chunks)
+
+
+def test_chunks_overlap_at_boundaries():
+    chunks = split_transcript(meeting(200), max_chars=2000, overlap_chars=300)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        # The next chunk starts with the trailing turns of the previous one
+        previous, chunk = previous.split("\n\n"), chunk.split("\n\n")
+        carried = previous[previous.index(chunk[0]):]
+        assert chunk[:len(carried)] == carried
+        assert 0 < len("\n\n".join(carried)) <= 300
+
+
+def test_run_on_segment_is_cut_at_sentences():
+    text = " ".join(f"Sentence number {n} is here." for n in range(400))
+    chunks = split_transcript(text, max_chars=1000, overlap_chars=0)
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert all(chunk.endswith(".") for chunk in chunks)
+
+
+def test_merge_keeps_the_more_detailed_text_and_higher_priority():
+    merged = merge_action_items([
+        [ActionItem(text="Send the report to finance", priority="low")],
+        [
+            ActionItem(text="send the report to finance today", priority="high"),
+            ActionItem(text="Book the venue", priority="medium"),
+        ],
+    ], similarity=0.6)
+
+    assert [(item.text, item.priority) for item in merged] == [
+        ("send the report to finance today", "high"),
+        ("Book the venue", "medium"),
+    ]
@@ -0,0 +1,68 @@
+import pytest
+
+from app.services.llm_service import LLMService
+from app.services.transcript_filter import TranscriptFilter, normalize_lines
+
+pytestmark = pytest.mark.anyio
+
+SMALL_TALK = "Alice: Hi everyone, how are you. The weather was lovely this weekend."
+
+
+def meeting(topics: int) -> str:
+    """Small talk around one action item per topic"""
+    return "\n".join(
+        f"{SMALL_TALK}\nBob: Carol will send the budget for topic {n} by Friday.\n{SMALL_TALK}"
+        for n in range(topics)
+    )
+
+
+def test_normalize_drops_timestamps_and_filler():
+    text = "[00:01:02] JOHN SMITH: Um, so we should uh ship it.\ncontinued here"
+    assert normalize_lines(text) == [("John Smith", "so we should ship it. continued here")]
+
+
+def test_keeps_the_action_items_and_counts_what_it_dropped():
+    filtered = TranscriptFilter(context=0, min_tokens=0).filter(meeting(3))
+
+    for n in range(3):
+        assert f"send the budget for topic {n}" in filtered.text
+    assert "weather" not in filtered.text
+    assert filtered.kept_sentences == 3
+    assert filtered.dropped_sentences == filtered.total_sentences - 3
+    assert filtered.dropped_relevant == 0
+
+
+def test_budget_cuts_are_counted():
+    prefilter = TranscriptFilter(token_budget=20, context=0, min_tokens=0)
+    filtered = prefilter.filter(meeting(3))
+
+    assert filtered.kept_sentences == 1
+    assert filtered.dropped_relevant == 2
+    assert prefilter.stats()["dropped_relevant_sentences"] == 2
+
+
+async def test_long_transcripts_are_filtered_chunk_by_chunk(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("EXTRACTION_CACHE_ENABLED", "false")
+    monkeypatch.setenv("LLM_CHUNK_THRESHOLD_CHARS", "2000")
+    monkeypatch.setenv("LLM_CHUNK_SIZE_CHARS", "1500")
+    # Enough for one chunk's action items, far too little for the whole transcript's
+    monkeypatch.setenv("TRANSCRIPT_FILTER_TOKEN_BUDGET", "150")
+    monkeypatch.setenv("TRANSCRIPT_FILTER_CONTEXT_SENTENCES", "0")
+    monkeypatch.setenv("TRANSCRIPT_FILTER_MIN_TOKENS", "0")
+    service = LLMService()
+    sent = []
+
+    async def extract(text):
+        sent.append(text)
+        return []
+
+    service._extract_from_text = extract
+    await service.extract_action_items(meeting(40))
+
+    # Every chunk was filtered, and no action item was lost to the budget
+    assert len(sent) > 1
+    assert not any("weather" in text for text in sent)
+    for n in range(40):
+        assert any(f"send the budget for topic {n} " in text for text in sent)
+    assert service.prefilter.stats()["dropped_relevant_sentences"] == 0
@@ -0,0 +1,85 @@
+import pytest
+
+from app.services.transcript_upload import CaptionStripper, TranscriptUploadReceiver, UploadTooLargeError
+
+pytestmark = pytest.mark.anyio
+
+BOUNDARY = "upload-boundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+SRT = """1
+00:00:01,000 --> 00:00:03,000
+<i>Alice:</i> Bob will send the deck
+
+2
+00:00:03,000 --> 00:00:05,000
+<i>Alice:</i> Bob will send the deck
+
+3
+00:00:05,000 --> 00:00:07,000
+By Friday, please.
+"""
+
+VTT = """WEBVTT
+
+NOTE recorded by the meeting bot
+
+00:00:01.000 --> 00:00:04.000
+<v Bob>I'll book the venue.</v>
+"""
+
+
+def multipart(filename: str, content: str, use_cache: str = None) -> bytes:
+    parts = []
+    if use_cache is not None:
+        parts.append(f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="use_cache"\r\n\r\n{use_cache}\r\n')
+    parts.append(
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: application/octet-stream\r\n\r\n{content}\r\n--{BOUNDARY}--\r\n"
+    )
+    return "".join(parts).encode("utf-8")
+
+
+async def chunked(data: bytes, size: int = 5):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def strip(upload_format: str, text: str) -> str:
+    stripper = CaptionStripper(upload_format)
+    return stripper.feed(text) + stripper.close()
+
+
+def test_vtt_voices_become_speaker_lines():
+    assert strip("vtt", VTT).strip() == "Bob: I'll book the venue."
+
+
+@pytest.mark.parametrize("size", [3, 1000])
+async def test_upload_is_stripped_as_it_streams(size):
+    upload = await TranscriptUploadReceiver().receive(chunked(multipart("standup.srt", SRT, "false"), size), CONTENT_TYPE)
+
+    assert (upload.filename, upload.upload_format, upload.use_cache) == ("standup.srt", "srt", False)
+    assert "-->" not in upload.text and "<i>" not in upload.text
+    # The repeated cue is kept once
+    assert upload.text == "Alice: Bob will send the deck\nBy Friday, please.\n"
+    assert upload.stats()["received_bytes"] == len(multipart("standup.srt", SRT, "false"))
+
+
+async def test_oversized_upload_is_rejected_while_streaming():
+    data = multipart("notes.txt", "Alice: talk\n" * 200)
+    received = []
+
+    async def body():
+        async for chunk in chunked(data, 100):
+            received.append(chunk)
+            yield chunk
+
+    with pytest.raises(UploadTooLargeError):
+        await TranscriptUploadReceiver(max_bytes=1000).receive(body(), CONTENT_TYPE)
+    assert sum(map(len, received)) <= 1100
+
+
+async def test_upload_without_a_file_part():
+    data = f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="use_cache"\r\n\r\ntrue\r\n--{BOUNDARY}--\r\n'.encode()
+    with pytest.raises(ValueError):
+        await TranscriptUploadReceiver().receive(chunked(data), CONTENT_TYPE)
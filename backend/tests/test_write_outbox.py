@@ -0,0 +1,212 @@
+import asyncio
+
+import pytest
+
+from app.models import ActionItem
+from app.services.sqlite_storage import SQLiteStorage
+from app.services.write_outbox import OutboxStore, WriteOutbox
+
+pytestmark = pytest.mark.anyio
+
+
+def row(item_id: str, status: str = "pending") -> dict:
+    return {
+        "id": item_id,
+        "text": f"Task {item_id}",
+        "status": status,
+        "priority": "medium",
+        "created_at": "2024-01-01T00:00:00",
+        "updated_at": "2024-01-01T00:00:00",
+    }
+
+
+@pytest.fixture
+async def storage(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "items.db"))
+    await storage.open()
+    yield storage
+    await storage.close()
+
+
+def log_rows(path: str, rows):
+    """Leave rows in the outbox log, as a crash before they were flushed would"""
+    store = OutboxStore(path)
+    store.append(rows)
+    store.close()
+
+
+def logged(path: str) -> int:
+    store = OutboxStore(path)
+    try:
+        return len(store.load())
+    finally:
+        store.close()
+
+
+async def test_logged_rows_are_replayed_on_open(tmp_path, storage):
+    path = str(tmp_path / "outbox.db")
+    log_rows(path, [row("a"), row("b")])
+
+    outbox = WriteOutbox(path=path, linger=0)
+    await outbox.open(storage.upsert_rows)
+    assert await outbox.wait_flushed(timeout=5)
+    await outbox.close()
+
+    assert {r["id"] for r in await storage.select_rows({})} == {"a", "b"}
+    assert logged(path) == 0
+
+
+async def test_replay_of_stored_rows_is_a_no_op(tmp_path, storage):
+    # Crash after the upsert but before the log delete: the rows are stored,
+    # updated since, and still logged
+    path = str(tmp_path / "outbox.db")
+    await storage.upsert_rows([row("a"), row("b")])
+    await storage.update_rows({"status": "completed"}, ids=["a"])
+    log_rows(path, [row("a"), row("b")])
+
+    for _ in range(2):
+        outbox = WriteOutbox(path=path, linger=0)
+        await outbox.open(storage.upsert_rows)
+        assert await outbox.wait_flushed(timeout=5)
+        await outbox.close()
+
+    rows = {r["id"]: r for r in await storage.select_rows({})}
+    assert set(rows) == {"a", "b"}
+    assert rows["a"]["status"] == "completed"
+    assert logged(path) == 0
+
+
+async def test_failed_flush_stays_logged_and_is_retried(tmp_path, storage):
+    path = str(tmp_path / "outbox.db")
+    attempts = []
+
+    async def flaky(rows):
+        attempts.append(len(rows))
+        if len(attempts) == 1:
+            # Stored, but the caller never hears about it
+            await storage.upsert_rows(rows)
+            raise ConnectionError("connection reset")
+        await storage.upsert_rows(rows)
+
+    outbox = WriteOutbox(path=path, linger=0)
+    await outbox.open(flaky)
+    await outbox.append([row("a"), row("b")])
+    assert await outbox.wait_flushed(timeout=5)
+    await outbox.close()
+
+    assert len(attempts) >= 2
+    assert sorted(r["id"] for r in await storage.select_rows({})) == ["a", "b"]
+    assert outbox.failed_flushes == 1
+    assert logged(path) == 0
+
+
+async def test_discarded_rows_are_not_replayed(tmp_path, storage):
+    path = str(tmp_path / "outbox.db")
+
+    async def down(rows):
+        raise ConnectionError("storage is down")
+
+    outbox = WriteOutbox(path=path, linger=0)
+    await outbox.open(down)
+    await outbox.append([row("a"), row("b")])
+    assert await outbox.discard(["b", "missing"]) == [row("b")]
+    await outbox.close(timeout=0.1)
+    assert logged(path) == 1
+
+    outbox = WriteOutbox(path=path, linger=0)
+    await outbox.open(storage.upsert_rows)
+    assert await outbox.wait_flushed(timeout=5)
+    await outbox.close()
+    assert [r["id"] for r in await storage.select_rows({})] == ["a"]
+
+
+async def test_patched_rows_are_replayed_as_patched(tmp_path, storage):
+    path = str(tmp_path / "outbox.db")
+
+    async def down(rows):
+        raise ConnectionError("storage is down")
+
+    outbox = WriteOutbox(path=path, linger=0)
+    await outbox.open(down)
+    await outbox.append([row("a"), row("b")])
+    assert await outbox.patch(["a", "missing"], {"status": "completed"}) == [(row("a"), row("a", "completed"))]
+    assert outbox.pending_row("a")["status"] == "completed"
+    await outbox.close(timeout=0.1)
+
+    outbox = WriteOutbox(path=path, linger=0)
+    await outbox.open(storage.upsert_rows)
+    assert await outbox.wait_flushed(timeout=5)
+    await outbox.close()
+    rows = {r["id"]: r["status"] for r in await storage.select_rows({})}
+    assert rows == {"a": "completed", "b": "pending"}
+
+
+async def queued_service(make_database, monkeypatch, name: str = "db"):
+    """DatabaseService whose outbox cannot reach storage; a lone row is parked on its first failure"""
+    monkeypatch.setenv("WRITE_OUTBOX_MAX_ATTEMPTS", "1")
+    db_service = await make_database(name=name, outbox=True)
+
+    async def down(rows):
+        raise ConnectionError("storage is down")
+
+    db_service.storage.upsert_rows = down
+    return db_service
+
+
+async def test_parked_item_deleted_stays_deleted_after_restart(make_database, monkeypatch):
+    db_service = await queued_service(make_database, monkeypatch)
+    [item] = await db_service.create_multiple_action_items([ActionItem(text="Call the venue")])
+    while not db_service.outbox.parked_count:
+        await asyncio.sleep(0.01)
+
+    assert await db_service.delete_action_item(item.id)
+    await db_service.close()
+
+    # The restarted service replays the log with storage back up
+    db_service = await make_database(outbox=True)
+    assert await db_service.outbox.wait_flushed(timeout=5)
+    assert await db_service.get_action_item(item.id) is None
+    assert await db_service.storage.select_by_id(item.id) is None
+    assert (await db_service.get_action_item_stats())["total"] == 0
+
+
+async def test_update_of_a_queued_item_is_stored(make_database, monkeypatch):
+    db_service = await queued_service(make_database, monkeypatch)
+    [item] = await db_service.create_multiple_action_items([ActionItem(text="Call the venue")])
+
+    updated = await db_service.update_action_item(item.id, {"status": "completed"})
+
+    assert updated.status == "completed"
+    assert (await db_service.get_action_item(item.id)).status == "completed"
+    assert (await db_service.get_action_item_stats())["by_status"] == {"pending": 0, "completed": 1}
+
+    del db_service.storage.upsert_rows
+    assert await db_service.outbox.wait_flushed(timeout=5)
+    assert (await db_service.storage.select_by_id(item.id))["status"] == "completed"
+
+
+async def test_bulk_update_covers_queued_and_stored_items(make_database, monkeypatch):
+    db_service = await queued_service(make_database, monkeypatch)
+    await db_service.storage.insert_rows([row("stored")])
+    [queued] = await db_service.create_multiple_action_items([ActionItem(text="Call the venue")])
+
+    updated, errors = await db_service.bulk_update_action_items({"priority": "high"}, ids=["stored", queued.id])
+
+    assert errors == {}
+    assert sorted(item.id for item in updated) == sorted(["stored", queued.id])
+    assert db_service.outbox.pending_row(queued.id)["priority"] == "high"
+    assert (await db_service.storage.select_by_id("stored"))["priority"] == "high"
+
+
+async def test_replace_swaps_only_queued_rows(tmp_path):
+    async def down(rows):
+        raise ConnectionError("storage is down")
+
+    outbox = WriteOutbox(path=str(tmp_path / "outbox.db"), linger=0)
+    await outbox.open(down)
+    await outbox.append([row("a")])
+    edited = dict(row("a", "completed"), text="Edited")
+
+    assert await outbox.replace([edited, row("stored")]) == [(row("a"), edited)]
+    assert outbox.pending_rows() == [edited]
+    await outbox.close(timeout=0.1)
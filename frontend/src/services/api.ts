@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { TranscriptRequest, TranscriptAnalysisResponse } from '../types';
+import type { ActionItem, TranscriptRequest, TranscriptAnalysisResponse, TranscriptUploadResponse, ActionItemsQuery, ActionItemStats, AnalysisStreamEvent, SearchResponse, ActionItemChange, ActionItemChangesResponse } from '../types';
 
 // Create axios instance
 const api = axios.create({
@@ -47,6 +47,64 @@ export const analyzeTranscript = async (transcript: string): Promise<TranscriptA
   }
 };
 
+// Uploads a .txt, .vtt or .srt transcript file as multipart form data
+export const uploadTranscript = async (file: File, useCache = true): Promise<TranscriptUploadResponse> => {
+  try {
+    const form = new FormData();
+    form.append('file', file);
+    form.append('use_cache', String(useCache));
+    // Overrides the instance's JSON default; the boundary is filled in for FormData bodies
+    const response = await api.post<TranscriptUploadResponse>('/api/transcripts/upload', form, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+  } catch (error) {
+    if (axios.isAxiosError(error)) {
+      throw new Error(error.response?.data?.detail || error.message);
+    }
+    throw new Error('Failed to upload transcript');
+  }
+};
+
+// Streams action items as the model generates them (NDJSON events).
+// Uses fetch because axios cannot read a response body incrementally in the browser.
+export const analyzeTranscriptStream = async (
+  transcript: string,
+  onItem: (item: ActionItem) => void
+): Promise<number> => {
+  const baseURL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+  const request: TranscriptRequest = { transcript };
+  const response = await fetch(`${baseURL}/api/transcripts/analyze/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(request),
+  });
+  if (!response.ok || !response.body) {
+    const body = await response.json().catch(() => null);
+    throw new Error(body?.detail || `Request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let newline;
+    while ((newline = buffer.indexOf('\n')) >= 0) {
+      const line = buffer.slice(0, newline).trim();
+      buffer = buffer.slice(newline + 1);
+      if (!line) continue;
+      const event: AnalysisStreamEvent = JSON.parse(line);
+      if (event.type === 'item') onItem(event.action_item);
+      else if (event.type === 'error') throw new Error(event.detail);
+      else if (event.type === 'summary') return event.total_count;
+    }
+  }
+  throw new Error('Stream ended before the analysis completed');
+};
+
 export const healthCheck = async () => {
   try {
     const response = await api.get('/api/health');
@@ -59,9 +117,9 @@ export const healthCheck = async () => {
   }
 };
 
-export const getAllActionItems = async (): Promise<TranscriptAnalysisResponse> => {
+export const getAllActionItems = async (query: ActionItemsQuery = {}): Promise<TranscriptAnalysisResponse> => {
   try {
-    const response = await api.get<TranscriptAnalysisResponse>('/api/action-items');
+    const response = await api.get<TranscriptAnalysisResponse>('/api/action-items', { params: query });
     return response.data;
   } catch (error) {
     if (axios.isAxiosError(error)) {
@@ -71,6 +129,60 @@ export const getAllActionItems = async (): Promise<TranscriptAnalysisResponse> =
   }
 };
 
+export const getActionItemStats = async (days = 30): Promise<ActionItemStats> => {
+  try {
+    const response = await api.get<ActionItemStats>('/api/action-items/stats', { params: { days } });
+    return response.data;
+  } catch (error) {
+    if (axios.isAxiosError(error)) {
+      throw new Error(error.response?.data?.detail || error.message);
+    }
+    throw new Error('Failed to fetch action item stats');
+  }
+};
+
+export const searchActionItems = async (q: string, limit = 20): Promise<SearchResponse> => {
+  try {
+    const response = await api.get<SearchResponse>('/api/action-items/search', { params: { q, limit } });
+    return response.data;
+  } catch (error) {
+    if (axios.isAxiosError(error)) {
+      throw new Error(error.response?.data?.detail || error.message);
+    }
+    throw new Error('Failed to search action items');
+  }
+};
+
+// Items changed since a cursor; `reset` means the cursor is stale and the list must be reloaded
+export const getActionItemChanges = async (since?: string): Promise<ActionItemChangesResponse> => {
+  try {
+    const response = await api.get<ActionItemChangesResponse>('/api/action-items/changes', { params: { since } });
+    return response.data;
+  } catch (error) {
+    if (axios.isAxiosError(error)) {
+      throw new Error(error.response?.data?.detail || error.message);
+    }
+    throw new Error('Failed to retrieve action item changes');
+  }
+};
+
+// Live changes over Server-Sent Events. EventSource reconnects by itself and
+// resumes from the last event it saw; on a 'reset' change reload the list.
+// Returns a function that closes the stream.
+export const subscribeToActionItemChanges = (
+  onChange: (change: ActionItemChange) => void,
+  since?: string
+): (() => void) => {
+  const baseURL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+  const query = since ? `?since=${encodeURIComponent(since)}` : '';
+  const source = new EventSource(`${baseURL}/api/action-items/changes/stream${query}`);
+  const handle = (event: MessageEvent) => onChange(JSON.parse(event.data));
+  for (const op of ['upsert', 'delete', 'reset']) {
+    source.addEventListener(op, handle as EventListener);
+  }
+  return () => source.close();
+};
+
 export const updateActionItem = async (itemId: string, updates: { status?: string; priority?: string }) => {
   try {
     const response = await api.put(`/api/action-items/${itemId}`, updates);
@@ -13,12 +13,25 @@ export interface TranscriptAnalysisResponse {
   success: boolean;
   action_items: ActionItem[];
   total_count: number;
+  next_cursor?: string | null;
 }
 
 export interface TranscriptRequest {
   transcript: string;
 }
 
+export interface TranscriptUploadResponse extends TranscriptAnalysisResponse {
+  upload: {
+    filename: string;
+    format: 'txt' | 'vtt' | 'srt';
+    received_bytes: number;
+    text_bytes: number;
+    ingest_seconds: number;
+    ms_per_mb: number;
+    mb_per_second: number;
+  };
+}
+
 export type TaskStatus = 'pending' | 'completed';
 
 export type SortOption = 'createdAt' | 'priority' | 'status';
@@ -34,3 +47,57 @@ export interface SortOptions {
   field: SortOption;
   direction: SortDirection;
 }
+
+export interface ActionItemsQuery {
+  status?: TaskStatus;
+  priority?: Priority;
+  search?: string;
+  sort_by?: 'created_at' | 'priority' | 'status';
+  order?: SortDirection;
+  limit?: number;
+  cursor?: string;
+}
+
+export interface ActionItemStats {
+  success: boolean;
+  total: number;
+  by_status: Record<TaskStatus, number>;
+  by_priority: Record<Priority, number>;
+  by_status_priority: Record<TaskStatus, Record<Priority, number>>;
+  created_per_day: Array<{ date: string; count: number }>;
+  last_reconciled: string | null;
+}
+
+export interface SearchResult {
+  action_item: ActionItem;
+  score: number;
+  snippet: string;
+}
+
+export interface SearchResponse {
+  success: boolean;
+  query: string;
+  results: SearchResult[];
+  total_count: number;
+}
+
+export type AnalysisStreamEvent =
+  | { type: 'item'; action_item: ActionItem; duplicate: boolean }
+  | { type: 'summary'; success: boolean; total_count: number }
+  | { type: 'error'; detail: string };
+
+export interface ActionItemChange {
+  epoch: string;
+  version: number;
+  op: 'upsert' | 'delete' | 'reset';
+  id: string | null;
+  action_item: ActionItem | null;
+}
+
+export interface ActionItemChangesResponse {
+  success: boolean;
+  reset: boolean;
+  cursor: string;
+  has_more: boolean;
+  changes: ActionItemChange[];
+}